@@ -69,6 +69,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.OptionalCursorPagination',
+    'PAGE_SIZE': 50,
     'DEFAULT_RENDERER_CLASSES': (
         'core.renderers.CustomJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
@@ -125,6 +127,11 @@ DATABASES = {
     }
 }
 
+# locmemcache:// (mặc định) hoặc redis://host:6379/0 khi chạy nhiều worker
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -157,7 +164,8 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = env('EMAIL_FILE_PATH', default=os.path.join(BASE_DIR, 'sent_emails'))
 EMAIL_HOST = env('EMAIL_HOST')
 EMAIL_PORT = env.int('EMAIL_PORT', 587)
 EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', True)
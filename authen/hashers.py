@@ -0,0 +1,73 @@
+import atexit
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.contrib.auth.hashers import make_password
+
+# Dưới ngưỡng này hash tuần tự rẻ hơn gửi việc sang process pool
+PARALLEL_THRESHOLD = 8
+
+# Một pool dùng chung trong process (số worker bằng số core),
+# tạo lần đầu khi cần và đóng khi thoát
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    django.setup()
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=default_workers(), initializer=_init_worker
+            )
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def make_passwords(raw_passwords):
+    """
+    Hash nhiều password song song bằng process pool dùng chung.
+    Kết quả trả về giữ đúng thứ tự đầu vào.
+    """
+    raw_passwords = list(raw_passwords)
+    workers = default_workers()
+
+    if workers <= 1 or len(raw_passwords) < PARALLEL_THRESHOLD:
+        return [make_password(password) for password in raw_passwords]
+
+    chunksize = math.ceil(len(raw_passwords) / (workers * 4))
+    pool = _get_pool()
+    try:
+        return list(pool.map(make_password, raw_passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # Worker chết (OOM, bị kill...): bỏ pool hỏng, lần gọi sau sẽ tạo lại
+        _discard_pool(pool)
+        return [make_password(password) for password in raw_passwords]
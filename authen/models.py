@@ -29,5 +29,10 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_joined', 'id']),
+        ]
+
     def __str__(self):
         return self.email
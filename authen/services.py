@@ -1,11 +1,15 @@
-from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
 
+from core.services import EmailOutboxService
+
 def send_activation_email(user, request):
+    """
+    Đưa email kích hoạt tài khoản vào outbox.
+    """
     token = default_token_generator.make_token(user)
     uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
     
@@ -20,18 +24,9 @@ def send_activation_email(user, request):
     
     Trân trọng.
     """
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
+    return EmailOutboxService.queue(subject, message, [user.email])
 
-def send_new_account_email(user, password):
-    """
-    Gửi email thông báo tài khoản mới được tạo bởi Admin.
-    """
+def build_new_account_email(user, password):
     login_url = f"{settings.CLIENT_URL}/auth/login" # Đường dẫn tới trang đăng nhập
     
     subject = "Thông tin tài khoản của bạn tại Hệ thống"
@@ -52,11 +47,21 @@ def send_new_account_email(user, password):
     Trân trọng,
     Đội ngũ quản trị.
     """
-    
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    return EmailOutboxService.build(subject, message, [user.email])
+
+def send_new_account_email(user, password):
+    """
+    Đưa email thông báo tài khoản mới được tạo bởi Admin vào outbox.
+    """
+    email = build_new_account_email(user, password)
+    email.save()
+    return email
+
+def send_new_account_emails(users_with_passwords):
+    """
+    Đưa email tài khoản mới của nhiều user vào outbox bằng 1 bulk insert.
+    """
+    return EmailOutboxService.queue_many(
+        build_new_account_email(user, password)
+        for user, password in users_with_passwords
+    )
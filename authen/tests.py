@@ -1,2 +1,42 @@
-from django.test import TestCase
+from unittest import mock
 
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, override_settings
+
+from authen import hashers
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class MakePasswordsTests(SimpleTestCase):
+    def setUp(self):
+        hashers.shutdown_pool()
+        self.addCleanup(hashers.shutdown_pool)
+
+    def assertHashes(self, passwords, hashed):
+        self.assertEqual(len(hashed), len(passwords))
+        for password, encoded in zip(passwords, hashed):
+            self.assertTrue(check_password(password, encoded))
+
+    def test_small_batch_is_hashed_serially(self):
+        passwords = [f"password-{i}" for i in range(hashers.PARALLEL_THRESHOLD - 1)]
+
+        with mock.patch("authen.hashers.default_workers", return_value=4):
+            hashed = hashers.make_passwords(passwords)
+
+        self.assertHashes(passwords, hashed)
+        self.assertIsNone(hashers._pool)
+
+    def test_pool_keeps_input_order_and_is_reused(self):
+        first = [f"first-{i}" for i in range(hashers.PARALLEL_THRESHOLD)]
+        second = [f"second-{i}" for i in range(3 * hashers.PARALLEL_THRESHOLD + 1)]
+
+        with mock.patch("authen.hashers.default_workers", return_value=2):
+            self.assertHashes(first, hashers.make_passwords(first))
+            pool = hashers._pool
+            # Batch khác kích thước vẫn dùng lại pool cũ
+            self.assertHashes(second, hashers.make_passwords(second))
+
+        self.assertIs(hashers._pool, pool)
+        self.assertEqual(pool._max_workers, 2)
@@ -4,6 +4,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.exceptions import ValidationError, NotFound
 
+from django.db import transaction
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from django.contrib.auth.tokens import default_token_generator
@@ -28,12 +29,9 @@ class RegistrationViewSet(viewsets.ViewSet):
         
         serializer.is_valid(raise_exception=True) 
         
-        user = serializer.save()
-        
-        try:
+        with transaction.atomic():
+            user = serializer.save()
             send_activation_email(user, request)
-        except Exception as e:
-            print(f"Lỗi gửi mail: {e}")
 
         return Response({
             "data": serializer.data,
@@ -79,10 +77,7 @@ class ResendActivationEmailView(generics.GenericAPIView):
             user = None
 
         if user and not user.is_active:
-            try:
-                send_activation_email(user, request)
-            except Exception as e:
-                print(f"Lỗi gửi lại mail: {e}")
+            send_activation_email(user, request)
         
         return Response(
             {"message": "Nếu tài khoản tồn tại và chưa kích hoạt, email mới đã được gửi."},
@@ -0,0 +1,107 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Version của scope không hết hạn; giá trị cache hết hạn sau DEFAULT_TIMEOUT.
+DEFAULT_TIMEOUT = 60 * 5
+# Thời gian tối đa giữ lock khi tính lại, cũng là thời gian tối đa chờ
+# request khác tính xong.
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _version_key(scope):
+    return f"cache-version:{scope}"
+
+
+def _new_version():
+    # Khởi tạo theo thời gian để version mới không trùng version cũ
+    # khi key version bị cache xóa mất.
+    return time.time_ns()
+
+
+def get_versions(*scopes):
+    """
+    Version hiện tại của các scope, tạo mới cho scope chưa có.
+    """
+    keys = {scope: _version_key(scope) for scope in scopes}
+    versions = cache.get_many(list(keys.values()))
+
+    result = {}
+    for scope, key in keys.items():
+        version = versions.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            version = cache.get(key)
+        result[scope] = version
+    return result
+
+
+def versioned_key(name, *scopes):
+    """
+    Key gồm version của mọi scope, bump bất kỳ scope nào thì key đổi theo.
+    """
+    versions = get_versions(*scopes)
+    parts = [f"{scope}@{versions[scope]}" for scope in scopes]
+    return ":".join([name, *parts])
+
+
+def bump(*scopes):
+    """
+    Tăng version của scope, các giá trị đã cache theo version cũ bị bỏ qua.
+    """
+    for scope in set(scopes):
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+
+
+def bump_on_commit(*scopes):
+    """
+    Bump sau khi transaction hiện tại commit, tránh request khác cache lại
+    dữ liệu cũ trước khi thay đổi được ghi xuống.
+    """
+    if scopes:
+        transaction.on_commit(partial(bump, *scopes))
+
+
+def _compute_and_set(key, lock_key, compute, timeout):
+    try:
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def get_or_compute(name, scopes, compute, timeout=DEFAULT_TIMEOUT):
+    """
+    Lấy giá trị đã cache theo version của `scopes`, nếu chưa có thì gọi
+    `compute()`. Lock (cache.add) đảm bảo một loạt request đồng thời chỉ
+    tính 1 lần, các request còn lại chờ kết quả. Nếu request giữ lock lỗi
+    (lock được nhả mà chưa có giá trị), request đang chờ lấy lock và tự tính.
+    """
+    key = versioned_key(name, *scopes)
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return _compute_and_set(key, lock_key, compute, timeout)
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return _compute_and_set(key, lock_key, compute, timeout)
+
+    # Request giữ lock quá lâu: tự tính, không ghi đè cache
+    return compute()
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+
+class BulkPrimaryKeyRelatedField(serializers.ListField):
+    """
+    Nhận một list id và resolve toàn bộ bằng 1 query `id__in`, thay cho
+    PrimaryKeyRelatedField(many=True) vốn tốn 1 query cho mỗi id.
+    Các id không tồn tại hoặc không thỏa `limit_choices_to` được báo trong
+    cùng một lỗi. Giá trị trả về là dict {id: object} giữ thứ tự đầu vào.
+    """
+
+    default_error_messages = {
+        'does_not_exist': 'Invalid pk(s) {pk_values} - object does not exist.',
+        'incorrect_choice': 'Invalid pk(s) {pk_values} - object is not allowed here.',
+    }
+
+    def __init__(self, queryset, limit_choices_to=None, **kwargs):
+        self.queryset = queryset
+        self.limit_choices_to = limit_choices_to or {}
+        kwargs.setdefault('child', serializers.IntegerField(min_value=1))
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        pks = list(dict.fromkeys(super().to_internal_value(data)))
+        objects = self.queryset.all().in_bulk(pks)
+
+        missing = [pk for pk in pks if pk not in objects]
+        incorrect = [
+            pk
+            for pk in pks
+            if pk in objects
+            and any(
+                getattr(objects[pk], field) != value
+                for field, value in self.limit_choices_to.items()
+            )
+        ]
+
+        errors = []
+        if missing:
+            errors.append(self.error_messages['does_not_exist'].format(pk_values=missing))
+        if incorrect:
+            errors.append(self.error_messages['incorrect_choice'].format(pk_values=incorrect))
+        if errors:
+            raise serializers.ValidationError(errors, code='invalid')
+
+        return {pk: objects[pk] for pk in pks}
+
+    def to_representation(self, value):
+        return [getattr(obj, 'pk', obj) for obj in value]
@@ -0,0 +1,49 @@
+import time
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.utils.crypto import get_random_string
+
+from authen.hashers import default_workers, make_passwords
+
+
+class Command(BaseCommand):
+    help = 'Compares serial and process-pool password hashing for bulk account creation'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=100,
+            help='Number of passwords to hash',
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        workers = default_workers()
+        passwords = [get_random_string(10) for _ in range(count)]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=> Hashing {count} passwords ({workers} workers available)'
+        ))
+
+        started = time.perf_counter()
+        serial = [make_password(password) for password in passwords]
+        serial_time = time.perf_counter() - started
+        self.stdout.write(f'-> Serial:   {serial_time:.2f}s')
+
+        started = time.perf_counter()
+        pooled = make_passwords(passwords)
+        pooled_time = time.perf_counter() - started
+        self.stdout.write(f'-> Parallel: {pooled_time:.2f}s')
+
+        if len(pooled) != len(serial) or not all(
+            check_password(password, encoded)
+            for password, encoded in zip(passwords, pooled)
+        ):
+            self.stdout.write(self.style.ERROR('=> Parallel hashes do not match input order'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=> Speedup: {serial_time / pooled_time:.2f}x'
+        ))
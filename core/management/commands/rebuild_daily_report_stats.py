@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from daily_reports.services import DailyReportStatService
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the per-course daily report submission counts from daily_reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            nargs='+',
+            dest='course_ids',
+            help='Only rebuild the given course ids',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('=> Rebuilding daily report submission stats'))
+
+        rows = DailyReportStatService.rebuild(options['course_ids'])
+        self.stdout.write(f"-> {rows} (course, date) rows written")
+
+        self.stdout.write(self.style.SUCCESS('=> Done'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from courses.services import DashboardStatService
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the dashboard rollup tables (CourseStat, GlobalStat) from source rows'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('=> Rebuilding dashboard stats'))
+
+        stat = DashboardStatService.rebuild()
+        self.stdout.write(
+            f"-> Courses: {stat.courses_not_started} upcoming, "
+            f"{stat.courses_in_progress} active, {stat.courses_finished} finished"
+        )
+        self.stdout.write(
+            f"-> {stat.trainees} trainees, "
+            f"{stat.subjects_finished}/{stat.subjects_taken} subjects finished"
+        )
+
+        self.stdout.write(self.style.SUCCESS('=> Done'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from courses.services import CourseCounterService
+
+
+class Command(BaseCommand):
+    help = 'Recounts member/supervisor/subject counters on Course and fixes any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            nargs='+',
+            dest='course_ids',
+            help='Only reconcile the given course ids',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('=> Reconciling course counters'))
+
+        fixed = CourseCounterService.reconcile(options['course_ids'])
+        for course in fixed:
+            self.stdout.write(
+                f"-> Course #{course.id} {course.name}: "
+                f"{course.member_count} members, "
+                f"{course.supervisor_count} supervisors, "
+                f"{course.subject_count} subjects"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'=> Fixed {len(fixed)} course(s)'))
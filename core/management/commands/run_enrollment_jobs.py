@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.models.enrollment_job import EnrollmentJob
+from courses.services import EnrollmentJobService
+
+
+class Command(BaseCommand):
+    help = 'Processes queued trainee enrollment jobs in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EnrollmentJobService.CHUNK_SIZE,
+            help='Number of trainees enrolled per transaction',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue and exit instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        self.stdout.write(self.style.SUCCESS('=> Enrollment worker started'))
+
+        while True:
+            job = EnrollmentJobService.process_chunk(chunk_size)
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            if job.status not in (
+                EnrollmentJob.Status.PENDING,
+                EnrollmentJob.Status.RUNNING,
+            ):
+                self.stdout.write(
+                    f"-> Job #{job.id} {job.get_status_display()}: "
+                    f"{job.done} done, {job.skipped} skipped, {job.failed} failed"
+                )
+
+        self.stdout.write(self.style.SUCCESS('=> Enrollment worker stopped'))
@@ -23,6 +23,8 @@ from users.models.user_subject import UserSubject
 from users.models.user_task import UserTask
 from users.models.comment import Comment
 from daily_reports.models import DailyReport
+from daily_reports.services import DailyReportStatService
+from courses.services import CourseCounterService, DashboardStatService
 
 fake = Faker()
 
@@ -285,6 +287,17 @@ class Command(BaseCommand):
             self.stdout.write("-> Creating Comments...")
             self.create_comments()
 
+            # Dữ liệu seed được tạo từng dòng, không qua các service cập nhật
+            # số liệu tổng hợp nên tính lại một lần ở cuối
+            self.stdout.write("-> Reconciling Course Counters...")
+            CourseCounterService.reconcile()
+            self.stdout.write("-> Rebuilding Dashboard Stats...")
+            DashboardStatService.rebuild()
+
+            # Báo cáo được lùi created_at bằng update() nên tính lại thống kê
+            self.stdout.write("-> Rebuilding Daily Report Stats...")
+            DailyReportStatService.rebuild()
+
         self.stdout.write(self.style.SUCCESS('=> Seeding completed successfully!'))
 
     def create_users(self):
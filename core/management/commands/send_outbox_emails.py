@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services import EmailOutboxService
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EmailOutboxService.BATCH_SIZE,
+            help='Number of emails sent per SMTP connection',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between polls when the outbox is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send every email that is due and exit instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('=> Email sender started'))
+
+        while True:
+            processed = EmailOutboxService.send_batch(options['batch_size'])
+
+            if processed:
+                self.stdout.write(f'-> Processed {processed} emails')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS('=> Email sender stopped'))
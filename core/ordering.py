@@ -0,0 +1,104 @@
+from django.db.models import Case, Max, PositiveIntegerField, Value, When
+
+# Khoảng cách giữa hai vị trí liền kề. Di chuyển một phần tử chỉ cần
+# ghi 1 dòng khi còn khe trống giữa hai hàng xóm.
+POSITION_STEP = 1024
+
+
+def sparse_positions(count, start=0):
+    """
+    Trả về `count` vị trí thưa liên tiếp sau `start`.
+    """
+    return [start + (index + 1) * POSITION_STEP for index in range(count)]
+
+
+def next_position(queryset):
+    """
+    Vị trí để thêm phần tử vào cuối danh sách.
+    """
+    last = queryset.aggregate(last=Max('position'))['last'] or 0
+    return last + POSITION_STEP
+
+
+def set_positions(queryset, positions):
+    """
+    Cập nhật position cho nhiều dòng ({id: position}) bằng 1 câu UPDATE ... CASE.
+    """
+    if not positions:
+        return 0
+    return queryset.filter(pk__in=list(positions)).update(
+        position=Case(
+            *[When(pk=pk, then=Value(position)) for pk, position in positions.items()],
+            output_field=PositiveIntegerField(),
+        )
+    )
+
+
+def reorder(queryset, ordered_ids):
+    """
+    Sắp xếp lại theo thứ tự ids truyền vào, giãn cách lại toàn bộ vị trí.
+    """
+    return set_positions(
+        queryset, dict(zip(ordered_ids, sparse_positions(len(ordered_ids))))
+    )
+
+
+def move(queryset, item_id, after_id=None, before_id=None):
+    """
+    Di chuyển một phần tử ra sau `after_id` hoặc trước `before_id`
+    (không truyền cả hai thì đưa lên đầu).
+    Chỉ ghi 1 dòng nếu còn khe trống, ngược lại giãn cách lại cả danh sách.
+    Trả về số dòng được cập nhật.
+    """
+    rows = list(queryset.order_by('position', 'pk').values_list('pk', 'position'))
+    ids = [pk for pk, _ in rows]
+
+    for pk in (item_id, after_id, before_id):
+        if pk is not None and pk not in ids:
+            raise ValueError(f"Item {pk} does not belong to this list.")
+
+    others = [(pk, position) for pk, position in rows if pk != item_id]
+    other_ids = [pk for pk, _ in others]
+
+    if before_id is not None:
+        index = other_ids.index(before_id)
+    elif after_id is not None:
+        index = other_ids.index(after_id) + 1
+    else:
+        index = 0
+
+    lower = others[index - 1][1] if index > 0 else 0
+    if index < len(others):
+        upper = others[index][1]
+    else:
+        upper = lower + 2 * POSITION_STEP
+
+    if upper - lower >= 2:
+        return queryset.filter(pk=item_id).update(
+            position=(lower + upper) // 2
+        )
+
+    other_ids.insert(index, item_id)
+    return reorder(queryset, other_ids)
+
+
+def _optional_int(value):
+    return None if value in (None, "") else int(value)
+
+
+def move_from_payload(queryset, item_id, data):
+    """
+    Di chuyển theo payload của request: { "after_id": 2 } hoặc { "before_id": 2 }
+    (không có cả hai thì đưa lên đầu). Payload sai định dạng raise ValueError.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Payload must be an object.")
+    try:
+        return move(
+            queryset,
+            int(item_id),
+            after_id=_optional_int(data.get("after_id")),
+            before_id=_optional_int(data.get("before_id")),
+        )
+    except TypeError:
+        raise ValueError("Ids must be integers.")
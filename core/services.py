@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import EmailOutbox
+
+
+class EmailOutboxService:
+    BATCH_SIZE = 50
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_SECONDS = 60
+
+    @staticmethod
+    def build(subject, body, recipients, from_email=None):
+        return EmailOutbox(
+            subject=subject,
+            body=body,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+            recipients=list(recipients),
+        )
+
+    @staticmethod
+    def queue(subject, body, recipients, from_email=None):
+        """
+        Ghi email vào outbox. Gọi trong transaction của nghiệp vụ để email
+        chỉ được gửi khi dữ liệu đã commit.
+        """
+        email = EmailOutboxService.build(subject, body, recipients, from_email)
+        email.save()
+        return email
+
+    @staticmethod
+    def queue_many(emails):
+        return EmailOutbox.objects.bulk_create(list(emails))
+
+    @staticmethod
+    def retry_delay(attempts):
+        return timedelta(
+            seconds=EmailOutboxService.RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        )
+
+    @staticmethod
+    def send_batch(batch_size=None):
+        """
+        Gửi một batch email đến hạn qua một kết nối SMTP dùng chung.
+        Email lỗi được thử lại với backoff lũy thừa, quá MAX_ATTEMPTS thì
+        chuyển sang FAILED.
+        Trả về số email đã xử lý trong batch.
+        """
+        batch_size = batch_size or EmailOutboxService.BATCH_SIZE
+
+        with transaction.atomic():
+            emails = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=EmailOutbox.Status.PENDING,
+                    next_attempt_at__lte=timezone.now(),
+                )
+                .order_by('next_attempt_at', 'id')[:batch_size]
+            )
+            if not emails:
+                return 0
+
+            connection = get_connection(fail_silently=False)
+            try:
+                connection.open()
+            except Exception as e:
+                for email in emails:
+                    EmailOutboxService._mark_failed_attempt(email, e)
+            else:
+                try:
+                    for email in emails:
+                        try:
+                            EmailMessage(
+                                subject=email.subject,
+                                body=email.body,
+                                from_email=email.from_email or None,
+                                to=email.recipients,
+                                connection=connection,
+                            ).send()
+                        except Exception as e:
+                            EmailOutboxService._mark_failed_attempt(email, e)
+                        else:
+                            email.status = EmailOutbox.Status.SENT
+                            email.attempts += 1
+                            email.last_error = ''
+                            email.sent_at = timezone.now()
+                finally:
+                    connection.close()
+
+            EmailOutbox.objects.bulk_update(
+                emails,
+                ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at'],
+            )
+
+        return len(emails)
+
+    @staticmethod
+    def _mark_failed_attempt(email, error):
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= EmailOutboxService.MAX_ATTEMPTS:
+            email.status = EmailOutbox.Status.FAILED
+        else:
+            email.next_attempt_at = timezone.now() + EmailOutboxService.retry_delay(
+                email.attempts
+            )
@@ -1 +1,108 @@
-from django.test import TestCase
+import io
+import threading
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.cache import bump, bump_on_commit, get_or_compute, versioned_key
+from core.models import EmailOutbox
+from core.services import EmailOutboxService
+
+
+class GetOrComputeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+    def test_value_is_cached_until_scope_is_bumped(self):
+        self.assertEqual(get_or_compute("stats", ["a", "b"], self.compute), {"calls": 1})
+        self.assertEqual(get_or_compute("stats", ["a", "b"], self.compute), {"calls": 1})
+
+        bump("b")
+
+        self.assertEqual(get_or_compute("stats", ["a", "b"], self.compute), {"calls": 2})
+
+    def test_bump_on_commit_waits_for_commit(self):
+        get_or_compute("stats", ["a"], self.compute)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_on_commit("a")
+            self.assertEqual(get_or_compute("stats", ["a"], self.compute), {"calls": 1})
+
+        self.assertEqual(get_or_compute("stats", ["a"], self.compute), {"calls": 2})
+
+    def test_waiter_takes_over_released_lock(self):
+        # Request giữ lock bị lỗi: lock được nhả mà không có giá trị
+        lock_key = f"{versioned_key('stats', 'a')}:lock"
+        cache.add(lock_key, 1)
+        timer = threading.Timer(0.1, cache.delete, [lock_key])
+        timer.start()
+        try:
+            value = get_or_compute("stats", ["a"], self.compute)
+        finally:
+            timer.join()
+
+        self.assertEqual(value, {"calls": 1})
+        self.assertIsNone(cache.get(lock_key))
+        self.assertEqual(get_or_compute("stats", ["a"], self.compute), {"calls": 1})
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("SMTP unavailable")
+
+
+class EmailOutboxTests(TestCase):
+    def test_queued_emails_are_sent_in_batches(self):
+        for i in range(3):
+            EmailOutboxService.queue("Welcome", f"Body {i}", [f"user{i}@example.com"])
+        later = EmailOutboxService.queue("Later", "Body", ["later@example.com"])
+        EmailOutbox.objects.filter(pk=later.pk).update(
+            next_attempt_at=timezone.now() + timedelta(hours=1)
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("send_outbox_emails", "--once", "--batch-size", "2", stdout=io.StringIO())
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["user0@example.com", "user1@example.com", "user2@example.com"],
+        )
+        sent = EmailOutbox.objects.filter(
+            status=EmailOutbox.Status.SENT, sent_at__isnull=False
+        )
+        self.assertEqual(sent.count(), 3)
+        later.refresh_from_db()
+        self.assertEqual(later.status, EmailOutbox.Status.PENDING)
+
+    @override_settings(EMAIL_BACKEND="core.tests.FailingEmailBackend")
+    def test_failed_emails_are_retried_with_backoff(self):
+        email = EmailOutboxService.queue("Welcome", "Body", ["user@example.com"])
+
+        for attempt in range(1, EmailOutboxService.MAX_ATTEMPTS + 1):
+            before = timezone.now()
+            self.assertEqual(EmailOutboxService.send_batch(), 1)
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            self.assertEqual(email.last_error, "SMTP unavailable")
+            if attempt < EmailOutboxService.MAX_ATTEMPTS:
+                self.assertEqual(email.status, EmailOutbox.Status.PENDING)
+                self.assertGreaterEqual(
+                    email.next_attempt_at, before + EmailOutboxService.retry_delay(attempt)
+                )
+                # Chưa đến hạn thử lại thì không gửi
+                self.assertEqual(EmailOutboxService.send_batch(), 0)
+                EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+
+        self.assertEqual(email.status, EmailOutbox.Status.FAILED)
+        self.assertEqual(EmailOutboxService.send_batch(), 0)
@@ -3,15 +3,44 @@ from .models.course_model import Course
 from .models.course_subject import CourseSubject
 from .models.course_supervisor_model import CourseSupervisor
 from .models.course_category import CourseCategory
+from .models.enrollment_job import EnrollmentJob
+from .models.course_stat import CourseStat, GlobalStat
+from .services import CourseCounterService
+
+
+class CourseCounterAdminMixin:
+    """
+    Giữ bộ đếm trên Course đúng khi thêm/sửa/xóa dòng liên kết trong admin
+    (các luồng này không đi qua service).
+    """
+
+    def save_model(self, request, obj, form, change):
+        old_course_id = form.initial.get("course") if change else None
+        super().save_model(request, obj, form, change)
+        if old_course_id != obj.course_id:
+            if old_course_id is not None:
+                CourseCounterService.adjust_links(self.model, [old_course_id], -1)
+            CourseCounterService.adjust_links(self.model, [obj.course_id], 1)
+
+    def delete_model(self, request, obj):
+        course_id = obj.course_id
+        super().delete_model(request, obj)
+        CourseCounterService.adjust_links(self.model, [course_id], -1)
+
+    def delete_queryset(self, request, queryset):
+        course_ids = list(queryset.values_list("course_id", flat=True))
+        super().delete_queryset(request, queryset)
+        CourseCounterService.adjust_links(self.model, course_ids, -1)
+
 
 @admin.register(CourseSubject)
-class CourseSubjectAdmin(admin.ModelAdmin):
+class CourseSubjectAdmin(CourseCounterAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'course', 'subject', 'position', 'start_date')
     list_filter = ('course',)
     search_fields = ('course__name', 'subject__name')
 
 @admin.register(CourseSupervisor)
-class CourseSupervisorAdmin(admin.ModelAdmin):
+class CourseSupervisorAdmin(CourseCounterAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'course', 'supervisor')
     list_filter = ('course',)
 
@@ -20,6 +49,23 @@ class CourseCategoryAdmin(admin.ModelAdmin):
     list_display = ('id', 'course', 'category')
     list_filter = ('category',)
 
+@admin.register(EnrollmentJob)
+class EnrollmentJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'course', 'status', 'total', 'done', 'skipped', 'failed', 'created_at')
+    list_filter = ('status',)
+    exclude = ('trainee_ids',)
+
+@admin.register(CourseStat)
+class CourseStatAdmin(admin.ModelAdmin):
+    list_display = ('course', 'subjects_taken', 'subjects_finished')
+
+@admin.register(GlobalStat)
+class GlobalStatAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'courses_not_started', 'courses_in_progress', 'courses_finished',
+        'trainees', 'subjects_taken', 'subjects_finished',
+    )
+
 class CourseSubjectInline(admin.TabularInline):
     model = CourseSubject
     extra = 0
@@ -34,4 +80,13 @@ class CourseAdmin(admin.ModelAdmin):
     list_display = ('name', 'start_date', 'finish_date', 'status', 'creator')
     search_fields = ('name',)
     list_filter = ('status',)
-    inlines = [CourseSubjectInline, CourseSupervisorInline]
\ No newline at end of file
+    inlines = [CourseSubjectInline, CourseSupervisorInline]
+
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        field = CourseCounterService.COUNTERS.get(formset.model)
+        if field:
+            CourseCounterService.adjust(
+                formset.instance.pk,
+                **{field: len(formset.new_objects) - len(formset.deleted_objects)},
+            )
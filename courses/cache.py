@@ -0,0 +1,93 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import bump_on_commit, get_or_compute
+from courses.models.course_supervisor_model import CourseSupervisor
+from users.models.user_task import UserTask
+
+COURSE_DETAIL_TIMEOUT = 60 * 60
+COURSE_ANALYTICS_TIMEOUT = 60 * 60
+
+# Dashboard admin (toàn hệ thống)
+DASHBOARD_GLOBAL_SCOPE = "dashboard"
+# Thông tin user (số supervisor, tên trong hoạt động gần đây) dùng chung cho mọi dashboard
+DASHBOARD_USERS_SCOPE = "dashboard:users"
+
+
+def course_scope(course_id):
+    return f"course:{course_id}"
+
+
+def course_progress_scope(course_id):
+    return f"course:{course_id}:progress"
+
+
+def supervisor_dashboard_scope(supervisor_id):
+    return f"dashboard:supervisor:{supervisor_id}"
+
+
+def get_course_detail_shared(course_id, builder):
+    """
+    Phần dữ liệu chi tiết khóa học giống nhau cho mọi trainee
+    (danh sách subject, trainer, trainee), cache theo course.
+    """
+    return get_or_compute(
+        "courses:detail:shared",
+        [course_scope(course_id)],
+        builder,
+        timeout=COURSE_DETAIL_TIMEOUT,
+    )
+
+
+def invalidate_course_detail(*course_ids):
+    bump_on_commit(*[course_scope(course_id) for course_id in course_ids])
+
+
+def get_course_analytics(course_id, builder):
+    """
+    Thống kê khóa học, cache đến khi cấu trúc khóa học (course_scope)
+    hoặc tiến độ của trainee (course_progress_scope) thay đổi.
+    Số trainee quá hạn phụ thuộc ngày hiện tại nên key gồm cả ngày.
+    """
+    return get_or_compute(
+        f"courses:analytics:{timezone.localdate().isoformat()}",
+        [course_scope(course_id), course_progress_scope(course_id)],
+        builder,
+        timeout=COURSE_ANALYTICS_TIMEOUT,
+    )
+
+
+def invalidate_course_progress(*course_ids):
+    bump_on_commit(*[course_progress_scope(course_id) for course_id in course_ids])
+
+
+def invalidate_task_progress(tasks):
+    """
+    Bump thống kê các khóa học có UserTask (đã ghi spent_time) của `tasks`,
+    gọi trước khi xóa task. 1 query.
+    """
+    invalidate_course_progress(
+        *UserTask.objects.filter(task__in=tasks, spent_time__isnull=False)
+        .values_list("user_subject__course_subject__course_id", flat=True)
+        .distinct()
+    )
+
+
+def invalidate_dashboards(course_ids=(), course_subject_ids=(), supervisor_ids=()):
+    """
+    Bump dashboard admin và dashboard của các supervisor phụ trách
+    các khóa học liên quan (tối đa 1 query tìm supervisor).
+    """
+    supervisor_ids = set(supervisor_ids)
+    if course_ids or course_subject_ids:
+        supervisor_ids.update(
+            CourseSupervisor.objects.filter(
+                Q(course_id__in=list(course_ids))
+                | Q(course__coursesubject__in=list(course_subject_ids))
+            ).values_list("supervisor_id", flat=True)
+        )
+
+    bump_on_commit(
+        DASHBOARD_GLOBAL_SCOPE,
+        *[supervisor_dashboard_scope(supervisor_id) for supervisor_id in supervisor_ids],
+    )
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_course_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    counters = {
+        'member_count': apps.get_model('users', 'UserCourse'),
+        'supervisor_count': apps.get_model('courses', 'CourseSupervisor'),
+        'subject_count': apps.get_model('courses', 'CourseSubject'),
+    }
+
+    def count(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(course=OuterRef('pk'))
+                .order_by()
+                .values('course')
+                .annotate(total=Count('pk'))
+                .values('total'),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    Course.objects.update(**{field: count(model) for field, model in counters.items()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_courses_cou_created_7ad857_idx'),
+        ('users', '0003_comment_users_comme_content_e19f58_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='subject_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='supervisor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_course_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# UserSubject.Status: FINISHED_EARLY, FINISHED_ON_TIME, FINISED_BUT_OVERDUE
+FINISHED_STATUSES = (2, 3, 4)
+# Course.Status -> cột trên GlobalStat
+COURSE_STATUS_FIELDS = {0: 'courses_not_started', 1: 'courses_in_progress', 2: 'courses_finished'}
+
+
+def backfill_dashboard_stats(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    CourseStat = apps.get_model('courses', 'CourseStat')
+    GlobalStat = apps.get_model('courses', 'GlobalStat')
+    UserCourse = apps.get_model('users', 'UserCourse')
+    UserSubject = apps.get_model('users', 'UserSubject')
+
+    finished = Q(status__in=FINISHED_STATUSES)
+    per_course = {
+        row['course_subject__course']: row
+        for row in UserSubject.objects.order_by()
+        .values('course_subject__course')
+        .annotate(taken=Count('pk'), finished=Count('pk', filter=finished))
+    }
+    CourseStat.objects.bulk_create(
+        [
+            CourseStat(
+                course_id=course_id,
+                subjects_taken=per_course.get(course_id, {}).get('taken', 0),
+                subjects_finished=per_course.get(course_id, {}).get('finished', 0),
+            )
+            for course_id in Course.objects.values_list('pk', flat=True)
+        ],
+        batch_size=1000,
+    )
+
+    by_status = dict(Course.objects.order_by().values_list('status').annotate(total=Count('pk')))
+    subjects = UserSubject.objects.aggregate(taken=Count('pk'), finished=Count('pk', filter=finished))
+    GlobalStat.objects.create(
+        pk=1,
+        trainees=UserCourse.objects.values('user').distinct().count(),
+        subjects_taken=subjects['taken'],
+        subjects_finished=subjects['finished'],
+        **{field: by_status.get(status, 0) for status, field in COURSE_STATUS_FIELDS.items()},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStat',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='courses.course')),
+                ('subjects_taken', models.PositiveIntegerField(default=0)),
+                ('subjects_finished', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GlobalStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('courses_not_started', models.PositiveIntegerField(default=0)),
+                ('courses_in_progress', models.PositiveIntegerField(default=0)),
+                ('courses_finished', models.PositiveIntegerField(default=0)),
+                ('trainees', models.PositiveIntegerField(default=0)),
+                ('subjects_taken', models.PositiveIntegerField(default=0)),
+                ('subjects_finished', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_dashboard_stats, migrations.RunPython.noop),
+    ]
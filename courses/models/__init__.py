@@ -1,4 +1,6 @@
 from .course_model import Course
 from .course_supervisor_model import CourseSupervisor
 from .course_category import CourseCategory
-from .course_subject import CourseSubject
\ No newline at end of file
+from .course_subject import CourseSubject
+from .enrollment_job import EnrollmentJob
+from .course_stat import CourseStat, GlobalStat
\ No newline at end of file
@@ -30,6 +30,18 @@ class Course(models.Model):
         related_name="supervised_courses",
     )
 
+    # Bộ đếm denormalize, cập nhật bằng F() qua CourseCounterService
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    supervisor_count = models.PositiveIntegerField(default=0, editable=False)
+    subject_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("member_count", "supervisor_count", "subject_count")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
+
     def clean(self):
         if self.finish_date < self.start_date:
             raise ValidationError("Finish date cannot be earlier than start date.")
@@ -43,6 +55,17 @@ class Course(models.Model):
                 self.status = self.Status.IN_PROGRESS
             else:
                 self.status = self.Status.FINISHED
+        if (
+            not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            # Không ghi đè bộ đếm bằng giá trị cũ đang giữ trong instance
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class CourseStat(models.Model):
+    """
+    Số liệu tổng hợp theo khóa học cho dashboard, được cập nhật dần
+    bằng F() mỗi khi UserSubject thay đổi (xem DashboardStatService).
+    """
+
+    course = models.OneToOneField(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stat",
+    )
+    subjects_taken = models.PositiveIntegerField(default=0)
+    subjects_finished = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Stat of course #{self.course_id}"
+
+
+class GlobalStat(models.Model):
+    """
+    Số liệu tổng hợp toàn hệ thống cho dashboard admin, chỉ có 1 dòng (pk=1).
+    """
+
+    SINGLETON_ID = 1
+
+    courses_not_started = models.PositiveIntegerField(default=0)
+    courses_in_progress = models.PositiveIntegerField(default=0)
+    courses_finished = models.PositiveIntegerField(default=0)
+    trainees = models.PositiveIntegerField(default=0)
+    subjects_taken = models.PositiveIntegerField(default=0)
+    subjects_finished = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return "Global stat"
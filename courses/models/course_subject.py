@@ -1,5 +1,7 @@
 from django.db import models
 from subjects.models.subject import Subject
+from subjects.models.task import Task
+from subjects.models.taskable import TaskableDescriptor
 
 class CourseSubject(models.Model):
     course = models.ForeignKey('courses.Course', on_delete=models.CASCADE)
@@ -10,6 +12,8 @@ class CourseSubject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tasks = TaskableDescriptor(Task.TaskType.COURSE_SUBJECT)
+
     class Meta:
         unique_together = ('course', 'subject')
         ordering = ['position']
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import models
+
+
+class EnrollmentJob(models.Model):
+    class Status(models.IntegerChoices):
+        PENDING = 0, "Pending"
+        RUNNING = 1, "Running"
+        FINISHED = 2, "Finished"
+        FAILED = 3, "Failed"
+
+    course = models.ForeignKey(
+        'courses.Course', on_delete=models.CASCADE, related_name='enrollment_jobs'
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='enrollment_jobs',
+    )
+    trainee_ids = models.JSONField(default=list)
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    @property
+    def processed(self):
+        return self.done + self.skipped + self.failed
+
+    def __str__(self):
+        return f"Enrollment job #{self.pk} - {self.course_id} ({self.get_status_display()})"
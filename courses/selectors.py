@@ -1,4 +1,13 @@
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from courses.models.course_category import CourseCategory
 from courses.models.course_model import Course
+from courses.models.course_subject import CourseSubject
+from courses.models.course_supervisor_model import CourseSupervisor
+from users.models.comment import Comment
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
 
 def get_all_courses() -> list[Course]:
     return Course.objects.all()
@@ -18,3 +27,101 @@ def get_courses_by_name_and_creator(name: str, creator_id: int) -> list[Course]:
         queryset = queryset.filter(creator_id=creator_id)
 
     return queryset
+
+def count_by_course(model, course_field="course", **filters):
+    """
+    Subquery đếm số dòng của `model` theo course, dùng cho annotate
+    (tránh nhân bản dòng khi annotate nhiều Count cùng lúc).
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{course_field: OuterRef("pk")}, **filters)
+            .order_by()
+            .values(course_field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+def get_course_list_queryset(queryset=None):
+    """
+    Queryset cho danh sách khóa học dùng với CourseSerializer:
+    prefetch supervisors, categories, subjects cùng task của subject,
+    nên số query cố định theo số khóa học.
+    """
+    if queryset is None:
+        queryset = Course.objects.all()
+
+    return queryset.prefetch_related(
+        Prefetch(
+            "supervisors",
+            queryset=CourseSupervisor.objects.select_related("supervisor"),
+        ),
+        Prefetch(
+            "coursecategory_set",
+            queryset=CourseCategory.objects.select_related("category").order_by(
+                "category__name"
+            ),
+        ),
+        Prefetch(
+            "coursesubject_set",
+            queryset=CourseSubject.objects.select_related("subject"),
+        ),
+        "coursesubject_set__subject__tasks",
+    )
+
+def get_trainee_course_list_queryset(user):
+    """
+    Danh sách khóa học của trainee kèm số subject trainee đã hoàn thành,
+    tính trong cùng 1 câu query.
+    """
+    return (
+        Course.objects.filter(user_courses__user=user)
+        .distinct()
+        .annotate(
+            completed_subject_count=count_by_course(
+                UserSubject,
+                course_field="course_subject__course",
+                user=user,
+                status=2,
+            ),
+        )
+        .prefetch_related(
+            Prefetch(
+                "supervisors",
+                queryset=CourseSupervisor.objects.select_related("supervisor"),
+            )
+        )
+        .order_by("-created_at")
+    )
+
+
+def get_user_subject_detail_queryset():
+    """
+    UserSubject kèm course_subject, subject, course, các task và comment mới
+    nhất (last_comment_content, last_comment_updated_at): 1 query chính
+    và 1 query prefetch task.
+    """
+    last_comment = Comment.objects.filter(
+        content_type__app_label=UserSubject._meta.app_label,
+        content_type__model=UserSubject._meta.model_name,
+        object_id=OuterRef("pk"),
+    ).order_by("-updated_at", "-id")
+
+    return (
+        UserSubject.objects.select_related(
+            "course_subject__subject", "course_subject__course"
+        )
+        .annotate(
+            last_comment_content=Subquery(last_comment.values("content")[:1]),
+            last_comment_updated_at=Subquery(last_comment.values("updated_at")[:1]),
+        )
+        .prefetch_related(
+            Prefetch(
+                "user_tasks",
+                queryset=UserTask.objects.select_related("task").order_by("id"),
+            )
+        )
+    )
@@ -5,6 +5,7 @@ from users.models.user_course import UserCourse
 from users.models.user_subject import UserSubject
 from courses.models.course_subject import CourseSubject
 from authen.models import CustomUser
+from courses.cache import get_course_detail_shared
 
 
 class TrainerSerializer(serializers.ModelSerializer):
@@ -102,9 +103,28 @@ class TraineeCourseFullDetailSerializer(serializers.ModelSerializer):
     def get_finish_date_fmt(self, obj):
         return obj.finish_date.strftime("%d/%m/%Y")
 
-    def get_subjects(self, obj):
+    def _get_shared(self, obj):
+        # Phần subjects/members giống nhau cho mọi trainee nên được cache theo course
+        if not hasattr(self, '_shared_cache'):
+            self._shared_cache = {}
+        if obj.id not in self._shared_cache:
+            self._shared_cache[obj.id] = get_course_detail_shared(
+                obj.id, lambda: self._build_shared(obj)
+            )
+        return self._shared_cache[obj.id]
+
+    def _build_shared(self, obj):
         qs = CourseSubject.objects.filter(course=obj).select_related('subject').order_by('position')
-        
+        subjects = [dict(item) for item in CourseSubjectInfoSerializer(qs, many=True).data]
+
+        return {
+            "subjects": {"count": len(subjects), "list": subjects},
+            "members": self._build_members(obj),
+        }
+
+    def get_subjects(self, obj):
+        shared = self._get_shared(obj)['subjects']
+
         request = self.context.get('request')
         user_subjects_map = {}
         if request:
@@ -114,12 +134,24 @@ class TraineeCourseFullDetailSerializer(serializers.ModelSerializer):
             )
             user_subjects_map = {us.course_subject_id: us for us in user_subjects}
 
+        subjects = []
+        for item in shared["list"]:
+            us = user_subjects_map.get(item["id"])
+            subjects.append({
+                **item,
+                "my_status": us.get_status_display() if us else "Not Started",
+                "my_score": us.score if us else None,
+            })
+
         return {
-            "count": qs.count(),
-            "list": CourseSubjectInfoSerializer(qs, many=True, context={'user_subjects_map': user_subjects_map}).data
+            "count": shared["count"],
+            "list": subjects
         }
 
     def get_members(self, obj):
+        return self._get_shared(obj)['members']
+
+    def _build_members(self, obj):
         supervisors = obj.supervisors.all().select_related('supervisor')
         trainer_list = [s.supervisor for s in supervisors]
         
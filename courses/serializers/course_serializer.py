@@ -10,6 +10,8 @@ from courses.models.course_category import CourseCategory
 from subjects.models.task import Task
 from subjects.models.subject import Subject
 from courses.serializers.course_supervisor_serializer import CourseSupervisorSerializer
+from courses.cache import invalidate_dashboards
+from courses.services import CourseCounterService, CourseCreateService
 
 
 class UserBasicSerializer(serializers.ModelSerializer):
@@ -65,8 +67,6 @@ class CourseSubjectSerializer(serializers.ModelSerializer):
 
 
 class CourseSerializer(serializers.ModelSerializer):
-    supervisor_count = serializers.SerializerMethodField()
-    member_count = serializers.SerializerMethodField()
     categories = serializers.SerializerMethodField()
 
     supervisors = CourseSupervisorSerializer(many=True, read_only=True)
@@ -94,14 +94,13 @@ class CourseSerializer(serializers.ModelSerializer):
             "member_count",
         ]
 
-    def get_supervisor_count(self, obj):
-        return CourseSupervisor.objects.filter(course=obj).count()
-
-    def get_member_count(self, obj):
-        return UserCourse.objects.filter(course=obj).count()
-
+    # categories được prefetch sẵn bởi courses.selectors.get_course_list_queryset
+    # khi serialize danh sách.
     def get_categories(self, obj):
-        categories = Category.objects.filter(coursecategory__course=obj)
+        if "coursecategory_set" in getattr(obj, "_prefetched_objects_cache", {}):
+            categories = [cc.category for cc in obj.coursecategory_set.all()]
+        else:
+            categories = Category.objects.filter(coursecategory__course=obj)
         return CategoryBasicSerializer(categories, many=True).data
 
 
@@ -179,7 +178,6 @@ class CourseCreateSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
-        print("--- [DEBUG] SERIALIZER CREATE ---")
         subjects_ids = validated_data.pop("subjects", [])
         supervisors_ids = validated_data.pop("supervisors", [])
         categories_ids = validated_data.pop("categories", [])
@@ -192,6 +190,8 @@ class CourseCreateSerializer(serializers.ModelSerializer):
                 for uid in supervisors_ids
             ]
             CourseSupervisor.objects.bulk_create(links)
+            CourseCounterService.adjust(course, supervisor_count=len(links))
+            invalidate_dashboards(supervisor_ids=supervisors_ids)
 
         if categories_ids:
             cat_links = [
@@ -200,25 +200,7 @@ class CourseCreateSerializer(serializers.ModelSerializer):
             CourseCategory.objects.bulk_create(cat_links)
 
         if subjects_ids:
-            for idx, sub_id in enumerate(subjects_ids):
-                cs = CourseSubject.objects.create(
-                    course=course, subject_id=sub_id, position=idx
-                )
-
-                original_tasks = Task.objects.filter(
-                    taskable_type=Task.TaskType.SUBJECT, taskable_id=sub_id
-                )
-
-                new_tasks = [
-                    Task(
-                        name=t.name,
-                        taskable_type=Task.TaskType.COURSE_SUBJECT,
-                        taskable_id=cs.id,
-                        position=t.position,
-                    )
-                    for t in original_tasks
-                ]
-                Task.objects.bulk_create(new_tasks)
+            CourseCreateService.add_subjects(course, subjects_ids)
 
         return course
 
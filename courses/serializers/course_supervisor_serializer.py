@@ -2,8 +2,10 @@ from rest_framework import serializers
 from django.db import transaction
 
 from authen.models import CustomUser
+from core.fields import BulkPrimaryKeyRelatedField
 from courses.models.course_supervisor_model import CourseSupervisor
 from courses.models.course_model import Course
+from courses.models.enrollment_job import EnrollmentJob
 from subjects.models.subject import Subject
 from users.models.comment import Comment
 
@@ -23,26 +25,59 @@ class CourseSupervisorSerializer(serializers.ModelSerializer):
 
 
 class AddTraineeSerializer(serializers.Serializer):
-    trainee_ids = serializers.PrimaryKeyRelatedField(
-        many=True,
-        queryset=CustomUser.objects.filter(role="TRAINEE"),
+    trainee_ids = BulkPrimaryKeyRelatedField(
+        queryset=CustomUser.objects.all(),
+        limit_choices_to={"role": CustomUser.Role.TRAINEE},
+        error_messages={
+            "incorrect_choice": "Users with ID {pk_values} are not trainees."
+        },
     )
 
-    def validate_trainee_ids(self, value):
-        for trainee in value:
-            if trainee.role != CustomUser.Role.TRAINEE:
-                raise serializers.ValidationError(
-                    f"User with ID {trainee.id} is not a trainee."
-                )
-        return value
-
 
 class AddSupervisorSerializer(serializers.Serializer):
-    supervisor_ids = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=CustomUser.objects.filter(role="SUPERVISOR")
+    supervisor_ids = BulkPrimaryKeyRelatedField(
+        queryset=CustomUser.objects.all(),
+        limit_choices_to={"role": CustomUser.Role.SUPERVISOR},
+        error_messages={
+            "incorrect_choice": "Users with ID {pk_values} are not supervisors."
+        },
     )
 
 
+class EnrollmentJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+    processed = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = EnrollmentJob
+        fields = [
+            "id",
+            "course",
+            "status",
+            "status_display",
+            "total",
+            "processed",
+            "done",
+            "skipped",
+            "failed",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class DuplicateCourseSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    start_date = serializers.DateField(required=False)
+
+    def validate_name(self, value):
+        if Course.objects.filter(name=value).exists():
+            raise serializers.ValidationError("Course with this name already exists.")
+        return value
+
+
 class DeleteIDSerializer(serializers.Serializer):
     id = serializers.IntegerField()
 
@@ -6,8 +6,6 @@ from users.models.user_subject import UserSubject
 
 class TraineeCourseListSerializer(serializers.ModelSerializer):
     supervisors = serializers.SerializerMethodField()
-    subject_count = serializers.SerializerMethodField()
-    member_count = serializers.SerializerMethodField()
     progress = serializers.SerializerMethodField()
 
     class Meta:
@@ -32,27 +30,24 @@ class TraineeCourseListSerializer(serializers.ModelSerializer):
             if cs.supervisor
         ]
 
-    def get_subject_count(self, obj):
-        return CourseSubject.objects.filter(course=obj).count()
-
-    def get_member_count(self, obj):
-
-        return UserCourse.objects.filter(course=obj).count()
-
     def get_progress(self, obj):
 
         request = self.context.get('request')
         if not request or not request.user:
             return 0.0
 
-        total_subjects = CourseSubject.objects.filter(course=obj).count()
+        total_subjects = obj.subject_count
         if total_subjects == 0:
             return 0.0
 
-        completed_subjects = UserSubject.objects.filter(
-            user=request.user,
-            course_subject__course=obj,
-            status=2 
-        ).count()
+        # completed_subject_count được annotate sẵn
+        # bởi courses.selectors.get_trainee_course_list_queryset
+        completed_subjects = getattr(obj, 'completed_subject_count', None)
+        if completed_subjects is None:
+            completed_subjects = UserSubject.objects.filter(
+                user=request.user,
+                course_subject__course=obj,
+                status=2 
+            ).count()
 
         return round((completed_subjects / total_subjects) * 100, 1)
\ No newline at end of file
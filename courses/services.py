@@ -1,6 +1,473 @@
+import csv
+from collections import Counter
+from datetime import timedelta
+from itertools import groupby
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from authen.models import CustomUser
+from core.ordering import next_position, sparse_positions
+from courses.cache import (
+    invalidate_course_detail,
+    invalidate_course_progress,
+    invalidate_dashboards,
+)
+from courses.models.course_category import CourseCategory
 from courses.models.course_model import Course
+from courses.models.course_stat import CourseStat, GlobalStat
 from courses.models.course_subject import CourseSubject
 from courses.models.course_supervisor_model import CourseSupervisor
+from courses.models.enrollment_job import EnrollmentJob
+from courses.selectors import count_by_course
+from subjects.models.task import Task
+from users.models.user_course import UserCourse
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+
+
+def _counter_updates(deltas):
+    """Biểu thức F() cộng/trừ cho từng bộ đếm, không để giá trị âm."""
+    return {
+        field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+    }
+
+
+class CourseCounterService:
+    # Model liên kết -> bộ đếm tương ứng trên Course
+    COUNTERS = {
+        UserCourse: "member_count",
+        CourseSupervisor: "supervisor_count",
+        CourseSubject: "subject_count",
+    }
+
+    @staticmethod
+    def adjust(course, **deltas):
+        """
+        Cộng/trừ bộ đếm của course bằng F() trong 1 câu UPDATE,
+        vd: adjust(course, member_count=3, subject_count=-1).
+        course là Course (giá trị trong instance được làm mới) hoặc course id.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        course_id = getattr(course, "pk", course)
+        Course.objects.filter(pk=course_id).update(**_counter_updates(deltas))
+
+        if isinstance(course, Course):
+            course.refresh_from_db(fields=list(deltas))
+
+    @staticmethod
+    def adjust_links(model, course_ids, delta):
+        """
+        Cộng `delta` vào bộ đếm ứng với model liên kết (UserCourse,
+        CourseSupervisor, CourseSubject) cho từng course id trong danh sách,
+        course id lặp lại thì cộng dồn. Dùng cho các luồng ghi từng dòng như admin.
+        """
+        field = CourseCounterService.COUNTERS[model]
+        for course_id, count in Counter(course_ids).items():
+            CourseCounterService.adjust(course_id, **{field: delta * count})
+
+    @staticmethod
+    def reconcile(course_ids=None):
+        """
+        Đếm lại từ các bảng liên kết và sửa những course bị lệch.
+        Trả về danh sách course đã sửa.
+        """
+        queryset = Course.objects.all()
+        if course_ids:
+            queryset = queryset.filter(pk__in=course_ids)
+
+        actual = {
+            field: f"actual_{field}" for field in CourseCounterService.COUNTERS.values()
+        }
+        drifted = Q()
+        for field, alias in actual.items():
+            drifted |= ~Q(**{field: F(alias)})
+
+        courses = list(
+            queryset.annotate(
+                **{
+                    actual[field]: count_by_course(model)
+                    for model, field in CourseCounterService.COUNTERS.items()
+                }
+            )
+            .filter(drifted)
+            .order_by("pk")
+        )
+        for course in courses:
+            for field, alias in actual.items():
+                setattr(course, field, getattr(course, alias))
+
+        Course.objects.bulk_update(courses, list(actual), batch_size=500)
+        return courses
+
+
+class DashboardStatService:
+    FINISHED_STATUSES = (
+        UserSubject.Status.FINISHED_EARLY,
+        UserSubject.Status.FINISHED_ON_TIME,
+        UserSubject.Status.FINISED_BUT_OVERDUE,
+    )
+    COURSE_STATUS_FIELDS = {
+        Course.Status.NOT_STARTED: "courses_not_started",
+        Course.Status.IN_PROGRESS: "courses_in_progress",
+        Course.Status.FINISHED: "courses_finished",
+    }
+
+    @staticmethod
+    def adjust_global(**deltas):
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            GlobalStat.objects.filter(pk=GlobalStat.SINGLETON_ID).update(
+                **_counter_updates(deltas)
+            )
+
+    @staticmethod
+    def adjust_course_status(old_status=None, new_status=None):
+        deltas = {}
+        if old_status is not None:
+            field = DashboardStatService.COURSE_STATUS_FIELDS[old_status]
+            deltas[field] = deltas.get(field, 0) - 1
+        if new_status is not None:
+            field = DashboardStatService.COURSE_STATUS_FIELDS[new_status]
+            deltas[field] = deltas.get(field, 0) + 1
+        DashboardStatService.adjust_global(**deltas)
+
+    @staticmethod
+    def adjust_subjects(course_id=None, course_subject_id=None, taken=0, finished=0):
+        """
+        Cộng/trừ số subject đã nhận/đã hoàn thành cho khóa học (theo course_id
+        hoặc course_subject_id) và cho số liệu toàn hệ thống (2 câu UPDATE).
+        """
+        deltas = {
+            field: delta
+            for field, delta in (("subjects_taken", taken), ("subjects_finished", finished))
+            if delta
+        }
+        if not deltas:
+            return
+
+        if course_id is not None:
+            stats = CourseStat.objects.filter(course_id=course_id)
+        else:
+            stats = CourseStat.objects.filter(course__coursesubject=course_subject_id)
+        stats.update(**_counter_updates(deltas))
+        DashboardStatService.adjust_global(**deltas)
+
+    @staticmethod
+    def count_subjects(user_subjects):
+        """
+        (số subject đã nhận, số đã hoàn thành) của tập UserSubject, 1 query.
+        """
+        counts = user_subjects.aggregate(
+            taken=Count("pk"),
+            finished=Count(
+                "pk", filter=Q(status__in=DashboardStatService.FINISHED_STATUSES)
+            ),
+        )
+        return counts["taken"], counts["finished"]
+
+    @staticmethod
+    def count_last_enrollments(course, trainee_ids=None):
+        """
+        Số trainee (trong trainee_ids nếu có) không còn học khóa nào khác
+        ngoài `course`, tức số trainee giảm đi khi rời khóa học. 1 query.
+        """
+        enrollments = UserCourse.objects.filter(course=course)
+        if trainee_ids is not None:
+            enrollments = enrollments.filter(user_id__in=list(trainee_ids))
+        return enrollments.exclude(
+            user_id__in=UserCourse.objects.exclude(course=course).values("user_id")
+        ).count()
+
+    @staticmethod
+    def remove_course(course, status):
+        """
+        Trừ số liệu của khóa học sắp bị xóa khỏi GlobalStat bằng 2 query đọc
+        và 1 UPDATE (CourseStat bị xóa theo khóa học).
+        """
+        taken, finished = DashboardStatService.count_subjects(
+            UserSubject.objects.filter(course_subject__course=course)
+        )
+        DashboardStatService.adjust_global(
+            **{DashboardStatService.COURSE_STATUS_FIELDS[status]: -1},
+            trainees=-DashboardStatService.count_last_enrollments(course),
+            subjects_taken=-taken,
+            subjects_finished=-finished,
+        )
+
+    @staticmethod
+    def is_finished(status):
+        return status in DashboardStatService.FINISHED_STATUSES
+
+    @staticmethod
+    def get_global():
+        stat = GlobalStat.objects.filter(pk=GlobalStat.SINGLETON_ID).first()
+        return stat if stat is not None else DashboardStatService.rebuild()
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild():
+        """
+        Tính lại toàn bộ CourseStat và GlobalStat từ dữ liệu gốc.
+        Trả về GlobalStat sau khi tính lại.
+        """
+        finished = Q(status__in=DashboardStatService.FINISHED_STATUSES)
+        per_course = {
+            row["course_subject__course"]: row
+            for row in UserSubject.objects.order_by()
+            .values("course_subject__course")
+            .annotate(taken=Count("pk"), finished=Count("pk", filter=finished))
+        }
+
+        CourseStat.objects.all().delete()
+        CourseStat.objects.bulk_create(
+            [
+                CourseStat(
+                    course_id=course_id,
+                    subjects_taken=per_course.get(course_id, {}).get("taken", 0),
+                    subjects_finished=per_course.get(course_id, {}).get("finished", 0),
+                )
+                for course_id in Course.objects.values_list("pk", flat=True)
+            ],
+            batch_size=1000,
+        )
+
+        by_status = dict(
+            Course.objects.order_by()
+            .values_list("status")
+            .annotate(total=Count("pk"))
+        )
+        subjects = UserSubject.objects.aggregate(
+            taken=Count("pk"), finished=Count("pk", filter=finished)
+        )
+        stat, _ = GlobalStat.objects.update_or_create(
+            pk=GlobalStat.SINGLETON_ID,
+            defaults={
+                **{
+                    field: by_status.get(status, 0)
+                    for status, field in DashboardStatService.COURSE_STATUS_FIELDS.items()
+                },
+                "trainees": UserCourse.objects.values("user").distinct().count(),
+                "subjects_taken": subjects["taken"],
+                "subjects_finished": subjects["finished"],
+            },
+        )
+        return stat
+
+
+class CourseAnalyticsService:
+    # Phổ điểm theo % max_score của subject: 10 khoảng 0-10, 10-20, ..., 90-100
+    SCORE_BINS = 10
+    SPENT_TIME_PERCENTILES = (25, 50, 75, 90)
+
+    @staticmethod
+    def compute(course):
+        """
+        Thống kê tiến độ khóa học theo từng CourseSubject: tỉ lệ hoàn thành,
+        số trainee quá hạn, phổ điểm và phân vị spent_time của task.
+        Chỉ lấy các cột cần thiết (3 query), phần tính toán dùng NumPy.
+        """
+        course_subjects = list(
+            CourseSubject.objects.filter(course=course)
+            .order_by("position")
+            .values_list("id", "subject__name", "subject__max_score", "finish_date")
+        )
+        rows = list(
+            UserSubject.objects.filter(course_subject__course=course)
+            .order_by()
+            .values_list("course_subject_id", "status", "score")
+        )
+        spent_rows = list(
+            UserTask.objects.filter(
+                user_subject__course_subject__course=course, spent_time__isnull=False
+            )
+            .order_by()
+            .values_list("user_subject__course_subject_id", "spent_time")
+        )
+
+        n = len(course_subjects)
+        bins = CourseAnalyticsService.SCORE_BINS
+        percentiles = CourseAnalyticsService.SPENT_TIME_PERCENTILES
+
+        cs_ids = np.array([cs[0] for cs in course_subjects], dtype=np.int64)
+        order = np.argsort(cs_ids)
+        max_scores = np.array([cs[2] or 0 for cs in course_subjects], dtype=float)
+        today = timezone.localdate()
+        past_due = np.array(
+            [cs[3] is not None and cs[3] < today for cs in course_subjects], dtype=bool
+        )
+
+        def subject_index(ids):
+            # course_subject_id -> vị trí trong course_subjects
+            return order[np.searchsorted(cs_ids, ids, sorter=order)]
+
+        if rows:
+            data = np.array(rows, dtype=float)
+            idx = subject_index(data[:, 0].astype(np.int64))
+            status = data[:, 1].astype(np.int64)
+            score = data[:, 2]
+        else:
+            idx = np.empty(0, dtype=np.int64)
+            status = np.empty(0, dtype=np.int64)
+            score = np.empty(0, dtype=float)
+
+        finished = np.isin(status, DashboardStatService.FINISHED_STATUSES)
+        overdue = (status == UserSubject.Status.OVERDUE_AND_NOT_FINISHED) | (
+            ~finished & past_due[idx]
+        )
+        trainees = np.bincount(idx, minlength=n)
+        finished_count = np.bincount(idx, weights=finished, minlength=n).astype(np.int64)
+        overdue_count = np.bincount(idx, weights=overdue, minlength=n).astype(np.int64)
+        completion_rate = np.divide(
+            finished_count * 100.0,
+            trainees,
+            out=np.zeros(n),
+            where=trainees > 0,
+        )
+
+        # Điểm quy về % max_score, bỏ qua điểm trống và subject không có max_score
+        graded = ~np.isnan(score) & (max_scores[idx] > 0)
+        graded_idx = idx[graded]
+        percent = np.clip(score[graded] / max_scores[graded_idx] * 100, 0, 100)
+        score_bin = np.minimum((percent // (100 / bins)).astype(np.int64), bins - 1)
+        histogram = np.bincount(
+            graded_idx * bins + score_bin, minlength=n * bins
+        ).reshape(n, bins)
+        score_sum = np.bincount(graded_idx, weights=percent, minlength=n)
+        graded_count = np.bincount(graded_idx, minlength=n)
+
+        if spent_rows:
+            spent = np.array(spent_rows, dtype=float)
+            spent_idx = subject_index(spent[:, 0].astype(np.int64))
+            spent_time = spent[:, 1]
+        else:
+            spent_idx = np.empty(0, dtype=np.int64)
+            spent_time = np.empty(0, dtype=float)
+
+        def spent_time_stats(values):
+            if not values.size:
+                return {"count": 0, "mean": None, "percentiles": None}
+            return {
+                "count": int(values.size),
+                "mean": round(float(values.mean()), 1),
+                "percentiles": {
+                    f"p{p}": round(float(v), 1)
+                    for p, v in zip(percentiles, np.percentile(values, percentiles))
+                },
+            }
+
+        # Gom spent_time theo subject sau khi sắp xếp 1 lần
+        spent_order = np.argsort(spent_idx, kind="stable")
+        spent_groups = np.split(
+            spent_time[spent_order],
+            np.searchsorted(spent_idx[spent_order], np.arange(1, n)),
+        )
+
+        subjects = []
+        for i, (cs_id, name, _, finish_date) in enumerate(course_subjects):
+            subjects.append(
+                {
+                    "course_subject_id": cs_id,
+                    "subject_name": name,
+                    "finish_date": finish_date,
+                    "trainees": int(trainees[i]),
+                    "finished": int(finished_count[i]),
+                    "completion_rate": round(float(completion_rate[i]), 1),
+                    "overdue": int(overdue_count[i]),
+                    "average_score_percent": (
+                        round(float(score_sum[i] / graded_count[i]), 1)
+                        if graded_count[i]
+                        else None
+                    ),
+                    "score_histogram": histogram[i].tolist(),
+                    "spent_time": spent_time_stats(spent_groups[i]),
+                }
+            )
+
+        total = int(trainees.sum())
+        return {
+            "course_id": course.id,
+            "generated_at": timezone.now(),
+            "score_bins": np.linspace(0, 100, bins + 1).tolist(),
+            "summary": {
+                "user_subjects": total,
+                "finished": int(finished_count.sum()),
+                "completion_rate": (
+                    round(float(finished_count.sum() * 100 / total), 1) if total else 0.0
+                ),
+                "overdue": int(overdue_count.sum()),
+                "score_histogram": histogram.sum(axis=0).tolist(),
+                "spent_time": spent_time_stats(spent_time),
+            },
+            "subjects": subjects,
+        }
+
+
+class _Echo:
+    """Pseudo-buffer cho csv.writer: write() trả lại dòng thay vì ghi ra đâu đó."""
+
+    def write(self, value):
+        return value
+
+
+class GradebookExportService:
+    CHUNK_SIZE = 2000
+
+    @staticmethod
+    def iter_csv(course):
+        """
+        Sinh bảng điểm CSV (mỗi trainee 1 dòng, mỗi subject 3 cột: điểm,
+        trạng thái, ngày hoàn thành) từng dòng một, đọc UserSubject theo
+        chunk và sắp theo user nên không giữ cả bảng trong bộ nhớ.
+        """
+        writer = csv.writer(_Echo())
+        course_subjects = list(
+            CourseSubject.objects.filter(course=course)
+            .order_by("position")
+            .values_list("id", "subject__name")
+        )
+        columns = {cs_id: i for i, (cs_id, _) in enumerate(course_subjects)}
+        status_labels = dict(UserSubject.Status.choices)
+
+        header = ["user_id", "email", "full_name"]
+        for _, name in course_subjects:
+            header += [f"{name} - score", f"{name} - status", f"{name} - completed_at"]
+        # BOM để Excel nhận đúng UTF-8
+        yield "\ufeff" + writer.writerow(header)
+
+        rows = (
+            UserSubject.objects.filter(course_subject__course=course)
+            .order_by("user_id", "course_subject_id")
+            .values_list(
+                "user_id",
+                "user__email",
+                "user__full_name",
+                "course_subject_id",
+                "score",
+                "status",
+                "completed_at",
+            )
+            .iterator(chunk_size=GradebookExportService.CHUNK_SIZE)
+        )
+        for (user_id, email, full_name), user_rows in groupby(
+            rows, key=lambda row: row[:3]
+        ):
+            cells = [""] * (3 * len(course_subjects))
+            for *_, cs_id, score, status, completed_at in user_rows:
+                i = 3 * columns[cs_id]
+                cells[i] = "" if score is None else score
+                cells[i + 1] = status_labels.get(status, status)
+                cells[i + 2] = (
+                    timezone.localtime(completed_at).isoformat() if completed_at else ""
+                )
+            yield writer.writerow([user_id, email, full_name, *cells])
 
 
 class CourseCreateService:
@@ -11,23 +478,439 @@ class CourseCreateService:
 
         if len(subjects) < 1:
             raise ValueError("A course must have at least one subject.")
-        
+
         course = Course.objects.create(creator=user, **validated_data)
 
         if not supervisors:
             supervisors = [user.id]
 
-        for supervisor_id in supervisors:
-            CourseSupervisor.objects.create(
-                course=course,
-                supervisor_id=supervisor_id
+        CourseSupervisor.objects.bulk_create(
+            [
+                CourseSupervisor(course=course, supervisor_id=supervisor_id)
+                for supervisor_id in supervisors
+            ]
+        )
+        CourseCounterService.adjust(course, supervisor_count=len(supervisors))
+        invalidate_dashboards(supervisor_ids=supervisors)
+
+        CourseCreateService.add_subjects(course, subjects)
+
+        return course
+
+    @staticmethod
+    def add_subjects(course, subject_ids):
+        """
+        Tạo CourseSubject cho các subject (giữ thứ tự truyền vào) và clone
+        task template sang từng CourseSubject.
+        Dùng 1 bulk_create cho CourseSubject, 1 query lấy toàn bộ task
+        template và 1 bulk_create cho task clone.
+        """
+        course_subjects = CourseSubject.objects.bulk_create(
+            [
+                CourseSubject(course=course, subject_id=subject_id, position=position)
+                for subject_id, position in zip(
+                    subject_ids, sparse_positions(len(subject_ids))
+                )
+            ]
+        )
+        CourseCounterService.adjust(course, subject_count=len(course_subjects))
+        cs_by_subject = {cs.subject_id: cs for cs in course_subjects}
+
+        template_tasks = Task.objects.filter(
+            taskable_type=Task.TaskType.SUBJECT, taskable_id__in=list(cs_by_subject)
+        ).values_list("taskable_id", "name", "position")
+
+        Task.objects.bulk_create(
+            [
+                Task(
+                    name=name,
+                    taskable_type=Task.TaskType.COURSE_SUBJECT,
+                    taskable_id=cs_by_subject[subject_id].id,
+                    position=position,
+                )
+                for subject_id, name, position in template_tasks
+            ]
+        )
+
+        return course_subjects
+
+
+class CourseSubjectService:
+    @staticmethod
+    def add(course, subject):
+        """
+        Thêm subject vào cuối khóa học, trả về CourseSubject vừa tạo.
+        """
+        course_subject = CourseSubject.objects.create(
+            course=course,
+            subject=subject,
+            position=next_position(CourseSubject.objects.filter(course=course)),
+        )
+        CourseCounterService.adjust(course.id, subject_count=1)
+        return course_subject
+
+    @staticmethod
+    @transaction.atomic
+    def remove(course, course_subject_ids):
+        """
+        Xóa các CourseSubject của khóa học (kèm UserSubject, UserTask).
+        Trả về số CourseSubject đã xóa.
+        """
+        course_subjects = CourseSubject.objects.filter(
+            course=course, pk__in=list(course_subject_ids)
+        )
+        taken, finished = DashboardStatService.count_subjects(
+            UserSubject.objects.filter(course_subject__in=course_subjects)
+        )
+
+        _, deleted = course_subjects.delete()
+        removed = deleted.get(CourseSubject._meta.label, 0)
+        CourseCounterService.adjust(course.id, subject_count=-removed)
+        DashboardStatService.adjust_subjects(
+            course_id=course.id, taken=-taken, finished=-finished
+        )
+        invalidate_course_detail(course.id)
+        invalidate_dashboards(course_ids=[course.id])
+        return removed
+
+
+class CourseDuplicateService:
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def duplicate(course, user, name, start_date=None):
+        """
+        Sao chép khóa học cùng CourseSubject (dời ngày theo start_date mới),
+        CourseCategory, CourseSupervisor và toàn bộ task COURSE_SUBJECT.
+        Số câu lệnh cố định, không phụ thuộc số subject hay số task.
+        """
+        shift = (start_date - course.start_date) if start_date else timedelta(0)
+
+        def shifted(value):
+            return value + shift if value else value
+
+        with transaction.atomic():
+            new_course = Course.objects.create(
+                name=name,
+                link_to_course=course.link_to_course,
+                image=course.image.name if course.image else None,
+                start_date=shifted(course.start_date),
+                finish_date=shifted(course.finish_date),
+                creator=user,
+            )
+
+            CourseCategory.objects.bulk_create(
+                [
+                    CourseCategory(course=new_course, category_id=category_id)
+                    for category_id in CourseCategory.objects.filter(
+                        course=course
+                    ).values_list("category_id", flat=True)
+                ]
+            )
+
+            supervisor_ids = list(
+                CourseSupervisor.objects.filter(course=course).values_list(
+                    "supervisor_id", flat=True
+                )
+            )
+            if user.role == CustomUser.Role.SUPERVISOR and user.id not in supervisor_ids:
+                supervisor_ids.append(user.id)
+            CourseSupervisor.objects.bulk_create(
+                [
+                    CourseSupervisor(course=new_course, supervisor_id=supervisor_id)
+                    for supervisor_id in supervisor_ids
+                ]
+            )
+
+            old_course_subjects = list(
+                CourseSubject.objects.filter(course=course).values_list(
+                    "id", "subject_id", "position", "start_date", "finish_date"
+                )
+            )
+            new_course_subjects = CourseSubject.objects.bulk_create(
+                [
+                    CourseSubject(
+                        course=new_course,
+                        subject_id=subject_id,
+                        position=position,
+                        start_date=shifted(cs_start),
+                        finish_date=shifted(cs_finish),
+                    )
+                    for _, subject_id, position, cs_start, cs_finish in old_course_subjects
+                ]
+            )
+            CourseCounterService.adjust(
+                new_course,
+                supervisor_count=len(supervisor_ids),
+                subject_count=len(new_course_subjects),
+            )
+            invalidate_dashboards(supervisor_ids=supervisor_ids)
+            cs_id_map = {
+                old[0]: new.id
+                for old, new in zip(old_course_subjects, new_course_subjects)
+            }
+
+            tasks = Task.objects.filter(
+                taskable_type=Task.TaskType.COURSE_SUBJECT,
+                taskable_id__in=list(cs_id_map),
+            ).values_list("taskable_id", "name", "position")
+            Task.objects.bulk_create(
+                [
+                    Task(
+                        name=task_name,
+                        taskable_type=Task.TaskType.COURSE_SUBJECT,
+                        taskable_id=cs_id_map[cs_id],
+                        position=position,
+                    )
+                    for cs_id, task_name, position in tasks
+                ],
+                batch_size=CourseDuplicateService.BATCH_SIZE,
+            )
+
+        return new_course
+
+
+class CourseEnrollmentService:
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def enroll_trainees(course, trainee_ids):
+        """
+        Ghi danh nhiều trainee vào khóa học với số query cố định:
+        1 query lọc các user đã ghi danh, sau đó bulk_create
+        UserCourse, UserSubject và UserTask.
+        Trả về (added, skipped).
+        """
+        trainee_ids = list(trainee_ids)
+        unique_ids = list(dict.fromkeys(trainee_ids))
+        batch_size = CourseEnrollmentService.BATCH_SIZE
+
+        with transaction.atomic():
+            enrollments = list(
+                UserCourse.objects.filter(user_id__in=unique_ids).values_list(
+                    "user_id", "course_id"
+                )
+            )
+            enrolled_ids = {uid for uid, cid in enrollments if cid == course.id}
+            # User chưa học khóa nào trước đó được tính thêm vào tổng trainee
+            first_time_ids = set(unique_ids) - {uid for uid, _ in enrollments}
+            new_ids = [uid for uid in unique_ids if uid not in enrolled_ids]
+
+            if not new_ids:
+                return 0, len(trainee_ids)
+
+            cs_ids = list(
+                CourseSubject.objects.filter(course=course).values_list("id", flat=True)
+            )
+
+            tasks_map = {}
+            relevant_tasks = Task.objects.filter(
+                taskable_type=Task.TaskType.COURSE_SUBJECT, taskable_id__in=cs_ids
+            ).values_list("id", "taskable_id")
+            for task_id, cs_id in relevant_tasks:
+                tasks_map.setdefault(cs_id, []).append(task_id)
+
+            user_courses = UserCourse.objects.bulk_create(
+                [
+                    UserCourse(
+                        user_id=uid,
+                        course=course,
+                        status=UserCourse.Status.NOT_STARTED,
+                    )
+                    for uid in new_ids
+                ],
+                batch_size=batch_size,
+            )
+            CourseCounterService.adjust(course.id, member_count=len(user_courses))
+            DashboardStatService.adjust_global(trainees=len(first_time_ids))
+
+            user_subjects = UserSubject.objects.bulk_create(
+                [
+                    UserSubject(
+                        user_id=uc.user_id,
+                        user_course=uc,
+                        course_subject_id=cs_id,
+                        status=UserSubject.Status.NOT_STARTED,
+                    )
+                    for uc in user_courses
+                    for cs_id in cs_ids
+                ],
+                batch_size=batch_size,
+            )
+            DashboardStatService.adjust_subjects(course_id=course.id, taken=len(user_subjects))
+
+            UserTask.objects.bulk_create(
+                [
+                    UserTask(
+                        user_id=us.user_id,
+                        task_id=task_id,
+                        user_subject=us,
+                        status=UserTask.Status.NOT_DONE,
+                    )
+                    for us in user_subjects
+                    for task_id in tasks_map.get(us.course_subject_id, [])
+                ],
+                batch_size=batch_size,
+            )
+
+            invalidate_course_detail(course.id)
+            invalidate_dashboards(course_ids=[course.id])
+
+        return len(new_ids), len(trainee_ids) - len(new_ids)
+
+    @staticmethod
+    @transaction.atomic
+    def remove_trainees(course, trainee_ids):
+        """
+        Xóa các trainee khỏi khóa học (kèm UserSubject, UserTask).
+        Trả về số trainee đã xóa.
+        """
+        trainee_ids = list(trainee_ids)
+        user_courses = UserCourse.objects.filter(course=course, user_id__in=trainee_ids)
+        taken, finished = DashboardStatService.count_subjects(
+            UserSubject.objects.filter(user_course__in=user_courses)
+        )
+        leaving = DashboardStatService.count_last_enrollments(course, trainee_ids)
+
+        _, deleted = user_courses.delete()
+        removed = deleted.get(UserCourse._meta.label, 0)
+        CourseCounterService.adjust(course.id, member_count=-removed)
+        DashboardStatService.adjust_subjects(
+            course_id=course.id, taken=-taken, finished=-finished
+        )
+        DashboardStatService.adjust_global(trainees=-leaving)
+        invalidate_course_detail(course.id)
+        invalidate_dashboards(course_ids=[course.id])
+        return removed
+
+    @staticmethod
+    def enroll_course_subject(course_subject, task_ids):
+        """
+        Gán subject vừa thêm (và các task của nó) cho toàn bộ trainee
+        đang học khóa học, bằng bulk insert theo user_id.
+        Trả về số trainee được gán.
+        """
+        task_ids = list(task_ids)
+        batch_size = CourseEnrollmentService.BATCH_SIZE
+
+        user_courses = list(
+            UserCourse.objects.filter(course_id=course_subject.course_id).values_list(
+                "id", "user_id"
             )
+        )
+        if not user_courses:
+            return 0
 
-        for idx, subject_id in enumerate(subjects):
-            CourseSubject.objects.create(
-                course=course,
-                subject_id=subject_id,
-                position=idx
+        with transaction.atomic():
+            user_subjects = UserSubject.objects.bulk_create(
+                [
+                    UserSubject(
+                        user_id=user_id,
+                        user_course_id=uc_id,
+                        course_subject=course_subject,
+                        status=UserSubject.Status.NOT_STARTED,
+                    )
+                    for uc_id, user_id in user_courses
+                ],
+                batch_size=batch_size,
             )
+            DashboardStatService.adjust_subjects(
+                course_id=course_subject.course_id, taken=len(user_subjects)
+            )
+            invalidate_dashboards(course_ids=[course_subject.course_id])
+            invalidate_course_progress(course_subject.course_id)
+
+            UserTask.objects.bulk_create(
+                [
+                    UserTask(
+                        user_id=us.user_id,
+                        task_id=task_id,
+                        user_subject=us,
+                        status=UserTask.Status.NOT_DONE,
+                    )
+                    for us in user_subjects
+                    for task_id in task_ids
+                ],
+                batch_size=batch_size,
+            )
+
+        return len(user_subjects)
+
+
+class EnrollmentJobService:
+    CHUNK_SIZE = 500
+
+    @staticmethod
+    def enqueue(course, user, trainee_ids):
+        trainee_ids = list(trainee_ids)
+        return EnrollmentJob.objects.create(
+            course=course,
+            created_by=user,
+            trainee_ids=trainee_ids,
+            total=len(trainee_ids),
+        )
+
+    @staticmethod
+    def process_chunk(chunk_size=None):
+        """
+        Nhận job đang chờ đầu tiên chưa bị worker khác khóa và xử lý chunk
+        tiếp theo của nó. Việc ghi danh và cập nhật tiến độ nằm chung một
+        transaction nên worker bị dừng giữa chừng có thể chạy tiếp từ đúng
+        vị trí cũ.
+        Trả về job vừa xử lý, hoặc None khi không còn job nào để nhận.
+        """
+        chunk_size = chunk_size or EnrollmentJobService.CHUNK_SIZE
+
+        with transaction.atomic():
+            job = (
+                EnrollmentJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status__in=[
+                        EnrollmentJob.Status.PENDING,
+                        EnrollmentJob.Status.RUNNING,
+                    ],
+                )
+                .order_by("id")
+                .first()
+            )
+            if job is None:
+                return None
+
+            now = timezone.now()
+            if job.status == EnrollmentJob.Status.PENDING:
+                job.status = EnrollmentJob.Status.RUNNING
+                job.started_at = now
+
+            chunk = job.trainee_ids[job.processed : job.processed + chunk_size]
+
+            if chunk:
+                valid_ids = set(
+                    CustomUser.objects.filter(
+                        id__in=chunk, role=CustomUser.Role.TRAINEE
+                    ).values_list("id", flat=True)
+                )
+                trainee_ids = [uid for uid in chunk if uid in valid_ids]
+                job.failed += len(chunk) - len(trainee_ids)
+
+                try:
+                    with transaction.atomic():
+                        added, skipped = CourseEnrollmentService.enroll_trainees(
+                            job.course, trainee_ids
+                        )
+                    job.done += added
+                    job.skipped += skipped
+                except Exception as e:
+                    job.failed += len(trainee_ids)
+                    job.error = str(e)
+
+            if job.processed >= job.total:
+                job.status = (
+                    EnrollmentJob.Status.FAILED
+                    if job.total and job.failed == job.total
+                    else EnrollmentJob.Status.FINISHED
+                )
+                job.finished_at = now
+
+            job.save()
 
-        return course
\ No newline at end of file
+        return job
@@ -0,0 +1,175 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from authen.models import CustomUser
+from core.cache import bump_on_commit
+from courses.cache import (
+    DASHBOARD_USERS_SCOPE,
+    invalidate_course_detail,
+    invalidate_course_progress,
+    invalidate_dashboards,
+)
+from courses.models.course_model import Course
+from courses.models.course_stat import CourseStat
+from courses.models.course_subject import CourseSubject
+from courses.models.course_supervisor_model import CourseSupervisor
+from courses.services import DashboardStatService
+from subjects.models.subject import Subject
+from users.models.user_course import UserCourse
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+
+
+# Xóa (kể cả xóa theo cascade) do các luồng xóa bump một lần cho cả thao tác
+@receiver(post_save, sender=CourseSubject)
+@receiver(post_save, sender=CourseSupervisor)
+@receiver(post_save, sender=UserCourse)
+def invalidate_course_detail_on_change(sender, instance, **kwargs):
+    invalidate_course_detail(instance.course_id)
+
+
+@receiver(post_save, sender=Subject)
+def invalidate_course_detail_on_subject_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    invalidate_course_detail(
+        *CourseSubject.objects.filter(subject=instance).values_list("course_id", flat=True)
+    )
+
+
+# Số liệu dashboard (CourseStat/GlobalStat): ghi nhớ status lúc load để
+# tính chênh lệch khi save. Field bị defer thì không theo dõi được.
+@receiver(post_init, sender=Course)
+@receiver(post_init, sender=UserSubject)
+def remember_stat_status(sender, instance, **kwargs):
+    instance._stat_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Course)
+def update_course_status_stat(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        CourseStat.objects.create(course=instance)
+        DashboardStatService.adjust_course_status(new_status=instance.status)
+    elif instance._stat_status is not None and instance._stat_status != instance.status:
+        DashboardStatService.adjust_course_status(
+            old_status=instance._stat_status, new_status=instance.status
+        )
+    instance._stat_status = instance.status
+
+
+@receiver(pre_delete, sender=Course)
+def remove_course_stat(sender, instance, **kwargs):
+    # Các dòng con bị xóa theo khóa học không có receiver riêng,
+    # số liệu được trừ một lần ở đây
+    status = instance._stat_status
+    DashboardStatService.remove_course(
+        instance, instance.status if status is None else status
+    )
+
+
+@receiver(post_init, sender=UserSubject)
+def remember_subject_score(sender, instance, **kwargs):
+    instance._stat_score = instance.__dict__.get("score")
+
+
+def _course_id_of(user_subject):
+    if UserSubject.course_subject.is_cached(user_subject):
+        return user_subject.course_subject.course_id
+    return (
+        CourseSubject.objects.filter(pk=user_subject.course_subject_id)
+        .values_list("course_id", flat=True)
+        .first()
+    )
+
+
+# Status/điểm của UserSubject đổi khi lưu từng dòng: cập nhật số liệu dashboard
+# và bump cache thống kê của khóa học. Tạo/xóa hàng loạt do
+# CourseEnrollmentService/CourseSubjectService xử lý một lần cho cả thao tác.
+@receiver(post_save, sender=UserSubject)
+def update_subject_stat(sender, instance, created, raw=False, **kwargs):
+    status_changed = (
+        instance._stat_status is not None and instance._stat_status != instance.status
+    )
+    if not (raw or created) and (status_changed or instance._stat_score != instance.score):
+        course_id = _course_id_of(instance)
+        invalidate_course_progress(course_id)
+        if status_changed:
+            was_finished = DashboardStatService.is_finished(instance._stat_status)
+            DashboardStatService.adjust_subjects(
+                course_id=course_id,
+                finished=int(DashboardStatService.is_finished(instance.status))
+                - int(was_finished),
+            )
+            invalidate_dashboards(course_ids=[course_id])
+    instance._stat_status = instance.status
+    instance._stat_score = instance.score
+
+
+# Cache dashboard: bump version khi dữ liệu nguồn thay đổi. Thêm/xóa hàng loạt
+# (trainee, subject, supervisor) do service/view bump một lần cho cả thao tác.
+@receiver(post_save, sender=Course)
+def invalidate_dashboards_on_course_save(sender, instance, **kwargs):
+    invalidate_dashboards(course_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Course)
+def invalidate_dashboards_on_course_delete(sender, instance, **kwargs):
+    # Tìm supervisor trước khi CourseSupervisor bị xóa theo khóa học
+    invalidate_dashboards(course_ids=[instance.pk])
+
+
+# Thông tin user nằm trong phần chi tiết khóa học được cache
+COURSE_DETAIL_USER_FIELDS = ("full_name", "email")
+
+
+@receiver(post_init, sender=CustomUser)
+def remember_user_identity(sender, instance, **kwargs):
+    instance._detail_identity = tuple(
+        instance.__dict__.get(field) for field in COURSE_DETAIL_USER_FIELDS
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_course_detail_on_user_change(sender, instance, created, **kwargs):
+    identity = tuple(getattr(instance, field) for field in COURSE_DETAIL_USER_FIELDS)
+    if not created and identity != instance._detail_identity:
+        invalidate_course_detail(
+            *Course.objects.filter(
+                Q(user_courses__user=instance) | Q(supervisors__supervisor=instance)
+            )
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+    instance._detail_identity = identity
+
+
+DASHBOARD_USER_FIELDS = {"role", "full_name", "email"}
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_dashboards_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Bỏ qua các lần lưu không ảnh hưởng dashboard, vd: cập nhật last_login
+    if update_fields is not None and not DASHBOARD_USER_FIELDS & set(update_fields):
+        return
+    bump_on_commit(DASHBOARD_USERS_SCOPE)
+
+
+@receiver(post_init, sender=UserTask)
+def remember_spent_time(sender, instance, **kwargs):
+    instance._stat_spent_time = instance.__dict__.get("spent_time")
+
+
+# Thống kê chỉ dùng spent_time của task, đổi status thì bỏ qua. UserTask bị xóa
+# theo UserSubject/Task do luồng xóa tương ứng bump cache.
+@receiver(post_save, sender=UserTask)
+def invalidate_course_progress_on_task_save(sender, instance, **kwargs):
+    if instance.spent_time != instance._stat_spent_time:
+        invalidate_course_progress(
+            *UserSubject.objects.filter(pk=instance.user_subject_id).values_list(
+                "course_subject__course_id", flat=True
+            )
+        )
+    instance._stat_spent_time = instance.spent_time
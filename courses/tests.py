@@ -1 +1,1384 @@
+import base64
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authen.models import CustomUser
+from courses.models.course_category import CourseCategory
+from courses.models.course_model import Course
+from courses.models.course_stat import CourseStat, GlobalStat
+from courses.models.course_subject import CourseSubject
+from courses.models.enrollment_job import EnrollmentJob
+from courses.models.course_supervisor_model import CourseSupervisor
+from core.ordering import reorder, sparse_positions
+from courses.serializers.course_supervisor_serializer import AddTraineeSerializer
+from courses.services import (
+    CourseCounterService,
+    CourseCreateService,
+    CourseDuplicateService,
+    CourseEnrollmentService,
+    DashboardStatService,
+    EnrollmentJobService,
+)
+from subjects.models.category import Category
+from subjects.models.subject import Subject
+from subjects.models.task import Task
+from users.models.comment import Comment
+from users.serializers import AdminUserBulkCreateSerializer
+from users.models.user_course import UserCourse
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+
+
+class SupervisorUserSubjectDetailViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainee = CustomUser.objects.create(
+            email="trainee@example.com", full_name="Trainee", role="TRAINEE"
+        )
+        course = Course.objects.create(
+            name="Course",
+            start_date=date.today(),
+            finish_date=date.today() + timedelta(days=30),
+            creator=cls.supervisor,
+        )
+        subject = Subject.objects.create(name="Subject", max_score=10, estimated_time_days=5)
+        cls.course_subject = CourseSubject.objects.create(
+            course=course, subject=subject, position=1
+        )
+        user_course = UserCourse.objects.create(user=cls.trainee, course=course)
+        cls.user_subject = UserSubject.objects.create(
+            user=cls.trainee,
+            course_subject=cls.course_subject,
+            user_course=user_course,
+            score=8,
+        )
+        for position in range(3):
+            task = Task.objects.create(
+                name=f"Task {position}",
+                taskable_type=Task.TaskType.COURSE_SUBJECT,
+                taskable_id=cls.course_subject.id,
+                position=position,
+            )
+            UserTask.objects.create(
+                user=cls.trainee, task=task, user_subject=cls.user_subject, status=position % 2
+            )
+
+        content_type = ContentType.objects.get_for_model(UserSubject)
+        for content in ("First comment", "Latest comment"):
+            Comment.objects.create(
+                user=cls.supervisor,
+                content=content,
+                content_type=content_type,
+                object_id=cls.user_subject.id,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.url = (
+            f"/api/supervisor/subjects/{self.course_subject.id}"
+            f"/student/{self.trainee.id}/"
+        )
+
+    def test_detail_uses_fixed_number_of_queries(self):
+        # 1 query UserSubject (kèm subject, course, comment mới nhất) + 1 query task
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]["data"]
+        self.assertEqual(data["name"], "Subject")
+        self.assertEqual(data["course_name"], "Course")
+        self.assertEqual(data["supervisor_comment"], "Latest comment")
+        self.assertEqual(
+            [task["status"] for task in data["tasks"]], ["NOT_DONE", "DONE", "NOT_DONE"]
+        )
+
+    def test_latest_comment_ties_break_on_id(self):
+        # Hai comment cùng updated_at: nội dung và thời điểm lấy từ comment id lớn hơn
+        same_time = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        Comment.objects.filter(object_id=self.user_subject.id).update(updated_at=same_time)
+
+        response = self.client.get(self.url)
+
+        data = response.json()["data"]["data"]
+        self.assertEqual(data["supervisor_comment"], "Latest comment")
+
+
+class CourseDataMixin:
+    """
+    Khóa học có 3 subject (mỗi subject 2 task), 1 supervisor và 3 trong 4
+    trainee đã ghi danh; 1 trainee học thêm khóa thứ hai.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            email="admin@example.com", full_name="Admin", role="ADMIN", is_staff=True
+        )
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainees = [
+            CustomUser.objects.create(
+                email=f"trainee{i}@example.com", full_name=f"Trainee {i}", role="TRAINEE"
+            )
+            for i in range(4)
+        ]
+        cls.course = cls.create_course("Course", subjects=3)
+        cls.other_course = cls.create_course("Other course", subjects=1)
+        CourseCounterService.reconcile()
+
+        CourseEnrollmentService.enroll_trainees(
+            cls.course, [trainee.id for trainee in cls.trainees[:3]]
+        )
+        CourseEnrollmentService.enroll_trainees(cls.other_course, [cls.trainees[0].id])
+        finished = UserSubject.objects.filter(
+            course_subject__course=cls.course, user=cls.trainees[0]
+        ).first()
+        finished.status = UserSubject.Status.FINISHED_ON_TIME
+        finished.save()
+
+    @classmethod
+    def create_course(cls, name, subjects):
+        course = Course.objects.create(
+            name=name,
+            start_date=date.today() - timedelta(days=3),
+            finish_date=date.today() + timedelta(days=30),
+            creator=cls.supervisor,
+        )
+        CourseSupervisor.objects.create(course=course, supervisor=cls.supervisor)
+        for position in range(subjects):
+            subject = Subject.objects.create(
+                name=f"{name} subject {position}", max_score=10, estimated_time_days=5
+            )
+            course_subject = CourseSubject.objects.create(
+                course=course, subject=subject, position=position
+            )
+            for task_position in range(2):
+                Task.objects.create(
+                    name=f"Task {task_position}",
+                    taskable_type=Task.TaskType.COURSE_SUBJECT,
+                    taskable_id=course_subject.id,
+                    position=task_position,
+                )
+        return course
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+
+class CourseCounterTests(CourseDataMixin, TestCase):
+    def assertCountersMatch(self, course):
+        course.refresh_from_db()
+        self.assertEqual(
+            (course.member_count, course.supervisor_count, course.subject_count),
+            (
+                UserCourse.objects.filter(course=course).count(),
+                CourseSupervisor.objects.filter(course=course).count(),
+                CourseSubject.objects.filter(course=course).count(),
+            ),
+        )
+
+    def test_counters_after_enroll(self):
+        self.assertCountersMatch(self.course)
+
+        response = self.client.post(
+            f"/api/admin/courses/{self.course.id}/add-trainees/",
+            {"trainee_ids": [self.trainees[2].id, self.trainees[3].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatch(self.course)
+        self.assertEqual(self.course.member_count, 4)
+
+    def test_counters_after_remove_trainee(self):
+        with self.assertNumQueries(14):
+            response = self.client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-trainee/",
+                {"id": self.trainees[0].id},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatch(self.course)
+        self.assertEqual(self.course.member_count, 2)
+
+    def test_counters_after_remove_subject(self):
+        course_subject = CourseSubject.objects.filter(course=self.course).first()
+
+        with self.assertNumQueries(13):
+            response = self.client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-subject/",
+                {"id": course_subject.id},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatch(self.course)
+        self.assertEqual(self.course.subject_count, 2)
+
+    def test_course_delete_keeps_other_counters(self):
+        with self.assertNumQueries(20):
+            response = self.client.delete(f"/api/admin/courses/{self.course.id}/delete/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Course.objects.filter(pk=self.course.id).exists())
+        self.assertCountersMatch(self.other_course)
+        self.assertEqual(CourseCounterService.reconcile(), [])
+
+
+class DashboardStatTests(CourseDataMixin, TestCase):
+    def assertStatsMatchRebuild(self):
+        global_stat = GlobalStat.objects.values().get()
+        course_stats = list(CourseStat.objects.order_by("pk").values())
+
+        DashboardStatService.rebuild()
+
+        self.assertEqual(global_stat, GlobalStat.objects.values().get())
+        self.assertEqual(course_stats, list(CourseStat.objects.order_by("pk").values()))
+
+    def test_stats_after_enroll(self):
+        self.assertStatsMatchRebuild()
+
+        CourseEnrollmentService.enroll_trainees(self.course, [self.trainees[3].id])
+
+        self.assertStatsMatchRebuild()
+        self.assertEqual(GlobalStat.objects.get().trainees, 4)
+
+    def test_stats_after_remove_trainee(self):
+        for trainee in self.trainees[:2]:
+            response = self.client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-trainee/",
+                {"id": trainee.id},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.assertStatsMatchRebuild()
+        # trainee 0 vẫn học khóa còn lại
+        self.assertEqual(GlobalStat.objects.get().trainees, 2)
+
+    def test_stats_after_remove_subject(self):
+        course_subject = CourseSubject.objects.filter(course=self.course).first()
+
+        response = self.client.delete(
+            f"/api/admin/courses/{self.course.id}/remove-subject/",
+            {"id": course_subject.id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertStatsMatchRebuild()
+
+    def test_stats_after_course_delete(self):
+        CourseEnrollmentService.enroll_trainees(self.course, [self.trainees[3].id])
+
+        # Số query không tăng theo số trainee đã ghi danh
+        with self.assertNumQueries(20):
+            response = self.client.delete(f"/api/admin/courses/{self.course.id}/delete/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertStatsMatchRebuild()
+        self.assertEqual(
+            GlobalStat.objects.values_list(
+                "courses_in_progress", "trainees", "subjects_taken"
+            ).get(),
+            (1, 1, 1),
+        )
+
+
+class DashboardCacheTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.supervisor_client = APIClient()
+        self.supervisor_client.force_authenticate(self.supervisor)
+
+    def get_stats(self):
+        return (
+            self.client.get("/api/admin/stats/").json()["data"],
+            self.supervisor_client.get("/api/supervisor/stats/").json()["data"],
+        )
+
+    def assertStatsFresh(self):
+        cached = self.get_stats()
+        cache.clear()
+        self.assertEqual(cached, self.get_stats())
+        return cached
+
+    def test_stats_are_cached(self):
+        self.get_stats()
+
+        with self.assertNumQueries(0):
+            self.get_stats()
+
+    def test_stats_refresh_after_changes(self):
+        admin_stats, _ = self.assertStatsFresh()
+        self.assertEqual(admin_stats["total_trainees"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user_subject = UserSubject.objects.filter(
+                course_subject__course=self.course, status=UserSubject.Status.NOT_STARTED
+            ).first()
+            user_subject.status = UserSubject.Status.FINISHED_EARLY
+            user_subject.save()
+        self.assertStatsFresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-trainee/",
+                {"id": self.trainees[1].id},
+                format="json",
+            )
+        admin_stats, supervisor_stats = self.assertStatsFresh()
+        self.assertEqual(admin_stats["total_trainees"], 2)
+        self.assertEqual(supervisor_stats["total_trainees"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-subject/",
+                {"id": CourseSubject.objects.filter(course=self.course).last().id},
+                format="json",
+            )
+        self.assertStatsFresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/admin/courses/{self.course.id}/delete/")
+        admin_stats, _ = self.assertStatsFresh()
+        self.assertEqual(admin_stats["total_trainees"], 1)
+
+    def test_stats_refresh_after_bulk_user_creation(self):
+        admin_stats, _ = self.get_stats()
+
+        serializer = AdminUserBulkCreateSerializer(
+            data={"emails": ["supervisor2@example.com"], "role": "SUPERVISOR"}
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+
+        self.assertNotEqual(admin_stats, self.assertStatsFresh()[0])
+
+
+class CourseAnalyticsTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = f"/api/courses/{self.course.id}/analytics/"
+        self.first, self.second, _ = CourseSubject.objects.filter(
+            course=self.course
+        ).order_by("position")
+
+        user_subjects = UserSubject.objects.filter(course_subject__course=self.course)
+        user_subjects.update(status=UserSubject.Status.NOT_STARTED, score=None)
+        first_subjects = user_subjects.filter(course_subject=self.first).order_by("user_id")
+        for user_subject, score, finished in zip(first_subjects, (10, 5, None), (True, True, False)):
+            UserSubject.objects.filter(pk=user_subject.pk).update(
+                score=score,
+                status=(
+                    UserSubject.Status.FINISHED_ON_TIME
+                    if finished
+                    else UserSubject.Status.IN_PROGRESS
+                ),
+            )
+        for user_task, spent_time in zip(
+            UserTask.objects.filter(user_subject__course_subject=self.first).order_by("pk"),
+            (10, 20, 30, 40),
+        ):
+            UserTask.objects.filter(pk=user_task.pk).update(spent_time=spent_time)
+        # Subject thứ hai đã hết hạn mà chưa ai hoàn thành
+        CourseSubject.objects.filter(pk=self.second.pk).update(
+            finish_date=date.today() - timedelta(days=1)
+        )
+
+    def test_analytics_numbers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        first, second, third = data["subjects"]
+
+        self.assertEqual(
+            (first["trainees"], first["finished"], first["completion_rate"], first["overdue"]),
+            (3, 2, 66.7, 0),
+        )
+        self.assertEqual(first["average_score_percent"], 75.0)
+        self.assertEqual(first["score_histogram"], [0, 0, 0, 0, 0, 1, 0, 0, 0, 1])
+        self.assertEqual(
+            first["spent_time"],
+            {
+                "count": 4,
+                "mean": 25.0,
+                "percentiles": {"p25": 17.5, "p50": 25.0, "p75": 32.5, "p90": 37.0},
+            },
+        )
+        self.assertEqual((second["finished"], second["overdue"]), (0, 3))
+        self.assertIsNone(second["average_score_percent"])
+        self.assertEqual(third["spent_time"], {"count": 0, "mean": None, "percentiles": None})
+        self.assertEqual(
+            {key: data["summary"][key] for key in ("user_subjects", "finished", "overdue")},
+            {"user_subjects": 9, "finished": 2, "overdue": 3},
+        )
+        self.assertEqual(data["summary"]["completion_rate"], 22.2)
+
+    def test_analytics_refresh_after_score_change(self):
+        self.client.get(self.url)
+        user_subject = UserSubject.objects.get(
+            course_subject=self.first, user=self.trainees[2]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user_subject.score = 2
+            user_subject.save()
+
+        first = self.client.get(self.url).json()["data"]["subjects"][0]
+        self.assertEqual(first["average_score_percent"], 56.7)
+        self.assertEqual(first["score_histogram"], [0, 0, 1, 0, 0, 1, 0, 0, 0, 1])
+
+    def test_analytics_refresh_after_task_delete(self):
+        self.client.get(self.url)
+        task = UserTask.objects.filter(
+            user_subject__course_subject=self.first, spent_time=40
+        ).get().task
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/admin/tasks/{task.id}/detail/")
+
+        self.assertEqual(response.status_code, 200)
+        spent_time = self.client.get(self.url).json()["data"]["subjects"][0]["spent_time"]
+        self.assertEqual(
+            spent_time["count"],
+            UserTask.objects.filter(
+                user_subject__course_subject=self.first, spent_time__isnull=False
+            ).count(),
+        )
+        self.assertLess(spent_time["count"], 4)
+
+
+class GradebookExportTests(CourseDataMixin, TestCase):
+    def test_gradebook_csv_shape(self):
+        UserSubject.objects.filter(course_subject__course=self.course).update(
+            status=UserSubject.Status.NOT_STARTED, score=None, completed_at=None
+        )
+        first = CourseSubject.objects.filter(course=self.course).order_by("position").first()
+        UserSubject.objects.filter(course_subject=first, user=self.trainees[1]).update(
+            score=8.5,
+            status=UserSubject.Status.FINISHED_EARLY,
+            completed_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        )
+
+        response = self.client.get(f"/api/courses/{self.course.id}/gradebook/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="course_{self.course.id}_gradebook.csv"',
+        )
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertTrue(content.startswith("\ufeff"))
+        header, *rows = csv.reader(io.StringIO(content[1:]))
+
+        self.assertEqual(
+            header[:6],
+            [
+                "user_id",
+                "email",
+                "full_name",
+                "Course subject 0 - score",
+                "Course subject 0 - status",
+                "Course subject 0 - completed_at",
+            ],
+        )
+        self.assertEqual(len(header), 3 + 3 * 3)
+        self.assertEqual(
+            [row[0] for row in rows], [str(trainee.id) for trainee in self.trainees[:3]]
+        )
+        self.assertTrue(all(len(row) == len(header) for row in rows))
+        self.assertEqual(
+            rows[1][:6],
+            [
+                str(self.trainees[1].id),
+                "trainee1@example.com",
+                "Trainee 1",
+                "8.5",
+                "Finished early",
+                "2025-01-02T03:04:05+00:00",
+            ],
+        )
+        self.assertEqual(rows[0][3:6], ["", "Not Started", ""])
+
+
+class EnrollmentJobTests(CourseDataMixin, TestCase):
+    def test_async_add_trainees_queues_job(self):
+        response = self.client.post(
+            f"/api/admin/courses/{self.course.id}/add-trainees/?async=1",
+            {"trainee_ids": [self.trainees[2].id, self.trainees[3].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["data"]["job_id"]
+        self.assertFalse(
+            UserCourse.objects.filter(course=self.course, user=self.trainees[3]).exists()
+        )
+
+        call_command("run_enrollment_jobs", "--once", "--chunk-size", "1", stdout=io.StringIO())
+
+        data = self.client.get(f"/api/jobs/{job_id}/").json()["data"]
+        self.assertEqual(
+            {key: data[key] for key in ("status_display", "total", "processed", "done", "skipped")},
+            {"status_display": "Finished", "total": 2, "processed": 2, "done": 1, "skipped": 1},
+        )
+        self.assertEqual(
+            UserSubject.objects.filter(
+                course_subject__course=self.course, user=self.trainees[3]
+            ).count(),
+            3,
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.member_count, 4)
+
+    def test_process_chunk_claims_jobs_in_order(self):
+        first = EnrollmentJobService.enqueue(
+            self.other_course, self.admin, [self.trainees[1].id, self.admin.id]
+        )
+        second = EnrollmentJobService.enqueue(
+            self.course, self.admin, [self.trainees[3].id]
+        )
+
+        Status = EnrollmentJob.Status
+        job = EnrollmentJobService.process_chunk(chunk_size=1)
+        self.assertEqual((job.id, job.status, job.done), (first.id, Status.RUNNING, 1))
+
+        # Id không phải trainee được tính là failed
+        job = EnrollmentJobService.process_chunk(chunk_size=1)
+        self.assertEqual((job.id, job.status, job.failed), (first.id, Status.FINISHED, 1))
+
+        job = EnrollmentJobService.process_chunk(chunk_size=1)
+        self.assertEqual((job.id, job.status, job.done), (second.id, Status.FINISHED, 1))
+
+        self.assertIsNone(EnrollmentJobService.process_chunk(chunk_size=1))
+
+
+class ReorderSubjectsTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/admin/courses/{self.course.id}/reorder-subjects/"
+        self.first, self.second, self.third = CourseSubject.objects.filter(
+            course=self.course
+        ).order_by("position")
+
+    def ordered_ids(self):
+        return list(
+            CourseSubject.objects.filter(course=self.course)
+            .order_by("position", "id")
+            .values_list("id", flat=True)
+        )
+
+    def test_reorder_all_subjects(self):
+        response = self.client.post(
+            self.url,
+            {
+                "items": [
+                    {"id": self.third.id, "position": 1},
+                    {"id": self.first.id, "position": 2},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        # Subject không được gửi lên xếp sau cùng
+        self.assertEqual(self.ordered_ids(), [self.third.id, self.first.id, self.second.id])
+        self.assertEqual(
+            list(
+                CourseSubject.objects.filter(course=self.course)
+                .order_by("position")
+                .values_list("position", flat=True)
+            ),
+            sparse_positions(3),
+        )
+
+    def test_move_updates_one_row_when_gap_exists(self):
+        reorder(CourseSubject.objects.filter(course=self.course), self.ordered_ids())
+
+        response = self.client.post(
+            self.url, {"id": self.third.id, "after_id": self.first.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["updated"], 1)
+        self.assertEqual(self.ordered_ids(), [self.first.id, self.third.id, self.second.id])
+
+        response = self.client.post(self.url, {"id": self.second.id}, format="json")
+        self.assertEqual(response.json()["data"]["updated"], 1)
+        self.assertEqual(self.ordered_ids(), [self.second.id, self.first.id, self.third.id])
+
+    def test_move_respaces_when_no_gap(self):
+        # Vị trí liền nhau 0, 1, 2 từ dữ liệu cũ
+        response = self.client.post(
+            self.url, {"id": self.third.id, "before_id": self.second.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["updated"], 3)
+        self.assertEqual(self.ordered_ids(), [self.first.id, self.third.id, self.second.id])
+
+    def test_reorder_rejects_foreign_subjects(self):
+        other = CourseSubject.objects.filter(course=self.other_course).get()
+
+        for data in (
+            {"id": other.id, "after_id": self.first.id},
+            {"items": [{"id": other.id, "position": 1}]},
+            {"items": []},
+            {"items": [1, 2]},
+            {"items": {"id": self.first.id}},
+            {"id": self.first.id, "after_id": {"id": 1}},
+            [1, 2],
+        ):
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.ordered_ids(), [self.first.id, self.second.id, self.third.id])
+
+
+class TraineeCourseDetailCacheTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.trainees[0])
+        self.url = f"/api/trainee/courses/{self.course.id}/detail/"
+
+    def test_detail_refreshes_after_member_identity_change(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Trainee 1", first.content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            trainee = CustomUser.objects.get(pk=self.trainees[1].pk)
+            trainee.full_name = "Renamed Trainee"
+            trainee.save()
+
+        content = self.client.get(self.url).content.decode()
+        self.assertIn("Renamed Trainee", content)
+        self.assertNotIn("Trainee 1", content)
+
+    def test_detail_refreshes_after_remove_trainee(self):
+        self.assertIn("trainee2@example.com", self.client.get(self.url).content.decode())
+        admin_client = APIClient()
+        admin_client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            admin_client.delete(
+                f"/api/admin/courses/{self.course.id}/remove-trainee/",
+                {"id": self.trainees[2].id},
+                format="json",
+            )
+
+        self.assertNotIn("trainee2@example.com", self.client.get(self.url).content.decode())
+
+
+class CourseCounterAdminTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        superuser = CustomUser.objects.create_superuser(
+            email="root@example.com", password="x", full_name="Root"
+        )
+        self.client.force_login(superuser)
+
+    def assertCountersMatch(self):
+        for course in (self.course, self.other_course):
+            CourseCounterTests.assertCountersMatch(self, course)
+
+    def change_form_data(self, url):
+        """Dữ liệu POST của form admin đang hiển thị (kèm inline) để sửa tiếp."""
+        context = self.client.get(url).context
+        data = {}
+        forms = [context["adminform"].form]
+        for inline in context["inline_admin_formsets"]:
+            formset = inline.formset
+            management = formset.management_form
+            data.update(
+                {
+                    management.add_prefix(name): management[name].value()
+                    for name in management.fields
+                }
+            )
+            forms += formset.forms
+        for form in forms:
+            for name, field in form.fields.items():
+                value = form[name].value()
+                if value is not None and not field.widget.needs_multipart_form:
+                    data[form.add_prefix(name)] = value
+        return data
+
+    def test_link_admins_keep_counters(self):
+        subject = Subject.objects.create(name="Extra subject", max_score=10, estimated_time_days=5)
+        response = self.client.post(
+            "/django-admin/courses/coursesubject/add/",
+            {"course": self.course.id, "subject": subject.id, "position": 0},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertCountersMatch()
+
+        # Chuyển dòng sang khóa học khác
+        course_subject = CourseSubject.objects.get(subject=subject)
+        response = self.client.post(
+            f"/django-admin/courses/coursesubject/{course_subject.id}/change/",
+            {"course": self.other_course.id, "subject": subject.id, "position": 0},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertCountersMatch()
+
+        # Khóa học phải còn ít nhất 1 supervisor
+        supervisor = CourseSupervisor.objects.create(
+            course=self.course,
+            supervisor=CustomUser.objects.create(
+                email="supervisor2@example.com", full_name="Supervisor 2", role="SUPERVISOR"
+            ),
+        )
+        CourseCounterService.adjust(self.course, supervisor_count=1)
+        response = self.client.post(
+            f"/django-admin/courses/coursesupervisor/{supervisor.id}/delete/", {"post": "yes"}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertCountersMatch()
+
+        response = self.client.post(
+            "/django-admin/users/usercourse/",
+            {
+                "action": "delete_selected",
+                "post": "yes",
+                "_selected_action": list(
+                    UserCourse.objects.values_list("pk", flat=True)[:2]
+                ),
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertCountersMatch()
+
+    def test_course_inlines_keep_counters(self):
+        # CourseSupervisor.clean không cho lưu lại supervisor duy nhất của khóa học
+        CourseSupervisor.objects.create(
+            course=self.course,
+            supervisor=CustomUser.objects.create(
+                email="supervisor2@example.com", full_name="Supervisor 2", role="SUPERVISOR"
+            ),
+        )
+        CourseCounterService.adjust(self.course, supervisor_count=1)
+        url = f"/django-admin/courses/course/{self.course.id}/change/"
+        data = self.change_form_data(url)
+        # Xóa 1 subject và thêm 1 supervisor qua inline
+        data["coursesubject_set-0-DELETE"] = "on"
+        extra_supervisor = CustomUser.objects.create(
+            email="supervisor3@example.com", full_name="Supervisor 3", role="SUPERVISOR"
+        )
+        total = int(data["supervisors-TOTAL_FORMS"])
+        data["supervisors-TOTAL_FORMS"] = total + 1
+        data[f"supervisors-{total}-supervisor"] = extra_supervisor.id
+        data[f"supervisors-{total}-course"] = self.course.id
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertCountersMatch()
+        self.assertEqual(
+            (self.course.supervisor_count, self.course.subject_count), (3, 2)
+        )
+
+
+class CourseListQueryTests(CourseDataMixin, TestCase):
+    """
+    Danh sách khóa học serialize bằng CourseSerializer: số query không tăng
+    theo số khóa học, subject hay supervisor.
+    """
+
+    def add_courses(self, size):
+        for i in range(Course.objects.count(), size):
+            course = self.create_course(f"Extra {i}", subjects=2)
+            CourseSupervisor.objects.create(course=course, supervisor=self.admin)
+
+    def assertQueriesDoNotGrow(self, url, num, user=None):
+        self.client.force_authenticate(user or self.admin)
+        for size in (2, 6):
+            self.add_courses(size)
+            with self.subTest(size=size), self.assertNumQueries(num):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_course_lists(self):
+        # course + supervisors + categories + course subjects + task của subject
+        for url, user in (
+            ("/api/supervisor/courses/", self.supervisor),
+            ("/api/supervisor/courses/my-courses/", self.supervisor),
+            ("/api/admin/courses/", None),
+            ("/api/courses/", None),
+        ):
+            with self.subTest(url=url):
+                data = self.assertQueriesDoNotGrow(url, 5, user)
+                self.assertEqual(len(data), 6)
+
+        course = next(item for item in data if item["id"] == self.course.id)
+        self.assertEqual([s["supervisor"]["id"] for s in course["supervisors"]], [self.supervisor.id])
+        self.assertEqual(len(course["course_subjects"]), 3)
+
+    def test_course_retrieve(self):
+        data = self.assertQueriesDoNotGrow(f"/api/courses/{self.course.id}/", 5)
+        self.assertEqual(data["name"], "Course")
+
+
+class TraineeCourseListQueryTests(CourseDataMixin, TestCase):
+    def test_course_list_query_count_is_fixed(self):
+        trainee = self.trainees[0]
+        # 2/3 subject hoàn thành sớm (status 2) được tính vào progress
+        finished_ids = UserSubject.objects.filter(
+            course_subject__course=self.course, user=trainee
+        ).values_list("id", flat=True)[:2]
+        UserSubject.objects.filter(id__in=list(finished_ids)).update(
+            status=UserSubject.Status.FINISHED_EARLY
+        )
+        self.client.force_authenticate(trainee)
+        # 1 query course kèm các count + 1 query supervisor
+        for size in (2, 6):
+            for i in range(Course.objects.count(), size):
+                course = self.create_course(f"Extra {i}", subjects=2)
+                CourseEnrollmentService.enroll_trainees(course, [trainee.id])
+            with self.subTest(size=size), self.assertNumQueries(2):
+                response = self.client.get("/api/trainee/courses/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(len(data), 6)
+        course = next(item for item in data if item["id"] == self.course.id)
+        self.assertEqual(course["supervisors"], ["Supervisor"])
+        self.assertEqual((course["subject_count"], course["member_count"]), (3, 3))
+        self.assertEqual(course["progress"], 66.7)
+
+
+class CourseDuplicateTests(CourseDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.second_supervisor = CustomUser.objects.create(
+            email="second@example.com", full_name="Second", role="SUPERVISOR"
+        )
+        CourseSupervisor.objects.create(course=cls.course, supervisor=cls.second_supervisor)
+        for name in ("Backend", "Python"):
+            CourseCategory.objects.create(
+                course=cls.course, category=Category.objects.create(name=name)
+            )
+        for i, course_subject in enumerate(CourseSubject.objects.filter(course=cls.course)):
+            course_subject.start_date = cls.course.start_date + timedelta(days=i)
+            course_subject.finish_date = cls.course.start_date + timedelta(days=i + 5)
+            course_subject.save()
+        # Task đảo thứ tự để kiểm tra position được giữ nguyên khi sao chép
+        Task.objects.filter(name="Task 0").update(position=2048)
+
+    def course_snapshot(self, course):
+        course_subjects = CourseSubject.objects.filter(course=course).order_by("position")
+        return {
+            "categories": sorted(
+                CourseCategory.objects.filter(course=course).values_list("category_id", flat=True)
+            ),
+            "supervisors": sorted(
+                CourseSupervisor.objects.filter(course=course).values_list(
+                    "supervisor_id", flat=True
+                )
+            ),
+            "subjects": [
+                (cs.subject_id, cs.position, cs.start_date, cs.finish_date)
+                for cs in course_subjects
+            ],
+            "tasks": [
+                list(cs.tasks.values_list("name", "position")) for cs in course_subjects
+            ],
+        }
+
+    def test_duplicate_copies_course_and_shifts_dates(self):
+        shift = timedelta(days=40)
+        response = self.client.post(
+            f"/api/courses/{self.course.id}/duplicate/",
+            {"name": "Course copy", "start_date": str(self.course.start_date + shift)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        copy = Course.objects.get(name="Course copy")
+        self.assertEqual(response.json()["data"]["id"], copy.id)
+        self.assertEqual(
+            (copy.start_date, copy.finish_date),
+            (self.course.start_date + shift, self.course.finish_date + shift),
+        )
+        self.assertEqual(copy.creator, self.admin)
+
+        original, copied = self.course_snapshot(self.course), self.course_snapshot(copy)
+        self.assertEqual(copied["categories"], original["categories"])
+        self.assertEqual(copied["supervisors"], original["supervisors"])
+        self.assertEqual(
+            copied["subjects"],
+            [
+                (subject_id, position, start + shift, finish + shift)
+                for subject_id, position, start, finish in original["subjects"]
+            ],
+        )
+        self.assertEqual(copied["tasks"], original["tasks"])
+        self.assertEqual(copied["tasks"][0], [("Task 1", 1), ("Task 0", 2048)])
+
+        self.assertEqual(
+            (copy.member_count, copy.supervisor_count, copy.subject_count), (0, 2, 3)
+        )
+        self.assertFalse(UserCourse.objects.filter(course=copy).exists())
+
+    def test_duplicate_without_start_date_keeps_dates(self):
+        copy = CourseDuplicateService.duplicate(self.course, self.supervisor, "Course copy")
+
+        self.assertEqual(
+            (copy.start_date, copy.finish_date),
+            (self.course.start_date, self.course.finish_date),
+        )
+        self.assertEqual(
+            self.course_snapshot(copy)["subjects"], self.course_snapshot(self.course)["subjects"]
+        )
+
+    def test_supervisor_is_added_to_copy(self):
+        outsider = CustomUser.objects.create(
+            email="outsider@example.com", full_name="Outsider", role="SUPERVISOR"
+        )
+        copy = CourseDuplicateService.duplicate(self.course, outsider, "Course copy")
+
+        self.assertEqual(
+            self.course_snapshot(copy)["supervisors"],
+            sorted([self.supervisor.id, self.second_supervisor.id, outsider.id]),
+        )
+        self.assertEqual(copy.supervisor_count, 3)
+
+    def test_rejects_existing_name(self):
+        response = self.client.post(
+            f"/api/courses/{self.course.id}/duplicate/", {"name": "Other course"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Course.objects.filter(name="Other course").count(), 1)
+
+    def test_duplicate_query_count_does_not_grow(self):
+        for size in (3, 9):
+            for i in range(CourseSubject.objects.filter(course=self.course).count(), size):
+                course_subject = CourseSubject.objects.create(
+                    course=self.course,
+                    subject=Subject.objects.create(
+                        name=f"Extra subject {i}", max_score=10, estimated_time_days=5
+                    ),
+                    position=i,
+                )
+                Task.objects.bulk_create(
+                    Task(
+                        name=f"Task {j}",
+                        taskable_type=Task.TaskType.COURSE_SUBJECT,
+                        taskable_id=course_subject.id,
+                        position=j,
+                    )
+                    for j in range(5)
+                )
+            # số query giữ nguyên khi số subject và task tăng lên
+            with self.subTest(size=size), self.assertNumQueries(16):
+                copy = CourseDuplicateService.duplicate(
+                    self.course, self.admin, f"Copy {size}"
+                )
+
+        self.assertEqual(copy.subject_count, 9)
+        self.assertEqual(
+            [len(tasks) for tasks in self.course_snapshot(copy)["tasks"]], [2] * 3 + [5] * 6
+        )
+
+
+class CourseEnrollmentTests(CourseDataMixin, TestCase):
+    def new_trainees(self, count):
+        start = CustomUser.objects.count()
+        return [
+            CustomUser.objects.create(
+                email=f"new{i}@example.com", full_name=f"New {i}", role="TRAINEE"
+            )
+            for i in range(start, start + count)
+        ]
+
+    def test_add_trainees_skips_enrolled(self):
+        new = self.trainees[3]
+        response = self.client.post(
+            f"/api/admin/courses/{self.course.id}/add-trainees/",
+            {"trainee_ids": [new.id, self.trainees[0].id, new.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual((data["added"], data["skipped"]), (1, 1))
+
+        user_course = UserCourse.objects.get(user=new, course=self.course)
+        user_subjects = UserSubject.objects.filter(user=new)
+        self.assertEqual(
+            sorted(user_subjects.values_list("course_subject_id", flat=True)),
+            sorted(CourseSubject.objects.filter(course=self.course).values_list("id", flat=True)),
+        )
+        self.assertTrue(all(us.user_course_id == user_course.id for us in user_subjects))
+        for user_subject in user_subjects:
+            self.assertEqual(
+                sorted(user_subject.user_tasks.values_list("task_id", flat=True)),
+                sorted(user_subject.course_subject.tasks.values_list("id", flat=True)),
+            )
+        self.assertEqual(UserCourse.objects.filter(user=self.trainees[0], course=self.course).count(), 1)
+
+    def test_enrolled_or_repeated_ids_are_skipped(self):
+        enrolled_ids = [trainee.id for trainee in self.trainees[:3]]
+        # savepoint + 1 query UserCourse, không ghi gì thêm
+        with self.assertNumQueries(3):
+            result = CourseEnrollmentService.enroll_trainees(self.course, enrolled_ids)
+        self.assertEqual(result, (0, 3))
+
+        new_id = self.trainees[3].id
+        result = CourseEnrollmentService.enroll_trainees(self.course, [new_id, new_id])
+        self.assertEqual(result, (1, 1))
+        self.assertEqual(UserCourse.objects.filter(user_id=new_id).count(), 1)
+
+    def test_enroll_query_count_does_not_grow(self):
+        # Số query giữ nguyên khi số trainee tăng lên
+        for count in (2, 8):
+            trainee_ids = [trainee.id for trainee in self.new_trainees(count)]
+            with self.subTest(count=count), self.assertNumQueries(13):
+                result = CourseEnrollmentService.enroll_trainees(self.course, trainee_ids)
+            self.assertEqual(result, (count, 0))
+
+        self.assertEqual(UserSubject.objects.filter(user_id__in=trainee_ids).count(), 8 * 3)
+        self.assertEqual(UserTask.objects.filter(user_id__in=trainee_ids).count(), 8 * 6)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.member_count, 3 + 2 + 8)
+
+
+class AddSubjectFanOutTests(CourseDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/courses/{self.course.id}/add-subject/"
+        self.enrolled = [trainee.id for trainee in self.trainees[:3]]
+
+    def assertAssigned(self, course_subject, task_ids):
+        user_subjects = UserSubject.objects.filter(course_subject=course_subject)
+        self.assertEqual(sorted(us.user_id for us in user_subjects), self.enrolled)
+        for user_subject in user_subjects:
+            self.assertEqual(
+                user_subject.user_course,
+                UserCourse.objects.get(user_id=user_subject.user_id, course=self.course),
+            )
+            self.assertEqual(
+                sorted(user_subject.user_tasks.values_list("task_id", flat=True)),
+                sorted(task_ids),
+            )
+
+    def test_add_existing_subject(self):
+        subject = Subject.objects.create(name="Template", max_score=10, estimated_time_days=5)
+        for name, position in (("Read", 1024), ("Write", 2048)):
+            Task.objects.create(
+                name=name,
+                taskable_type=Task.TaskType.SUBJECT,
+                taskable_id=subject.id,
+                position=position,
+            )
+
+        response = self.client.post(
+            self.url, {"subject_id": subject.id, "tasks": ["Extra"]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        course_subject = CourseSubject.objects.get(course=self.course, subject=subject)
+        tasks = list(course_subject.tasks.values_list("id", "name", "position"))
+        self.assertEqual(
+            [(name, position) for _, name, position in tasks],
+            [("Read", 1024), ("Write", 2048), ("Extra", 3072)],
+        )
+        self.assertAssigned(course_subject, [task_id for task_id, _, _ in tasks])
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.subject_count, 4)
+
+    def test_add_new_subject(self):
+        response = self.client.post(
+            self.url, {"name": "Brand new", "tasks": ["A", "B"]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        course_subject = CourseSubject.objects.get(course=self.course, subject__name="Brand new")
+        # task template của subject mới được gán thẳng cho trainee
+        self.assertAssigned(
+            course_subject, course_subject.subject.tasks.values_list("id", flat=True)
+        )
+
+    def test_fan_out_query_count_does_not_grow(self):
+        # Số query giữ nguyên khi số trainee trong khóa tăng lên
+        for size in (3, 9):
+            for i in range(UserCourse.objects.filter(course=self.course).count(), size):
+                trainee = CustomUser.objects.create(
+                    email=f"extra{i}@example.com", full_name=f"Extra {i}", role="TRAINEE"
+                )
+                UserCourse.objects.create(user=trainee, course=self.course)
+            course_subject = CourseSubject.objects.create(
+                course=self.course,
+                subject=Subject.objects.create(
+                    name=f"Fan-out {size}", max_score=10, estimated_time_days=5
+                ),
+                position=size,
+            )
+            task_ids = [
+                Task.objects.create(
+                    name=f"Task {j}",
+                    taskable_type=Task.TaskType.COURSE_SUBJECT,
+                    taskable_id=course_subject.id,
+                ).id
+                for j in range(2)
+            ]
+            with self.subTest(size=size), self.assertNumQueries(8):
+                assigned = CourseEnrollmentService.enroll_course_subject(
+                    course_subject, task_ids
+                )
+            self.assertEqual(assigned, size)
+            self.assertEqual(UserTask.objects.filter(task_id__in=task_ids).count(), size * 2)
+
+
+class CourseCreateTemplateTaskTests(CourseDataMixin, TestCase):
+    def create_templates(self, count):
+        start = Subject.objects.count()
+        subjects = []
+        for i in range(start, start + count):
+            subject = Subject.objects.create(
+                name=f"Template {i}", max_score=10, estimated_time_days=5
+            )
+            Task.objects.bulk_create(
+                Task(
+                    name=f"Template {i} task {j}",
+                    taskable_type=Task.TaskType.SUBJECT,
+                    taskable_id=subject.id,
+                    position=(2 - j) * 1024,
+                )
+                for j in range(2)
+            )
+            subjects.append(subject)
+        return subjects
+
+    def assertTasksCloned(self, course, subjects):
+        course_subjects = list(CourseSubject.objects.filter(course=course).order_by("position"))
+        self.assertEqual([cs.subject_id for cs in course_subjects], [s.id for s in subjects])
+        self.assertEqual([cs.position for cs in course_subjects], sparse_positions(len(subjects)))
+        for course_subject in course_subjects:
+            self.assertEqual(
+                list(course_subject.tasks.values_list("name", "position")),
+                list(course_subject.subject.tasks.values_list("name", "position")),
+            )
+
+    def test_create_endpoint_clones_template_tasks(self):
+        subjects = self.create_templates(2)[::-1]
+        response = self.client.post(
+            "/api/admin/courses/create/",
+            {
+                "name": "New course",
+                "start_date": "2030-01-01",
+                "finish_date": "2030-03-01",
+                "subjects": [subject.id for subject in subjects],
+                "supervisors": [self.supervisor.id],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        course = Course.objects.get(name="New course")
+        self.assertTasksCloned(course, subjects)
+        self.assertEqual((course.supervisor_count, course.subject_count), (1, 2))
+
+    def test_create_course_service(self):
+        subjects = self.create_templates(2)
+        course = CourseCreateService.create_course(
+            self.supervisor,
+            {
+                "name": "Service course",
+                "start_date": date(2030, 1, 1),
+                "finish_date": date(2030, 3, 1),
+                "subjects": [subject.id for subject in subjects],
+            },
+        )
+
+        self.assertTasksCloned(course, subjects)
+        self.assertEqual(
+            list(CourseSupervisor.objects.filter(course=course).values_list("supervisor_id", flat=True)),
+            [self.supervisor.id],
+        )
+
+        with self.assertRaises(ValueError):
+            CourseCreateService.create_course(self.supervisor, {"name": "Empty", "subjects": []})
+
+    def test_add_subjects_query_count_does_not_grow(self):
+        # bulk CourseSubject + cập nhật và đọc lại counter + 1 query task template + bulk task
+        for count in (2, 8):
+            subjects = self.create_templates(count)
+            course = Course.objects.create(
+                name=f"Course {count}",
+                start_date=date(2030, 1, 1),
+                finish_date=date(2030, 3, 1),
+                creator=self.supervisor,
+            )
+            with self.subTest(count=count), self.assertNumQueries(5):
+                CourseCreateService.add_subjects(course, [subject.id for subject in subjects])
+            self.assertTasksCloned(course, subjects)
+
+
+class BulkIdSerializerTests(CourseDataMixin, TestCase):
+    def test_ids_resolve_in_one_query_in_input_order(self):
+        extra = [
+            CustomUser.objects.create(
+                email=f"bulk{i}@example.com", full_name=f"Bulk {i}", role="TRAINEE"
+            )
+            for i in range(6)
+        ]
+        for trainees in (self.trainees, self.trainees + extra):
+            ids = [trainee.id for trainee in reversed(trainees)]
+            serializer = AddTraineeSerializer(data={"trainee_ids": ids + ids[:2]})
+            with self.subTest(count=len(ids)), self.assertNumQueries(1):
+                self.assertTrue(serializer.is_valid())
+
+            resolved = serializer.validated_data["trainee_ids"]
+            self.assertEqual(list(resolved), ids)
+            self.assertEqual(resolved[ids[0]], trainees[-1])
+
+    def test_missing_and_wrong_role_ids_are_reported_together(self):
+        serializer = AddTraineeSerializer(
+            data={"trainee_ids": [self.trainees[0].id, 999999, self.supervisor.id]}
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            [str(error) for error in serializer.errors["trainee_ids"]],
+            [
+                "Invalid pk(s) [999999] - object does not exist.",
+                f"Users with ID [{self.supervisor.id}] are not trainees.",
+            ],
+        )
+
+        for data in ({"trainee_ids": ["x"]}, {"trainee_ids": [0]}, {}):
+            self.assertFalse(AddTraineeSerializer(data=data).is_valid())
+
+    def test_add_supervisors_endpoint(self):
+        second = CustomUser.objects.create(
+            email="second@example.com", full_name="Second", role="SUPERVISOR"
+        )
+        url = f"/api/courses/{self.course.id}/add-supervisors/"
+
+        response = self.client.post(
+            url, {"supervisor_ids": [self.trainees[0].id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            url, {"supervisor_ids": [second.id, self.supervisor.id, second.id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(
+                CourseSupervisor.objects.filter(course=self.course).values_list(
+                    "supervisor_id", flat=True
+                )
+            ),
+            sorted([self.supervisor.id, second.id]),
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.supervisor_count, 2)
+
+
+class CursorPaginationTests(CourseDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(3):
+            cls.create_course(f"Paged {i}", subjects=1)
+        # Từng cặp khóa học trùng created_at: id quyết định thứ tự trong cặp
+        base = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        for i, course in enumerate(Course.objects.order_by("id")):
+            Course.objects.filter(pk=course.pk).update(
+                created_at=base + timedelta(minutes=i // 2)
+            )
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()["data"]
+            pages.append([item["id"] for item in page["results"]])
+            url = page["next"]
+        return pages
+
+    def test_lists_are_unpaginated_without_params(self):
+        for url in ("/api/admin/courses/", "/api/supervisor/courses/", "/api/courses/"):
+            with self.subTest(url=url):
+                data = self.client.get(url).json()["data"]
+                self.assertIsInstance(data, list)
+                self.assertEqual(len(data), 5)
+
+    def test_course_lists_page_by_created_at_then_id(self):
+        expected = list(
+            Course.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        for url in ("/api/admin/courses/", "/api/supervisor/courses/", "/api/courses/"):
+            with self.subTest(url=url):
+                pages = self.walk(f"{url}?page_size=2")
+                self.assertEqual([len(page) for page in pages], [2, 2, 1])
+                self.assertEqual(sum(pages, []), expected)
+
+    def test_subject_list_pages_by_name(self):
+        expected = list(Subject.objects.order_by("name").values_list("id", flat=True))
+
+        pages = self.walk("/api/admin/subjects/?page_size=3")
+
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual(len(pages), 3)
+
+    def test_previous_links_walk_back_across_ties(self):
+        forward = self.walk("/api/admin/courses/?page_size=2")
+
+        page = self.client.get("/api/admin/courses/?page_size=2").json()["data"]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()["data"]
+        backward = [[item["id"] for item in page["results"]]]
+        while page["previous"]:
+            page = self.client.get(page["previous"]).json()["data"]
+            backward.append([item["id"] for item in page["results"]])
+
+        self.assertEqual(backward[::-1], forward)
+
+    def test_fully_tied_first_field(self):
+        Course.objects.update(created_at=datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+
+        self.test_previous_links_walk_back_across_ties()
+        self.assertEqual(
+            sum(self.walk("/api/admin/courses/?page_size=2"), []),
+            list(Course.objects.order_by("-id").values_list("id", flat=True)),
+        )
+
+    def test_invalid_cursor(self):
+        def encode(position):
+            return base64.b64encode(urlencode({"p": position}).encode()).decode()
+
+        # cursor hỏng, vị trí không phải JSON, vị trí thiếu field
+        for cursor in ("bad", encode("not-json"), encode(json.dumps(["x"]))):
+            response = self.client.get("/api/admin/courses/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 404)
@@ -141,6 +141,11 @@ urlpatterns = [
         CourseManagementViewSet.as_view({"delete": "remove_subject"}),
         name="supervisor-course-remove-subject",
     ),
+    path(
+        "jobs/<int:pk>/",
+        EnrollmentJobDetailView.as_view(),
+        name="enrollment-job-detail",
+    ),
     path(
         "supervisor/courses/<int:course_id>/students/",
         SupervisorCourseStudentsView.as_view(),
@@ -3,7 +3,6 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from authen.permissions import IsAdminRole
 from users.models.user_course import UserCourse
-from users.models.user_subject import UserSubject
 from authen.models import CustomUser
 
 from courses.models.course_model import Course
@@ -11,7 +10,14 @@ from courses.serializers.course_serializer import (
     CourseSerializer,
     CourseCreateSerializer,
 )
-from courses.selectors import get_all_courses, get_course_by_id
+from courses.selectors import (
+    get_all_courses,
+    get_course_by_id,
+    get_course_list_queryset,
+)
+from courses.cache import DASHBOARD_GLOBAL_SCOPE, DASHBOARD_USERS_SCOPE
+from courses.services import DashboardStatService
+from core.cache import get_or_compute
 
 
 class AdminCourseListView(generics.ListAPIView):
@@ -22,6 +28,7 @@ class AdminCourseListView(generics.ListAPIView):
 
     queryset = Course.objects.all().order_by("-created_at")
     serializer_class = CourseSerializer
+    cursor_ordering = ("-created_at", "-id")
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
 
     def get_queryset(self):
@@ -35,7 +42,7 @@ class AdminCourseListView(generics.ListAPIView):
         if status_query and status_query != "ALL":
             queryset = queryset.filter(status=status_query)
 
-        return queryset
+        return get_course_list_queryset(queryset)
 
 
 class AdminCourseDetailView(APIView):
@@ -76,33 +83,25 @@ class AdminDashboardStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
     def get(self, request):
-        all_courses = Course.objects.all()
+        data = get_or_compute(
+            "dashboard:admin-stats",
+            [DASHBOARD_GLOBAL_SCOPE, DASHBOARD_USERS_SCOPE],
+            self._build_stats,
+        )
+        return Response(data, status=status.HTTP_200_OK)
 
-        active_courses_count = all_courses.filter(
-            status=Course.Status.IN_PROGRESS
-        ).count()
-        upcoming_count = all_courses.filter(status=Course.Status.NOT_STARTED).count()
-        finished_count = all_courses.filter(status=Course.Status.FINISHED).count()
+    def _build_stats(self):
+        # Số liệu tổng hợp sẵn trong GlobalStat, cập nhật dần qua DashboardStatService
+        stat = DashboardStatService.get_global()
+
+        active_courses_count = stat.courses_in_progress
+        upcoming_count = stat.courses_not_started
+        finished_count = stat.courses_finished
         supervisor_count = CustomUser.objects.filter(role=CustomUser.Role.SUPERVISOR).count()
-        total_trainees = (
-            UserCourse.objects.values("user")
-            .distinct()
-            .count()
-        )
+        total_trainees = stat.trainees
 
-        related_user_subjects = UserSubject.objects.all()
-        total_subjects_taken = related_user_subjects.count()
-        finished_subjects = (
-            related_user_subjects.filter(
-                status__in=[
-                    UserSubject.Status.FINISHED_EARLY,
-                    UserSubject.Status.FINISHED_ON_TIME,
-                    UserSubject.Status.FINISED_BUT_OVERDUE,
-                ]
-            ).count()
-            if total_subjects_taken > 0
-            else 0
-        )
+        total_subjects_taken = stat.subjects_taken
+        finished_subjects = stat.subjects_finished
 
         completion_rate = (
             round((finished_subjects / total_subjects_taken) * 100, 2)
@@ -133,14 +132,11 @@ class AdminDashboardStatsView(APIView):
             for item in recent_joins
         ]
 
-        return Response(
-            {
-                "active_courses": active_courses_count,
-                "total_trainees": total_trainees,
-                "completion_rate": completion_rate,
-                "chart_data": chart_data,
-                "recent_activities": activities,
-                "total_supervisors": supervisor_count
-            },
-            status=status.HTTP_200_OK,
-        )
+        return {
+            "active_courses": active_courses_count,
+            "total_trainees": total_trainees,
+            "completion_rate": completion_rate,
+            "chart_data": chart_data,
+            "recent_activities": activities,
+            "total_supervisors": supervisor_count
+        }
@@ -1,7 +1,7 @@
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.http import QueryDict
+from django.http import QueryDict, StreamingHttpResponse
 from authen.permissions import IsAdminOrSupervisor
 from rest_framework.decorators import action
 from rest_framework import viewsets
@@ -17,9 +17,37 @@ from users.models.user_subject import UserSubject
 from users.models.user_task import UserTask
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from courses.serializers.course_supervisor_serializer import *
-from courses.selectors import get_all_courses, get_course_by_id
+from courses.selectors import (
+    get_all_courses,
+    get_course_by_id,
+    get_course_list_queryset,
+    get_user_subject_detail_queryset,
+)
+from courses.services import (
+    CourseAnalyticsService,
+    CourseCounterService,
+    CourseDuplicateService,
+    CourseEnrollmentService,
+    CourseSubjectService,
+    EnrollmentJobService,
+    GradebookExportService,
+)
+from courses.models.enrollment_job import EnrollmentJob
+from core.pagination import OptionalCursorPagination
+from courses.cache import (
+    DASHBOARD_USERS_SCOPE,
+    get_course_analytics,
+    invalidate_course_detail,
+    invalidate_dashboards,
+    invalidate_task_progress,
+    supervisor_dashboard_scope,
+)
+from core.cache import get_or_compute
+from core.ordering import move_from_payload, next_position, reorder, sparse_positions
 from courses.serializers.course_serializer import (
     CourseSerializer,
     CourseCreateSerializer,
@@ -31,8 +59,18 @@ class SupervisorCourseListView(APIView):
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminOrSupervisor]
 
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ("-created_at", "-id")
+
     def get(self, request):
-        courses = get_all_courses().order_by("-created_at")
+        courses = get_course_list_queryset(get_all_courses().order_by("-created_at"))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(courses, request, view=self)
+        if page is not None:
+            serializer = self.serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = self.serializer_class(courses, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -43,7 +81,7 @@ class SupervisorMyCourseListView(APIView):
 
     def get(self, request):
         user = self.request.user
-        course = (
+        course = get_course_list_queryset(
             Course.objects.filter(course_supervisors=user)
             .distinct()
             .order_by("-created_at")
@@ -139,14 +177,11 @@ class AddSubjectToCourseView(APIView):
                 if subject_id:
                     subject = Subject.objects.get(pk=subject_id)
 
-                    course_subject = CourseSubject.objects.create(
-                        course=course,
-                        subject=subject,
-                    )
+                    course_subject = CourseSubjectService.add(course, subject)
 
                     template_tasks = Task.objects.filter(
                         taskable_type=Task.TaskType.SUBJECT, taskable_id=subject.id
-                    )
+                    ).order_by("position", "id")
 
                     new_tasks = []
                     for template in template_tasks:
@@ -155,15 +190,20 @@ class AddSubjectToCourseView(APIView):
                                 name=template.name,
                                 taskable_type=Task.TaskType.COURSE_SUBJECT,
                                 taskable_id=course_subject.id,
+                                position=template.position,
                             )
                         )
 
-                    for name in task_names:
+                    last_position = max([t.position for t in new_tasks], default=0)
+                    for name, position in zip(
+                        task_names, sparse_positions(len(task_names), last_position)
+                    ):
                         new_tasks.append(
                             Task(
                                 name=name,
                                 taskable_type=Task.TaskType.COURSE_SUBJECT,
                                 taskable_id=course_subject.id,
+                                position=position,
                             )
                         )
 
@@ -180,16 +220,19 @@ class AddSubjectToCourseView(APIView):
                     )
 
                     new_tasks = []
-                    for name in task_names:
+                    for name, position in zip(
+                        task_names, sparse_positions(len(task_names))
+                    ):
                         new_tasks.append(
                             Task(
                                 name=name,
                                 taskable_type=Task.TaskType.SUBJECT,
                                 taskable_id=subject.id,
+                                position=position,
                             )
                         )
                     Task.objects.bulk_create(new_tasks)
-                    CourseSubject.objects.create(course=course, subject=subject)
+                    CourseSubjectService.add(course, subject)
 
                     message = "Created new subject and template tasks successfully."
 
@@ -217,61 +260,25 @@ class AddTraineeToCourseView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        trainees = serializer.validated_data["trainee_ids"]
+        trainee_ids = list(serializer.validated_data["trainee_ids"])
 
-        course_subjects = list(CourseSubject.objects.filter(course=course))
-
-        tasks_map = {}
-
-        cs_ids = [cs.id for cs in course_subjects]
-        relevant_tasks = Task.objects.filter(
-            taskable_type=Task.TaskType.COURSE_SUBJECT, taskable_id__in=cs_ids
-        )
-
-        for task in relevant_tasks:
-            if task.taskable_id not in tasks_map:
-                tasks_map[task.taskable_id] = []
-            tasks_map[task.taskable_id].append(task)
-
-        added_count = 0
-        skipped_count = 0
-        all_user_tasks_to_create = []
+        if request.query_params.get("async") in ("1", "true", "True"):
+            job = EnrollmentJobService.enqueue(
+                course, request.user, trainee_ids
+            )
+            return Response(
+                {
+                    "message": "Enrollment job queued.",
+                    "job_id": job.id,
+                    "total": job.total,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
 
         try:
-            with transaction.atomic():
-                for trainee in trainees:
-                    if UserCourse.objects.filter(user=trainee, course=course).exists():
-                        skipped_count += 1
-                        continue
-                    user_course = UserCourse.objects.create(
-                        user=trainee,
-                        course=course,
-                        status=UserCourse.Status.NOT_STARTED,
-                    )
-                    for cs in course_subjects:
-                        user_subject = UserSubject.objects.create(
-                            user=trainee,
-                            user_course=user_course,
-                            course_subject=cs,
-                            status=UserSubject.Status.NOT_STARTED,
-                        )
-
-                        tasks_of_cs = tasks_map.get(cs.id, [])
-
-                        for task in tasks_of_cs:
-                            all_user_tasks_to_create.append(
-                                UserTask(
-                                    user=trainee,
-                                    task=task,
-                                    user_subject=user_subject,
-                                    status=UserTask.Status.NOT_DONE,
-                                )
-                            )
-
-                    added_count += 1
-
-                if all_user_tasks_to_create:
-                    UserTask.objects.bulk_create(all_user_tasks_to_create)
+            added_count, skipped_count = CourseEnrollmentService.enroll_trainees(
+                course, trainee_ids
+            )
 
             return Response(
                 {
@@ -289,29 +296,54 @@ class AddTraineeToCourseView(APIView):
             )
 
 
+class EnrollmentJobDetailView(generics.RetrieveAPIView):
+    """
+    API: GET /api/jobs/<pk>/
+    Theo dõi tiến độ job ghi danh chạy nền
+    """
+
+    queryset = EnrollmentJob.objects.all()
+    serializer_class = EnrollmentJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrSupervisor]
+
+
 class CourseManagementViewSet(viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminOrSupervisor]
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            queryset = get_course_list_queryset(queryset)
+        return queryset
 
     @action(detail=True, methods=["post"], url_path="add-supervisors")
     def add_supervisors(self, request, pk=None):
         course = self.get_object()
         serializer = AddSupervisorSerializer(data=request.data)
         if serializer.is_valid():
-            supervisor_ids = serializer.validated_data["supervisor_ids"]
+            supervisor_ids = list(serializer.validated_data["supervisor_ids"])
 
-            existing_ids = CourseSupervisor.objects.filter(
-                course=course, supervisor__in=supervisor_ids
-            ).values_list("supervisor_id", flat=True)
+            existing_ids = set(
+                CourseSupervisor.objects.filter(
+                    course=course, supervisor_id__in=supervisor_ids
+                ).values_list("supervisor_id", flat=True)
+            )
 
             new_links = [
-                CourseSupervisor(course=course, supervisor=sup)
-                for sup in supervisor_ids
-                if sup.id not in existing_ids
+                CourseSupervisor(course=course, supervisor_id=supervisor_id)
+                for supervisor_id in supervisor_ids
+                if supervisor_id not in existing_ids
             ]
 
             CourseSupervisor.objects.bulk_create(new_links)
+            CourseCounterService.adjust(course.id, supervisor_count=len(new_links))
+            invalidate_course_detail(course.id)
+            invalidate_dashboards(
+                supervisor_ids=[link.supervisor_id for link in new_links]
+            )
             return Response(
                 {"message": f"Added {len(new_links)} supervisors."},
                 status=status.HTTP_200_OK,
@@ -345,6 +377,9 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
             deleted, _ = CourseSupervisor.objects.filter(
                 course=course, supervisor_id=supervisor_id
             ).delete()
+            CourseCounterService.adjust(course.id, supervisor_count=-deleted)
+            invalidate_course_detail(course.id)
+            invalidate_dashboards(supervisor_ids=[supervisor_id])
 
             if deleted:
                 return Response(
@@ -364,62 +399,25 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        trainees = serializer.validated_data["trainee_ids"]
-
-        course_subjects = list(CourseSubject.objects.filter(course=course))
-
-        tasks_map = {}
+        trainee_ids = list(serializer.validated_data["trainee_ids"])
 
-        cs_ids = [cs.id for cs in course_subjects]
-        relevant_tasks = Task.objects.filter(
-            taskable_type=Task.TaskType.COURSE_SUBJECT, taskable_id__in=cs_ids
-        )
-        for task in relevant_tasks:
-            if task.taskable_id not in tasks_map:
-                tasks_map[task.taskable_id] = []
-            tasks_map[task.taskable_id].append(task)
-
-        added_count = 0
-        skipped_count = 0
-        all_user_tasks_to_create = []
+        if request.query_params.get("async") in ("1", "true", "True"):
+            job = EnrollmentJobService.enqueue(
+                course, request.user, trainee_ids
+            )
+            return Response(
+                {
+                    "message": "Enrollment job queued.",
+                    "job_id": job.id,
+                    "total": job.total,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
 
         try:
-            with transaction.atomic():
-                for trainee in trainees:
-                    if UserCourse.objects.filter(user=trainee, course=course).exists():
-                        skipped_count += 1
-                        continue
-
-                    user_course = UserCourse.objects.create(
-                        user=trainee,
-                        course=course,
-                        status=UserCourse.Status.NOT_STARTED,
-                    )
-
-                    for cs in course_subjects:
-                        user_subject = UserSubject.objects.create(
-                            user=trainee,
-                            user_course=user_course,
-                            course_subject=cs,
-                            status=UserSubject.Status.NOT_STARTED,
-                        )
-
-                        tasks_of_cs = tasks_map.get(cs.id, [])
-
-                        for task in tasks_of_cs:
-                            all_user_tasks_to_create.append(
-                                UserTask(
-                                    user=trainee,
-                                    task=task,
-                                    user_subject=user_subject,
-                                    status=UserTask.Status.NOT_DONE,
-                                )
-                            )
-
-                    added_count += 1
-
-                if all_user_tasks_to_create:
-                    UserTask.objects.bulk_create(all_user_tasks_to_create)
+            added_count, skipped_count = CourseEnrollmentService.enroll_trainees(
+                course, trainee_ids
+            )
 
             return Response(
                 {
@@ -443,9 +441,7 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             trainee_id = serializer.validated_data["id"]
 
-            deleted, _ = UserCourse.objects.filter(
-                course=course, user_id=trainee_id
-            ).delete()
+            deleted = CourseEnrollmentService.remove_trainees(course, [trainee_id])
 
             if deleted:
                 return Response(
@@ -476,28 +472,30 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
 
                 if subject_id:
                     subject = Subject.objects.get(pk=subject_id)
-                    course_subject = CourseSubject.objects.create(
-                        course=course,
-                        subject=subject,
-                    )
+                    course_subject = CourseSubjectService.add(course, subject)
 
                     template_tasks = Task.objects.filter(
                         taskable_type=Task.TaskType.SUBJECT, taskable_id=subject.id
-                    )
+                    ).order_by("position", "id")
                     new_tasks = [
                         Task(
                             name=t.name,
                             taskable_type=Task.TaskType.COURSE_SUBJECT,
                             taskable_id=course_subject.id,
+                            position=t.position,
                         )
                         for t in template_tasks
                     ]
-                    for name in task_names:
+                    last_position = max([t.position for t in new_tasks], default=0)
+                    for name, position in zip(
+                        task_names, sparse_positions(len(task_names), last_position)
+                    ):
                         new_tasks.append(
                             Task(
                                 name=name,
                                 taskable_type=Task.TaskType.COURSE_SUBJECT,
                                 taskable_id=course_subject.id,
+                                position=position,
                             )
                         )
 
@@ -512,46 +510,27 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
                         estimated_time_days=data.get("estimated_time_days", 1),
                     )
 
-                    course_subject = CourseSubject.objects.create(
-                        course=course,
-                        subject=subject,
-                    )
+                    course_subject = CourseSubjectService.add(course, subject)
 
                     new_tasks = [
                         Task(
                             name=name,
                             taskable_type=Task.TaskType.SUBJECT,
                             taskable_id=subject.id,
+                            position=position,
+                        )
+                        for name, position in zip(
+                            task_names, sparse_positions(len(task_names))
                         )
-                        for name in task_names
                     ]
 
                     if new_tasks:
                         final_tasks_for_user = Task.objects.bulk_create(new_tasks)
                     message = "Created new subject successfully."
 
-                existing_user_courses = UserCourse.objects.filter(course=course)
-                if existing_user_courses.exists():
-                    new_us = []
-                    new_ut = []
-                    for uc in existing_user_courses:
-                        us = UserSubject.objects.create(
-                            user=uc.user,
-                            user_course=uc,
-                            course_subject=course_subject,
-                            status=UserSubject.Status.NOT_STARTED,
-                        )
-                        for t in final_tasks_for_user:
-                            new_ut.append(
-                                UserTask(
-                                    user=uc.user,
-                                    task=t,
-                                    user_subject=us,
-                                    status=UserTask.Status.NOT_DONE,
-                                )
-                            )
-                    if new_ut:
-                        UserTask.objects.bulk_create(new_ut)
+                CourseEnrollmentService.enroll_course_subject(
+                    course_subject, [t.id for t in final_tasks_for_user]
+                )
 
             return Response({"message": message}, status=status.HTTP_201_CREATED)
 
@@ -563,6 +542,26 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
                 {"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=["post"], url_path="duplicate")
+    def duplicate(self, request, pk=None):
+        """
+        Nhận vào: { "name": "...", "start_date": "YYYY-MM-DD" (tùy chọn) }
+        Ngày của khóa học mới và các CourseSubject được dời theo start_date.
+        """
+        course = self.get_object()
+
+        serializer = DuplicateCourseSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        new_course = CourseDuplicateService.duplicate(
+            course, request.user, **serializer.validated_data
+        )
+
+        return Response(
+            self.get_serializer(new_course).data, status=status.HTTP_201_CREATED
+        )
+
     @action(detail=True, methods=["delete"], url_path="remove-subject")
     def remove_subject(self, request, pk=None):
         course = self.get_object()
@@ -571,7 +570,7 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             cs_id = serializer.validated_data["id"]
 
-            deleted, _ = CourseSubject.objects.filter(id=cs_id, course=course).delete()
+            deleted = CourseSubjectService.remove(course, [cs_id])
 
             if deleted:
                 return Response(
@@ -616,45 +615,94 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
     def get_subjects(self, request, pk=None):
         course = self.get_object()
 
-        course_subjects = CourseSubject.objects.filter(course=course).order_by(
-            "position"
+        course_subjects = (
+            CourseSubject.objects.filter(course=course)
+            .select_related("subject")
+            .prefetch_related("subject__tasks")
+            .order_by("position")
         )
 
         serializer = CourseSubjectSerializer(course_subjects, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["get"], url_path="analytics")
+    def analytics(self, request, pk=None):
+        course = self.get_object()
+
+        data = get_course_analytics(
+            course.id, lambda: CourseAnalyticsService.compute(course)
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="gradebook")
+    def gradebook(self, request, pk=None):
+        course = self.get_object()
+
+        response = StreamingHttpResponse(
+            GradebookExportService.iter_csv(course),
+            content_type="text/csv; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="course_{course.id}_gradebook.csv"'
+        )
+        return response
+
     @action(detail=True, methods=["post"], url_path="reorder-subjects")
     def reorder_subjects(self, request, pk=None):
         """
-        Nhận vào một list các object: [{ "id": 1, "position": 1 }, { "id": 2, "position": 2 }]
-        id ở đây là id của CourseSubject
+        Nhận vào một trong hai dạng (id là id của CourseSubject):
+        - Sắp xếp lại toàn bộ: { "items": [{ "id": 1, "position": 1 }, { "id": 2, "position": 2 }] }
+        - Di chuyển một subject: { "id": 1, "after_id": 2 } hoặc { "id": 1, "before_id": 2 }
+          (không có after_id/before_id thì đưa lên đầu)
         """
         course = self.get_object()
-        items = request.data.get("items", [])
-
-        if not items:
-            return Response(
-                {"detail": "No items provided."}, status=status.HTTP_400_BAD_REQUEST
-            )
+        queryset = CourseSubject.objects.filter(course=course)
 
         try:
-            with transaction.atomic():
-                for item in items:
-                    cs_id = item.get("id")
-                    new_pos = item.get("position")
+            if not isinstance(request.data, dict):
+                raise ValueError("Payload must be an object.")
 
-                    CourseSubject.objects.filter(id=cs_id, course=course).update(
-                        position=new_pos
-                    )
+            if request.data.get("id") is not None:
+                moved = move_from_payload(queryset, request.data["id"], request.data)
+                invalidate_course_detail(course.id)
+                return Response(
+                    {"message": "Order updated successfully.", "updated": moved},
+                    status=status.HTTP_200_OK,
+                )
 
-            return Response(
-                {"message": "Order updated successfully."}, status=status.HTTP_200_OK
-            )
-        except Exception as e:
-            return Response(
-                {"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            items = request.data.get("items", [])
+            if not items:
+                return Response(
+                    {"detail": "No items provided."}, status=status.HTTP_400_BAD_REQUEST
+                )
+            if not isinstance(items, list) or not all(
+                isinstance(item, dict) for item in items
+            ):
+                raise ValueError("items must be a list of objects.")
+
+            ordered_ids = [
+                int(item["id"])
+                for item in sorted(items, key=lambda item: item.get("position") or 0)
+            ]
+            course_subject_ids = set(queryset.values_list("id", flat=True))
+            if not set(ordered_ids) <= course_subject_ids:
+                raise ValueError("Some subjects do not belong to this course.")
+        except (KeyError, TypeError, ValueError) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Các subject không được gửi lên giữ nguyên thứ tự, xếp sau cùng
+        ordered_ids += [
+            cs_id
+            for cs_id in queryset.order_by("position", "id").values_list("id", flat=True)
+            if cs_id not in set(ordered_ids)
+        ]
+        reorder(queryset, ordered_ids)
+        invalidate_course_detail(course.id)
+
+        return Response(
+            {"message": "Order updated successfully."}, status=status.HTTP_200_OK
+        )
 
     @action(detail=True, methods=["post"], url_path="add-task")
     def add_task(self, request, pk=None):
@@ -680,7 +728,7 @@ class CourseManagementViewSet(viewsets.ModelViewSet):
                     name=name,
                     taskable_type=Task.TaskType.SUBJECT,
                     taskable_id=target_subject.id,
-                    position=0,
+                    position=next_position(target_subject.tasks),
                 )
 
                 user_subjects = UserSubject.objects.filter(
@@ -715,16 +763,33 @@ class SupervisorDashboardStatsView(APIView):
 
     def get(self, request):
         user = request.user
+        # Cache theo version của supervisor, bump khi khóa học của họ thay đổi
+        data = get_or_compute(
+            "dashboard:supervisor-stats",
+            [supervisor_dashboard_scope(user.id), DASHBOARD_USERS_SCOPE],
+            lambda: self._build_stats(user),
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _build_stats(self, user):
         my_courses = Course.objects.filter(course_supervisors=user)
 
-        active_courses_count = my_courses.filter(
-            status=Course.Status.IN_PROGRESS
-        ).count()
-        upcoming_count = my_courses.filter(status=Course.Status.NOT_STARTED).count()
-        finished_count = my_courses.filter(status=Course.Status.FINISHED).count()
+        # Cộng dồn CourseStat của các khóa học mình phụ trách trong 1 query
+        stats = my_courses.aggregate(
+            active=Count("pk", filter=Q(status=Course.Status.IN_PROGRESS)),
+            upcoming=Count("pk", filter=Q(status=Course.Status.NOT_STARTED)),
+            finished=Count("pk", filter=Q(status=Course.Status.FINISHED)),
+            subjects_taken=Coalesce(Sum("stat__subjects_taken"), 0),
+            subjects_finished=Coalesce(Sum("stat__subjects_finished"), 0),
+        )
+
+        active_courses_count = stats["active"]
+        upcoming_count = stats["upcoming"]
+        finished_count = stats["finished"]
         supervisor_count = CustomUser.objects.filter(
             role=CustomUser.Role.SUPERVISOR
         ).count()
+        # Trainee có thể học nhiều khóa của cùng supervisor nên vẫn phải đếm distinct
         total_trainees = (
             UserCourse.objects.filter(course__in=my_courses)
             .values("user")
@@ -732,21 +797,8 @@ class SupervisorDashboardStatsView(APIView):
             .count()
         )
 
-        related_user_subjects = UserSubject.objects.filter(
-            user_course__course__in=my_courses
-        )
-        total_subjects_taken = related_user_subjects.count()
-        finished_subjects = (
-            related_user_subjects.filter(
-                status__in=[
-                    UserSubject.Status.FINISHED_EARLY,
-                    UserSubject.Status.FINISHED_ON_TIME,
-                    UserSubject.Status.FINISED_BUT_OVERDUE,
-                ]
-            ).count()
-            if total_subjects_taken > 0
-            else 0
-        )
+        total_subjects_taken = stats["subjects_taken"]
+        finished_subjects = stats["subjects_finished"]
         completion_rate = (
             round((finished_subjects / total_subjects_taken) * 100, 2)
             if total_subjects_taken
@@ -776,17 +828,14 @@ class SupervisorDashboardStatsView(APIView):
             for item in recent_joins
         ]
 
-        return Response(
-            {
-                "active_courses": active_courses_count,
-                "total_trainees": total_trainees,
-                "completion_rate": completion_rate,
-                "chart_data": chart_data,
-                "recent_activities": activities,
-                "total_supervisors": supervisor_count,
-            },
-            status=status.HTTP_200_OK,
-        )
+        return {
+            "active_courses": active_courses_count,
+            "total_trainees": total_trainees,
+            "completion_rate": completion_rate,
+            "chart_data": chart_data,
+            "recent_activities": activities,
+            "total_supervisors": supervisor_count,
+        }
 
 
 class SupervisorCourseStudentsView(APIView):
@@ -818,13 +867,12 @@ class SupervisorUserSubjectDetailView(APIView):
 
     def get(self, request, subject_id, student_id):
         user_subject = get_object_or_404(
-            UserSubject, course_subject_id=subject_id, user_id=student_id
+            get_user_subject_detail_queryset(),
+            course_subject_id=subject_id,
+            user_id=student_id,
         )
         course_subject = user_subject.course_subject
 
-        tasks_qs = UserTask.objects.filter(user_subject=user_subject).select_related(
-            "task"
-        )
         tasks_data = [
             {
                 "id": t.id,
@@ -833,18 +881,11 @@ class SupervisorUserSubjectDetailView(APIView):
                     "DONE" if (t.status == 1 or t.status == "DONE") else "NOT_DONE"
                 ),
             }
-            for t in tasks_qs
+            for t in user_subject.user_tasks.all()
         ]
 
-        content_type = ContentType.objects.get_for_model(UserSubject)
-        last_comment = (
-            Comment.objects.filter(content_type=content_type, object_id=user_subject.id)
-            .order_by("-updated_at")
-            .first()
-        )
-
-        supervisor_comment = last_comment.content if last_comment else ""
-        comment_updated_at = last_comment.updated_at if last_comment else None
+        supervisor_comment = user_subject.last_comment_content or ""
+        comment_updated_at = user_subject.last_comment_updated_at
 
         response_data = {
             "id": user_subject.id,
@@ -886,7 +927,7 @@ class SupervisorSubjectTaskCreateView(APIView):
                     name=name,
                     taskable_type=Task.TaskType.COURSE_SUBJECT,
                     taskable_id=course_subject.id,
-                    position=0,
+                    position=next_position(course_subject.tasks),
                 )
 
                 related_user_subjects = UserSubject.objects.filter(
@@ -1040,5 +1081,6 @@ class SupervisorTaskDetailView(APIView):
 
     def delete(self, request, pk):
         task = get_object_or_404(Task, pk=pk)
+        invalidate_task_progress([task])
         task.delete()
         return Response({"message": "Task deleted"}, status=status.HTTP_200_OK)
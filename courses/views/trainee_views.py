@@ -10,7 +10,11 @@ from courses.serializers.course_serializer import CourseSerializer
 from courses.serializers.course_supervisor_serializer import CourseSupervisorSerializer, UserBasicSerializer
 from courses.serializers.course_serializer import UserCourseMemberSerializer
 from courses.serializers.course_trainee_serializers import TraineeCourseListSerializer
-from courses.selectors import get_all_courses, get_course_by_id
+from courses.selectors import (
+    get_all_courses,
+    get_course_by_id,
+    get_trainee_course_list_queryset,
+)
 
 from courses.serializers.course_detail_serializer import TraineeCourseFullDetailSerializer
 
@@ -20,11 +24,7 @@ class TraineeMyCoursesView(APIView):
     def get(self, request):
         user = request.user
 
-        my_courses = Course.objects.filter(
-            user_courses__user=user
-        ).distinct().order_by('-created_at')
-        
-        my_courses = my_courses.prefetch_related('supervisors__supervisor')
+        my_courses = get_trainee_course_list_queryset(user)
 
         serializer = TraineeCourseListSerializer(
             my_courses, 
@@ -76,6 +76,6 @@ class CourseMembersView(APIView):
         return Response({"course": CourseSerializer(course).data,
                         "members": serializer.data, 
                         "supervisors": supervisors_serializer.data, 
-                        "member_count": user_courses.count(),
-                        "supervisor_count": course_supervisors.count()
+                        "member_count": course.member_count,
+                        "supervisor_count": course.supervisor_count
                         }, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -1,7 +1,13 @@
 from django.contrib import admin
-from .models import DailyReport
+from .models import DailyReport, DailyReportSubmissionStat
 
 @admin.register(DailyReport)
 class DailyReportAdmin(admin.ModelAdmin):
     list_display = ('user', 'course', 'created_at', 'status')
-    list_filter = ('status', 'created_at')
\ No newline at end of file
+    list_filter = ('status', 'created_at')
+
+
+@admin.register(DailyReportSubmissionStat)
+class DailyReportSubmissionStatAdmin(admin.ModelAdmin):
+    list_display = ('course', 'date', 'submissions')
+    list_filter = ('date',)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DailyReportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'daily_reports'
+
+    def ready(self):
+        from daily_reports import signals  # noqa: F401
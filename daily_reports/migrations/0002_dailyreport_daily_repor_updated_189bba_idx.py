@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_courses_cou_created_7ad857_idx'),
+        ('daily_reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyreport',
+            index=models.Index(fields=['updated_at', 'id'], name='daily_repor_updated_189bba_idx'),
+        ),
+    ]
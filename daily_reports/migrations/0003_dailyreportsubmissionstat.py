@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_submission_stats(apps, schema_editor):
+    DailyReport = apps.get_model('daily_reports', 'DailyReport')
+    DailyReportSubmissionStat = apps.get_model('daily_reports', 'DailyReportSubmissionStat')
+
+    rows = (
+        DailyReport.objects.filter(status=1)
+        .order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('course_id', 'day')
+        .annotate(total=Count('pk'))
+    )
+    DailyReportSubmissionStat.objects.bulk_create(
+        [
+            DailyReportSubmissionStat(course_id=row['course_id'], date=row['day'], submissions=row['total'])
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_dashboard_stats'),
+        ('daily_reports', '0002_dailyreport_daily_repor_updated_189bba_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReportSubmissionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_report_stats', to='courses.course')),
+            ],
+            options={
+                'db_table': 'daily_report_submission_stats',
+                'unique_together': {('course', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_submission_stats, migrations.RunPython.noop),
+    ]
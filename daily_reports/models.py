@@ -20,6 +20,7 @@ class DailyReport(models.Model):
         indexes = [
             models.Index(fields=['user', 'course']),
             models.Index(fields=['course']),
+            models.Index(fields=['updated_at', 'id']),
         ]
         ordering = ['-updated_at']
 
@@ -37,3 +38,20 @@ class DailyReport(models.Model):
             created_at__date=today
         ).exclude(pk=self.pk).exists():
             raise ValidationError("A report already exists for this course today.")
+
+
+class DailyReportSubmissionStat(models.Model):
+    """
+    Số báo cáo đã nộp theo (khóa học, ngày tạo báo cáo), cập nhật khi nộp/xóa
+    báo cáo để vẽ biểu đồ mà không phải quét bảng daily_reports theo từng ngày.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_report_stats')
+    date = models.DateField()
+    submissions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_report_submission_stats'
+        unique_together = ('course', 'date')
+
+    def __str__(self):
+        return f"{self.course} - {self.date}: {self.submissions}"
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import DailyReport, DailyReportSubmissionStat
+
+
+class DailyReportStatService:
+    SUBMITTED = 1
+    # Giới hạn độ dài chuỗi thời gian trả về trong 1 request
+    MAX_SERIES_DAYS = 366 * 2
+
+    @staticmethod
+    def report_date(report):
+        # Cùng cách tính ngày với filter created_at__date
+        return timezone.localtime(report.created_at).date()
+
+    @staticmethod
+    def adjust(course_id, date, delta):
+        """
+        Cộng/trừ số báo cáo đã nộp của khóa học trong ngày `date`,
+        tạo dòng thống kê nếu chưa có.
+        """
+        if not delta:
+            return
+        stats = DailyReportSubmissionStat.objects.filter(course_id=course_id, date=date)
+        value = F("submissions") + delta if delta > 0 else Greatest(F("submissions") + delta, 0)
+        if stats.update(submissions=value) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                DailyReportSubmissionStat.objects.create(
+                    course_id=course_id, date=date, submissions=delta
+                )
+        except IntegrityError:
+            # Request khác vừa tạo dòng của ngày này
+            stats.update(submissions=value)
+
+    @staticmethod
+    def get_series(course_id, start_date, end_date):
+        """
+        Số báo cáo đã nộp theo từng ngày trong [start_date, end_date],
+        ngày không có báo cáo trả về 0 (1 query).
+        """
+        counts = dict(
+            DailyReportSubmissionStat.objects.filter(
+                course_id=course_id, date__range=(start_date, end_date)
+            ).values_list("date", "submissions")
+        )
+        return [
+            {"date": day, "submissions": counts.get(day, 0)}
+            for day in (
+                start_date + timedelta(days=i)
+                for i in range((end_date - start_date).days + 1)
+            )
+        ]
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(course_ids=None):
+        """
+        Tính lại bảng thống kê từ daily_reports.
+        Trả về số dòng thống kê được tạo.
+        """
+        stats = DailyReportSubmissionStat.objects.all()
+        reports = DailyReport.objects.filter(status=DailyReportStatService.SUBMITTED)
+        if course_ids is not None:
+            stats = stats.filter(course_id__in=course_ids)
+            reports = reports.filter(course_id__in=course_ids)
+
+        stats.delete()
+        rows = DailyReportSubmissionStat.objects.bulk_create(
+            [
+                DailyReportSubmissionStat(
+                    course_id=row["course_id"], date=row["day"], submissions=row["total"]
+                )
+                for row in reports.order_by()
+                .annotate(day=TruncDate("created_at"))
+                .values("course_id", "day")
+                .annotate(total=Count("pk"))
+            ],
+            batch_size=1000,
+        )
+        return len(rows)
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import DailyReport
+from .services import DailyReportStatService
+
+
+# Ghi nhớ status lúc load để biết báo cáo vừa được nộp hay bị hủy nộp
+@receiver(post_init, sender=DailyReport)
+def remember_report_status(sender, instance, **kwargs):
+    instance._stat_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=DailyReport)
+def update_submission_stat(sender, instance, created, raw=False, **kwargs):
+    # Field status bị defer thì không biết trạng thái cũ
+    if raw or (not created and instance._stat_status is None):
+        return
+    submitted = instance.status == DailyReportStatService.SUBMITTED
+    was_submitted = (
+        not created and instance._stat_status == DailyReportStatService.SUBMITTED
+    )
+    DailyReportStatService.adjust(
+        instance.course_id,
+        DailyReportStatService.report_date(instance),
+        int(submitted) - int(was_submitted),
+    )
+    instance._stat_status = instance.status
+
+
+@receiver(post_delete, sender=DailyReport)
+def remove_submission_stat(sender, instance, **kwargs):
+    if instance._stat_status == DailyReportStatService.SUBMITTED:
+        DailyReportStatService.adjust(
+            instance.course_id, DailyReportStatService.report_date(instance), -1
+        )
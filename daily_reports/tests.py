@@ -0,0 +1,141 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authen.models import CustomUser
+from courses.models.course_model import Course
+from courses.models.course_supervisor_model import CourseSupervisor
+from daily_reports.models import DailyReport, DailyReportSubmissionStat
+from daily_reports.services import DailyReportStatService
+
+
+class DailyReportSubmissionStatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainees = [
+            CustomUser.objects.create(
+                email=f"trainee{i}@example.com", full_name=f"Trainee {i}", role="TRAINEE"
+            )
+            for i in range(3)
+        ]
+        cls.course = Course.objects.create(
+            name="Course",
+            start_date=date.today() - timedelta(days=5),
+            finish_date=date.today() + timedelta(days=5),
+            creator=cls.supervisor,
+        )
+        CourseSupervisor.objects.create(course=cls.course, supervisor=cls.supervisor)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.url = "/api/supervisor/daily_reports/submission-stats/"
+        self.today = timezone.localdate()
+
+    def create_report(self, trainee, status=DailyReportStatService.SUBMITTED):
+        return DailyReport.objects.create(
+            user=trainee, course=self.course, content="Report", status=status
+        )
+
+    def today_submissions(self):
+        return (
+            DailyReportSubmissionStat.objects.filter(course=self.course, date=self.today)
+            .values_list("submissions", flat=True)
+            .first()
+        )
+
+    def assertStatsMatchRebuild(self):
+        stats = list(
+            DailyReportSubmissionStat.objects.filter(submissions__gt=0)
+            .order_by("course_id", "date")
+            .values_list("course_id", "date", "submissions")
+        )
+        DailyReportStatService.rebuild()
+        self.assertEqual(
+            stats,
+            list(
+                DailyReportSubmissionStat.objects.order_by("course_id", "date").values_list(
+                    "course_id", "date", "submissions"
+                )
+            ),
+        )
+
+    def test_rollup_follows_submit_and_delete(self):
+        submitted = self.create_report(self.trainees[0])
+        draft = self.create_report(self.trainees[1], status=0)
+        self.assertEqual(self.today_submissions(), 1)
+
+        draft.status = DailyReportStatService.SUBMITTED
+        draft.save()
+        self.assertEqual(self.today_submissions(), 2)
+        self.assertStatsMatchRebuild()
+
+        submitted.delete()
+        self.create_report(self.trainees[2], status=0).delete()
+        self.assertEqual(self.today_submissions(), 1)
+        self.assertStatsMatchRebuild()
+
+    def test_series_is_zero_filled(self):
+        for trainee in self.trainees[:2]:
+            self.create_report(trainee)
+        old_report = self.create_report(self.trainees[2])
+        DailyReport.objects.filter(pk=old_report.pk).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        DailyReportStatService.rebuild()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url,
+                {
+                    "course_id": self.course.id,
+                    "start_date": (self.today - timedelta(days=3)).isoformat(),
+                    "end_date": self.today.isoformat(),
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(
+            data["series"],
+            [
+                {"date": (self.today - timedelta(days=days)).isoformat(), "submissions": count}
+                for days, count in ((3, 0), (2, 1), (1, 0), (0, 2))
+            ],
+        )
+
+    def test_series_defaults_to_course_dates(self):
+        response = self.client.get(self.url, {"course_id": self.course.id})
+
+        self.assertEqual(response.status_code, 200)
+        series = response.json()["data"]["series"]
+        self.assertEqual(len(series), 11)
+        self.assertEqual({point["submissions"] for point in series}, {0})
+
+    def test_series_rejects_invalid_range(self):
+        for params in (
+            {},
+            {"course_id": self.course.id, "start_date": "2025-02-30"},
+            {
+                "course_id": self.course.id,
+                "start_date": self.today.isoformat(),
+                "end_date": (self.today - timedelta(days=1)).isoformat(),
+            },
+        ):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+        other = Course.objects.create(
+            name="Other",
+            start_date=date.today(),
+            finish_date=date.today() + timedelta(days=1),
+            creator=self.supervisor,
+        )
+        self.assertEqual(
+            self.client.get(self.url, {"course_id": other.id}).status_code, 404
+        )
@@ -12,6 +12,7 @@ class AdminDailyReportViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = DailyReportSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-updated_at", "-id")
 
     def get_queryset(self):
         user = self.request.user
@@ -1,17 +1,24 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from django.utils.dateparse import parse_date
+from courses.models.course_model import Course
 from ..models import DailyReport
 from ..serializers import DailyReportSerializer
+from ..services import DailyReportStatService
 
 
 class SupervisorDailyReportViewSet(viewsets.ReadOnlyModelViewSet):
     """
     - GET /supervisor/daily_reports/
     - GET /supervisor/daily_reports/{id}/
+    - GET /supervisor/daily_reports/submission-stats/?course_id=&start_date=&end_date=
     """
     serializer_class = DailyReportSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-updated_at", "-id")
 
     def get_queryset(self):
         user = self.request.user
@@ -43,3 +50,55 @@ class SupervisorDailyReportViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(created_at__date=filter_date)
 
         return queryset
+
+    @action(detail=False, methods=["get"], url_path="submission-stats")
+    def submission_stats(self, request):
+        """
+        Số báo cáo đã nộp theo từng ngày của khóa học, mặc định từ
+        start_date đến finish_date của khóa học.
+        """
+        if getattr(request.user, "role", None) != "SUPERVISOR":
+            raise PermissionDenied("You are not allowed to access supervisor reports.")
+
+        course_id = request.query_params.get("course_id")
+        if not course_id:
+            raise ValidationError({"course_id": "This query parameter is required."})
+        try:
+            course = request.user.supervised_courses.only(
+                "id", "start_date", "finish_date"
+            ).get(pk=course_id)
+        except (ValueError, Course.DoesNotExist):
+            raise NotFound("Course not found.")
+
+        dates = {}
+        for param, default in (
+            ("start_date", course.start_date),
+            ("end_date", course.finish_date),
+        ):
+            value = request.query_params.get(param)
+            try:
+                dates[param] = parse_date(value) if value else default
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                raise ValidationError({param: "Invalid date, expected YYYY-MM-DD."})
+
+        start_date, end_date = dates["start_date"], dates["end_date"]
+        if start_date > end_date:
+            raise ValidationError({"end_date": "end_date must not be before start_date."})
+        if (end_date - start_date).days >= DailyReportStatService.MAX_SERIES_DAYS:
+            raise ValidationError(
+                {"end_date": f"Date range must not exceed {DailyReportStatService.MAX_SERIES_DAYS} days."}
+            )
+
+        series = DailyReportStatService.get_series(course.id, start_date, end_date)
+        return Response(
+            {
+                "course_id": course.id,
+                "start_date": start_date,
+                "end_date": end_date,
+                "total": sum(point["submissions"] for point in series),
+                "series": series,
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -10,6 +10,7 @@ from ..serializers import DailyReportSerializer
 class TraineeDailyReportViewSet(viewsets.ModelViewSet):
     serializer_class = DailyReportSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-updated_at", "-id")
 
     def get_queryset(self):
         user = self.request.user
@@ -1,4 +1,6 @@
 from django.db import models
+from subjects.models.task import Task
+from subjects.models.taskable import TaskableDescriptor
 
 class Subject(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -8,16 +10,10 @@ class Subject(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     image = models.ImageField(upload_to='subject/', null=True, blank=True)
 
+    tasks = TaskableDescriptor(Task.TaskType.SUBJECT)
+
     class Meta:
         ordering = ['name']
 
     def __str__(self):
         return self.name
-    
-    @property
-    def tasks(self):
-        from subjects.models.task import Task
-        return Task.objects.filter(
-            taskable_type=Task.TaskType.SUBJECT,
-            taskable_id=self.id
-        ).order_by('position')
\ No newline at end of file
@@ -17,4 +17,4 @@ class Task(models.Model):
         indexes = [
             models.Index(fields=['taskable_type', 'taskable_id']),
         ]
-        ordering = ['position', 'created_at']
\ No newline at end of file
+        ordering = ['position', 'created_at']
@@ -0,0 +1,67 @@
+from operator import attrgetter
+
+from django.db import models
+from subjects.models.task import Task
+
+
+class TaskableManager(models.Manager):
+    """
+    Related manager cho task của một đối tượng (Subject/CourseSubject)
+    qua cặp (taskable_type, taskable_id). Hỗ trợ prefetch_related.
+    """
+
+    def __init__(self, instance, taskable_type, cache_name):
+        super().__init__()
+        self.model = Task
+        self.instance = instance
+        self.taskable_type = taskable_type
+        self.cache_name = cache_name
+
+    def _apply_rel_filters(self, queryset):
+        return queryset.filter(
+            taskable_type=self.taskable_type, taskable_id=self.instance.pk
+        )
+
+    def get_queryset(self):
+        try:
+            return self.instance._prefetched_objects_cache[self.cache_name]
+        except (AttributeError, KeyError):
+            return self._apply_rel_filters(super().get_queryset())
+
+    def get_prefetch_querysets(self, instances, querysets=None):
+        if querysets and len(querysets) != 1:
+            raise ValueError(
+                "querysets argument of get_prefetch_querysets() should have a "
+                "length of 1."
+            )
+        queryset = querysets[0] if querysets else super().get_queryset()
+        queryset = queryset.filter(
+            taskable_type=self.taskable_type,
+            taskable_id__in={instance.pk for instance in instances},
+        )
+        return (
+            queryset,
+            attrgetter("taskable_id"),
+            attrgetter("pk"),
+            False,
+            self.cache_name,
+            False,
+        )
+
+
+class TaskableDescriptor:
+    """
+    Khai báo trên model sở hữu task, ví dụ:
+    tasks = TaskableDescriptor(Task.TaskType.SUBJECT)
+    """
+
+    def __init__(self, taskable_type):
+        self.taskable_type = taskable_type
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return TaskableManager(instance, self.taskable_type, self.name)
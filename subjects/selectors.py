@@ -1,9 +1,21 @@
-from django.db.models import Q
+from django.db.models import Prefetch, Q
+from courses.models.course_subject import CourseSubject
 from subjects.models.subject import Subject
 from subjects.models.category import Category
+from subjects.models.subject_category import SubjectCategory
+from subjects.models.task import Task
+
+# Prefetch cho CategorySerializer: subject của từng category cùng task của subject
+CATEGORY_SUBJECTS_PREFETCH = (
+    Prefetch(
+        'subjectcategory_set',
+        queryset=SubjectCategory.objects.select_related('subject'),
+    ),
+    'subjectcategory_set__subject__tasks',
+)
 
 def get_all_subjects():
-    return Subject.objects.all().order_by('name')
+    return Subject.objects.prefetch_related('tasks').order_by('name')
 
 def get_subject_by_id(subject_id):
     try:
@@ -23,7 +35,7 @@ def search_subjects(query=None, exclude_ids=None):
     if query:
         subjects = subjects.filter(name__icontains=query)
     
-    return subjects.order_by('name')
+    return subjects.prefetch_related('tasks').order_by('name')
 
 
 def search_categories(query=None):
@@ -35,10 +47,33 @@ def search_categories(query=None):
     if query:
         categories = categories.filter(name__icontains=query)
     
-    return categories.order_by('-created_at')
+    return categories.prefetch_related(*CATEGORY_SUBJECTS_PREFETCH).order_by('-created_at')
 
 def get_category_by_id(category_id):
     try:
-        return Category.objects.prefetch_related('subjectcategory_set__subject').get(id=category_id)
+        return Category.objects.prefetch_related(*CATEGORY_SUBJECTS_PREFETCH).get(id=category_id)
     except Category.DoesNotExist:
-        return None
\ No newline at end of file
+        return None
+
+
+def prefetch_taskables(tasks):
+    """
+    Gắn đối tượng sở hữu (Subject hoặc CourseSubject) vào `task.taskable_object`
+    cho cả danh sách task, tối đa 2 query.
+    """
+    tasks = list(tasks)
+    ids_by_type = {Task.TaskType.SUBJECT: set(), Task.TaskType.COURSE_SUBJECT: set()}
+    for task in tasks:
+        ids_by_type.setdefault(task.taskable_type, set()).add(task.taskable_id)
+
+    owners = {
+        Task.TaskType.SUBJECT: Subject.objects.in_bulk(
+            ids_by_type[Task.TaskType.SUBJECT]
+        ),
+        Task.TaskType.COURSE_SUBJECT: CourseSubject.objects.select_related(
+            'subject'
+        ).in_bulk(ids_by_type[Task.TaskType.COURSE_SUBJECT]),
+    }
+    for task in tasks:
+        task.taskable_object = owners.get(task.taskable_type, {}).get(task.taskable_id)
+    return tasks
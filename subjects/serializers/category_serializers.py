@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.db import transaction
+from core.ordering import sparse_positions
 from subjects.models.category import Category
 from subjects.models.subject_category import SubjectCategory
 from subjects.serializers.subject_serializers import SubjectSerializer
@@ -32,12 +33,16 @@ class CategorySerializer(serializers.ModelSerializer):
 
         category = Category.objects.create(**validated_data)
 
-        for index, item in enumerate(subject_categories_data):
-            SubjectCategory.objects.create(
+        SubjectCategory.objects.bulk_create([
+            SubjectCategory(
                 category=category,
                 subject=item['subject'],
-                position=index + 1
+                position=position
             )
+            for item, position in zip(
+                subject_categories_data, sparse_positions(len(subject_categories_data))
+            )
+        ])
 
         return category
 
@@ -51,11 +56,15 @@ class CategorySerializer(serializers.ModelSerializer):
         if subject_categories_data is not None:
             instance.subjectcategory_set.all().delete()
 
-            for index, item in enumerate(subject_categories_data):
-                SubjectCategory.objects.create(
+            SubjectCategory.objects.bulk_create([
+                SubjectCategory(
                     category=instance,
                     subject=item['subject'],
-                    position=index + 1
+                    position=position
+                )
+                for item, position in zip(
+                    subject_categories_data, sparse_positions(len(subject_categories_data))
                 )
+            ])
 
         return instance
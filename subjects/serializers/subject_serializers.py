@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.db import transaction
+from django.utils import timezone
+from core.ordering import sparse_positions
+from courses.cache import invalidate_task_progress
 from subjects.models.subject import Subject
 from subjects.models.task import Task
 
@@ -31,13 +34,15 @@ class SubjectSerializer(serializers.ModelSerializer):
         subject = Subject.objects.create(**validated_data)
 
         if tasks_data:
-            for index, task_item in enumerate(tasks_data):
-                Task.objects.create(
+            Task.objects.bulk_create([
+                Task(
                     name=task_item['name'],
                     taskable_type=Task.TaskType.SUBJECT,
                     taskable_id=subject.id,
-                    position=index + 1
+                    position=position
                 )
+                for task_item, position in zip(tasks_data, sparse_positions(len(tasks_data)))
+            ])
         
         return subject
 
@@ -53,31 +58,42 @@ class SubjectSerializer(serializers.ModelSerializer):
         instance.save()
 
         if tasks_data is not None:
-            current_tasks = Task.objects.filter(
-                taskable_type=Task.TaskType.SUBJECT,
-                taskable_id=instance.id
-            )
-            current_task_ids = set(t.id for t in current_tasks)
+            current_tasks = {
+                t.id: t for t in Task.objects.filter(
+                    taskable_type=Task.TaskType.SUBJECT,
+                    taskable_id=instance.id
+                )
+            }
             incoming_task_ids = set(item['id'] for item in tasks_data if 'id' in item)
 
-            ids_to_delete = current_task_ids - incoming_task_ids
+            ids_to_delete = set(current_tasks) - incoming_task_ids
             if ids_to_delete:
-                Task.objects.filter(id__in=ids_to_delete).delete()
+                tasks_to_delete = Task.objects.filter(id__in=ids_to_delete)
+                invalidate_task_progress(tasks_to_delete)
+                tasks_to_delete.delete()
 
-            for index, task_item in enumerate(tasks_data):
-                task_id = task_item.get('id')
-                
-                if task_id and task_id in current_task_ids:
-                    task = Task.objects.get(id=task_id)
+            tasks_to_update = []
+            tasks_to_create = []
+            for task_item, position in zip(tasks_data, sparse_positions(len(tasks_data))):
+                task = current_tasks.get(task_item.get('id'))
+
+                if task:
                     task.name = task_item.get('name', task.name)
-                    task.position = index + 1 
-                    task.save()
+                    task.position = position
+                    tasks_to_update.append(task)
                 else:
-                    Task.objects.create(
+                    tasks_to_create.append(Task(
                         name=task_item['name'],
                         taskable_type=Task.TaskType.SUBJECT,
                         taskable_id=instance.id,
-                        position=index + 1
-                    )
+                        position=position
+                    ))
+
+            # Task.updated_at là auto_now, bulk_update không tự gán
+            now = timezone.now()
+            for task in tasks_to_update:
+                task.updated_at = now
+            Task.objects.bulk_update(tasks_to_update, ['name', 'position', 'updated_at'])
+            Task.objects.bulk_create(tasks_to_create)
 
         return instance
\ No newline at end of file
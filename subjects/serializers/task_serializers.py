@@ -1,7 +1,17 @@
+from django.db import models
 from rest_framework import serializers
+from core.ordering import next_position
 from courses.models.course_subject import CourseSubject
 from subjects.models.task import Task
 from subjects.models.subject import Subject
+from subjects.selectors import prefetch_taskables
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return super().to_representation(prefetch_taskables(iterable))
+
 
 class TaskSerializer(serializers.ModelSerializer):
     subject_id = serializers.IntegerField(write_only=True, required=True)
@@ -10,6 +20,7 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'name', 'subject_id', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = TaskListSerializer
 
     def validate(self, data):
         name = data.get('name')
@@ -34,6 +45,12 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return data
 
+    @staticmethod
+    def _subject_tasks(subject_id):
+        return Task.objects.filter(
+            taskable_type=Task.TaskType.SUBJECT, taskable_id=subject_id
+        )
+
     def validate_subject_id(self, value):
         if not Subject.objects.filter(id=value).exists():
             raise serializers.ValidationError("Subject not found.")
@@ -42,22 +59,28 @@ class TaskSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
 
+        # taskable_object được gắn sẵn bởi prefetch_taskables khi serialize danh sách
+        if hasattr(instance, 'taskable_object'):
+            owner = instance.taskable_object
+        elif instance.taskable_type == Task.TaskType.SUBJECT:
+            owner = Subject.objects.filter(id=instance.taskable_id).first()
+        else:
+            owner = CourseSubject.objects.select_related('subject').filter(
+                id=instance.taskable_id
+            ).first()
+
         if instance.taskable_type == Task.TaskType.SUBJECT:
             representation['subject_id'] = instance.taskable_id
             representation['type'] = 'Subject Task'
-            try:
-                representation['subject_name'] = Subject.objects.get(id=instance.taskable_id).name
-            except Subject.DoesNotExist:
-                representation['subject_name'] = "Unknown"
+            representation['subject_name'] = owner.name if owner else "Unknown"
 
         elif instance.taskable_type == Task.TaskType.COURSE_SUBJECT:
-            try:
-                cs = CourseSubject.objects.get(id=instance.taskable_id)
-                representation['subject_id'] = cs.subject_id
-                representation['subject_name'] = cs.subject.name
-                representation['course_id'] = cs.course_id
+            if owner:
+                representation['subject_id'] = owner.subject_id
+                representation['subject_name'] = owner.subject.name
+                representation['course_id'] = owner.course_id
                 representation['type'] = 'Course Subject Task'
-            except CourseSubject.DoesNotExist:
+            else:
                 representation['subject_id'] = None
                 representation['subject_name'] = "Unknown"
 
@@ -68,13 +91,21 @@ class TaskSerializer(serializers.ModelSerializer):
         task = Task.objects.create(
             name=validated_data['name'],
             taskable_type=Task.TaskType.SUBJECT,
-            taskable_id=subject_id
+            taskable_id=subject_id,
+            position=next_position(self._subject_tasks(subject_id)),
         )
         return task
 
     def update(self, instance, validated_data):
         if 'subject_id' in validated_data:
-            instance.taskable_id = validated_data.pop('subject_id')
+            subject_id = validated_data.pop('subject_id')
+            if (
+                instance.taskable_type == Task.TaskType.SUBJECT
+                and subject_id != instance.taskable_id
+            ):
+                # Chuyển sang subject khác thì xếp cuối danh sách task của subject đó
+                instance.position = next_position(self._subject_tasks(subject_id))
+            instance.taskable_id = subject_id
 
         instance.name = validated_data.get('name', instance.name)
         instance.save()
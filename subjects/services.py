@@ -0,0 +1,45 @@
+from django.db.models import Exists, OuterRef
+
+from subjects.models.task import Task
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+
+
+def assign_task_to_learners(task):
+    """
+    Gán task template của Subject cho mọi học viên đang học Subject đó.
+    Các user đã có task được loại bằng anti-join (NOT EXISTS) ngay trong
+    câu SELECT, sau đó insert bằng một lần bulk_create.
+    Trả về số user được gán.
+    """
+    if task.taskable_type != Task.TaskType.SUBJECT:
+        return 0
+
+    rows = (
+        UserSubject.objects.filter(course_subject__subject_id=task.taskable_id)
+        .filter(
+            ~Exists(
+                UserTask.objects.filter(user_id=OuterRef("user_id"), task_id=task.id)
+            )
+        )
+        .order_by("user_id", "id")
+        .values_list("id", "user_id")
+    )
+
+    user_tasks = []
+    assigned_user_ids = set()
+    for user_subject_id, user_id in rows:
+        if user_id in assigned_user_ids:
+            continue
+        assigned_user_ids.add(user_id)
+        user_tasks.append(
+            UserTask(
+                user_id=user_id,
+                task_id=task.id,
+                user_subject_id=user_subject_id,
+                status=UserTask.Status.NOT_DONE,
+            )
+        )
+
+    UserTask.objects.bulk_create(user_tasks, batch_size=1000)
+    return len(user_tasks)
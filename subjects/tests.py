@@ -1 +1,324 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authen.models import CustomUser
+from core.ordering import POSITION_STEP, sparse_positions
+from courses.models.course_model import Course
+from courses.models.course_subject import CourseSubject
+from subjects.models.category import Category
+from subjects.models.subject import Subject
+from subjects.models.subject_category import SubjectCategory
+from subjects.models.task import Task
+from subjects.services import assign_task_to_learners
+from users.models.user_course import UserCourse
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+
+
+class TaskOrderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.subject = Subject.objects.create(name="Subject", max_score=10, estimated_time_days=5)
+        cls.tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                taskable_type=Task.TaskType.SUBJECT,
+                taskable_id=cls.subject.id,
+                position=position,
+            )
+            for i, position in enumerate(sparse_positions(3))
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def ordered_names(self):
+        return list(
+            Task.objects.filter(
+                taskable_type=Task.TaskType.SUBJECT, taskable_id=self.subject.id
+            )
+            .order_by("position", "id")
+            .values_list("name", flat=True)
+        )
+
+    def test_created_task_is_appended(self):
+        response = self.client.post(
+            "/api/tasks/", {"name": "New task", "subject_id": self.subject.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        task = Task.objects.get(name="New task")
+        self.assertEqual(task.position, 4 * POSITION_STEP)
+        self.assertEqual(self.ordered_names()[-1], "New task")
+
+    def test_move_task(self):
+        response = self.client.post(
+            f"/api/tasks/{self.tasks[2].id}/move/",
+            {"after_id": self.tasks[0].id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["updated"], 1)
+        self.assertEqual(self.ordered_names(), ["Task 0", "Task 2", "Task 1"])
+
+        self.client.post(f"/api/tasks/{self.tasks[1].id}/move/", {}, format="json")
+        self.assertEqual(self.ordered_names(), ["Task 1", "Task 0", "Task 2"])
+
+    def test_move_task_rejects_invalid_payload(self):
+        other = Task.objects.create(
+            name="Other", taskable_type=Task.TaskType.SUBJECT, taskable_id=self.subject.id + 1
+        )
+
+        for data in ({"after_id": other.id}, {"before_id": "abc"}, [1, 2]):
+            response = self.client.post(
+                f"/api/tasks/{self.tasks[0].id}/move/", data, format="json"
+            )
+            self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.ordered_names(), ["Task 0", "Task 1", "Task 2"])
+
+
+class CategorySubjectOrderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.category = Category.objects.create(name="Category")
+        cls.links = [
+            SubjectCategory.objects.create(
+                category=cls.category,
+                subject=Subject.objects.create(
+                    name=f"Subject {i}", max_score=10, estimated_time_days=5
+                ),
+                position=position,
+            )
+            for i, position in enumerate(sparse_positions(3))
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+        self.url = f"/api/supervisor/categories/{self.category.id}/move-subject/"
+
+    def ordered_names(self):
+        return list(
+            SubjectCategory.objects.filter(category=self.category)
+            .order_by("position", "id")
+            .values_list("subject__name", flat=True)
+        )
+
+    def test_move_subject(self):
+        response = self.client.post(
+            self.url, {"id": self.links[0].id, "before_id": self.links[2].id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["updated"], 1)
+        self.assertEqual(self.ordered_names(), ["Subject 1", "Subject 0", "Subject 2"])
+
+    def test_move_subject_rejects_invalid_payload(self):
+        for data in ({}, {"id": "x"}, {"id": self.links[0].id, "after_id": 0}, [1]):
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.ordered_names(), ["Subject 0", "Subject 1", "Subject 2"])
+
+
+class TaskAssignmentTests(TestCase):
+    """
+    Trainee 0 học Subject ở cả 2 khóa, trainee 1 ở 1 khóa,
+    trainee 2 ở khóa không có Subject.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainees = [
+            CustomUser.objects.create(
+                email=f"trainee{i}@example.com", full_name=f"Trainee {i}", role="TRAINEE"
+            )
+            for i in range(3)
+        ]
+        cls.subject = Subject.objects.create(name="Subject", max_score=10, estimated_time_days=5)
+        other_subject = Subject.objects.create(name="Other", max_score=10, estimated_time_days=5)
+
+        cls.user_subjects = {}
+        for name, subject, trainees in (
+            ("Course A", cls.subject, cls.trainees[:2]),
+            ("Course B", cls.subject, cls.trainees[:1]),
+            ("Course C", other_subject, cls.trainees[2:]),
+        ):
+            course = Course.objects.create(
+                name=name,
+                start_date=date.today(),
+                finish_date=date.today() + timedelta(days=30),
+                creator=cls.supervisor,
+            )
+            course_subject = CourseSubject.objects.create(course=course, subject=subject)
+            for trainee in trainees:
+                user_subject = UserSubject.objects.create(
+                    user=trainee,
+                    course_subject=course_subject,
+                    user_course=UserCourse.objects.create(user=trainee, course=course),
+                )
+                cls.user_subjects.setdefault(trainee.id, user_subject)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def create_task(self, name="Task"):
+        return Task.objects.create(
+            name=name, taskable_type=Task.TaskType.SUBJECT, taskable_id=self.subject.id
+        )
+
+    def test_create_endpoint_assigns_each_learner_once(self):
+        response = self.client.post(
+            "/api/tasks/", {"name": "Task", "subject_id": self.subject.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["assigned_count"], 2)
+        user_tasks = UserTask.objects.filter(task__name="Task")
+        self.assertEqual(
+            sorted(user_tasks.values_list("user_id", "user_subject_id")),
+            [(t.id, self.user_subjects[t.id].id) for t in self.trainees[:2]],
+        )
+
+    def test_reassign_skips_existing_user_tasks(self):
+        task = self.create_task()
+        UserTask.objects.create(
+            user=self.trainees[0], task=task, user_subject=self.user_subjects[self.trainees[0].id]
+        )
+
+        self.assertEqual(assign_task_to_learners(task), 1)
+        self.assertEqual(assign_task_to_learners(task), 0)
+        self.assertEqual(UserTask.objects.filter(task=task).count(), 2)
+
+    def test_assignment_query_count_is_fixed(self):
+        # 1 SELECT anti-join + 1 INSERT, không phụ thuộc số học viên
+        task = self.create_task("First")
+        with self.assertNumQueries(2):
+            assign_task_to_learners(task)
+
+        for i in range(3, 8):
+            trainee = CustomUser.objects.create(
+                email=f"trainee{i}@example.com", full_name=f"Trainee {i}", role="TRAINEE"
+            )
+            user_subject = self.user_subjects[self.trainees[1].id]
+            UserSubject.objects.create(
+                user=trainee,
+                course_subject=user_subject.course_subject,
+                user_course=UserCourse.objects.create(
+                    user=trainee, course=user_subject.course_subject.course
+                ),
+            )
+        task = self.create_task("Second")
+
+        with self.assertNumQueries(2):
+            self.assertEqual(assign_task_to_learners(task), 7)
+
+    def test_course_subject_task_is_not_assigned(self):
+        task = Task.objects.create(
+            name="Course task",
+            taskable_type=Task.TaskType.COURSE_SUBJECT,
+            taskable_id=self.user_subjects[self.trainees[0].id].course_subject_id,
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(assign_task_to_learners(task), 0)
+
+
+class TaskPrefetchQueryTests(TestCase):
+    """
+    Danh sách subject, category, task và course subject load task theo
+    lô: số query không tăng theo số subject.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.category = Category.objects.create(name="Category")
+        cls.course = Course.objects.create(
+            name="Course",
+            start_date=date.today(),
+            finish_date=date.today() + timedelta(days=30),
+            creator=cls.supervisor,
+        )
+        for i in range(2):
+            cls.add_subject(i)
+
+    @classmethod
+    def add_subject(cls, i):
+        subject = Subject.objects.create(name=f"Subject {i}", max_score=10, estimated_time_days=5)
+        SubjectCategory.objects.create(category=cls.category, subject=subject, position=i)
+        course_subject = CourseSubject.objects.create(
+            course=cls.course, subject=subject, position=i
+        )
+        Task.objects.bulk_create(
+            [
+                Task(name=f"Task {i}.0", taskable_type=Task.TaskType.SUBJECT, taskable_id=subject.id),
+                Task(name=f"Task {i}.1", taskable_type=Task.TaskType.SUBJECT, taskable_id=subject.id),
+                Task(
+                    name=f"Course task {i}",
+                    taskable_type=Task.TaskType.COURSE_SUBJECT,
+                    taskable_id=course_subject.id,
+                ),
+            ]
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def assertQueriesDoNotGrow(self, url, num):
+        for size in (2, 6):
+            for i in range(Subject.objects.count(), size):
+                self.add_subject(i)
+            with self.subTest(size=size), self.assertNumQueries(num):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_subject_lists(self):
+        # 1 query subject + 1 query task
+        data = self.assertQueriesDoNotGrow("/api/supervisor/subjects/", 2)
+        self.assertEqual(len(data), 6)
+        self.assertEqual([t["name"] for t in data[0]["tasks"]], ["Task 0.0", "Task 0.1"])
+
+        data = self.assertQueriesDoNotGrow("/api/admin/subjects/", 2)
+        self.assertEqual(len(data), 6)
+
+    def test_category_detail_and_list(self):
+        # category + subject_category kèm subject + task
+        data = self.assertQueriesDoNotGrow(
+            f"/api/supervisor/categories/{self.category.id}/", 3
+        )
+        self.assertEqual(len(data["subject_categories"]), 6)
+        self.assertEqual(len(data["subject_categories"][5]["subject"]["tasks"]), 2)
+
+        self.assertQueriesDoNotGrow("/api/supervisor/categories/", 3)
+
+    def test_task_list(self):
+        # task + subject sở hữu + course subject sở hữu (kèm subject)
+        data = self.assertQueriesDoNotGrow("/api/tasks/", 3)
+        self.assertEqual(len(data), 18)
+        self.assertEqual(
+            {task["subject_name"] for task in data}, {f"Subject {i}" for i in range(6)}
+        )
+
+    def test_course_subjects(self):
+        data = self.assertQueriesDoNotGrow(f"/api/courses/{self.course.id}/subjects/", 3)
+        self.assertEqual(len(data), 6)
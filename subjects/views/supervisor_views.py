@@ -8,7 +8,11 @@ from users.models.user_task import UserTask
 from courses.models.course_subject import CourseSubject
 from subjects.models.task import Task
 from subjects.models.category import Category 
+from subjects.models.subject_category import SubjectCategory
 
+from core.ordering import move_from_payload
+from subjects.services import assign_task_to_learners
+from courses.cache import invalidate_task_progress
 from subjects.serializers.subject_serializers import SubjectSerializer
 from subjects.serializers.task_serializers import TaskSerializer
 from subjects.serializers.category_serializers import (
@@ -22,6 +26,7 @@ from subjects.selectors import (
     get_category_by_id,
 )
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 
@@ -174,45 +179,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         task = serializer.save()
-
-        if task.taskable_type == Task.TaskType.SUBJECT:
-            subject_id = task.taskable_id
-
-            active_user_subjects = UserSubject.objects.filter(
-                course_subject__subject_id=subject_id
-            ).select_related(
-                "user"
-            )
-
-            user_tasks_to_create = []
-            processed_user_ids = set() 
-
-            for user_subject in active_user_subjects:
-                user_id = user_subject.user.id
-
-                if user_id in processed_user_ids:
-                    continue
-
-                if not UserTask.objects.filter(user_id=user_id, task=task).exists():
-                    user_tasks_to_create.append(
-                        UserTask(
-                            user=user_subject.user,
-                            task=task,
-                            user_subject=user_subject,
-                            status=UserTask.Status.NOT_DONE,
-                        )
-                    )
-                    processed_user_ids.add(user_id)
-
-            if user_tasks_to_create:
-                UserTask.objects.bulk_create(
-                    user_tasks_to_create, ignore_conflicts=True
-                )
+        assigned_count = assign_task_to_learners(task)
 
         return Response(
             {
                 "message": "Create task success and assigned to trainees.",
-                "data": serializer.data,
+                "data": {**serializer.data, "assigned_count": assigned_count},
             },
             status=status.HTTP_201_CREATED,
         )
@@ -227,11 +199,32 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
+        invalidate_task_progress([instance])
         self.perform_destroy(instance)
         return Response(
             {"message": "Task deleted successfully"}, status=status.HTTP_204_NO_CONTENT
         )
 
+    @action(detail=True, methods=["post"], url_path="move")
+    def move(self, request, pk=None):
+        """
+        Di chuyển task trong danh sách task cùng Subject/CourseSubject:
+        { "after_id": 2 } hoặc { "before_id": 2 } (không có thì đưa lên đầu).
+        """
+        task = self.get_object()
+        siblings = Task.objects.filter(
+            taskable_type=task.taskable_type, taskable_id=task.taskable_id
+        )
+        try:
+            moved = move_from_payload(siblings, task.id, request.data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"message": "Order updated successfully.", "updated": moved},
+            status=status.HTTP_200_OK,
+        )
+
 
 
 
@@ -276,14 +269,38 @@ class SupervisorCategoryViewSet(viewsets.ModelViewSet):
             status=status.HTTP_204_NO_CONTENT,
         )
 
+    @action(detail=True, methods=["post"], url_path="move-subject")
+    def move_subject(self, request, pk=None):
+        """
+        Di chuyển một subject trong category (id là id của SubjectCategory):
+        { "id": 1, "after_id": 2 } hoặc { "id": 1, "before_id": 2 }
+        """
+        category = self.get_object()
+        subject_categories = SubjectCategory.objects.filter(category=category)
+        try:
+            if not isinstance(request.data, dict) or request.data.get("id") is None:
+                raise ValueError("id is required.")
+            moved = move_from_payload(
+                subject_categories, request.data["id"], request.data
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"message": "Order updated successfully.", "updated": moved},
+            status=status.HTTP_200_OK,
+        )
+
 
 class SubjectListView(generics.ListAPIView):
     """
     API: GET /api/subjects/?search=...
     """
 
-    queryset = Subject.objects.all().order_by("name")
+    queryset = Subject.objects.prefetch_related("tasks").order_by("name")
     serializer_class = SubjectSerializer
+    # name là unique nên đủ ổn định cho cursor
+    cursor_ordering = ("name",)
     permission_classes = [permissions.IsAuthenticated, IsAdminOrSupervisor]
 
     filter_backends = [filters.SearchFilter]
@@ -1,11 +1,12 @@
 from django.contrib import admin
+from courses.admin import CourseCounterAdminMixin
 from .models.user_course import UserCourse
 from .models.user_subject import UserSubject
 from .models.user_task import UserTask
 from .models.comment import Comment
 
 @admin.register(UserCourse)
-class UserCourseAdmin(admin.ModelAdmin):
+class UserCourseAdmin(CourseCounterAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'course', 'status', 'joined_at', 'finished_at')
     list_filter = ('status',)
     search_fields = ('user__email', 'course__name')
@@ -14,6 +14,11 @@ class Comment(models.Model):
     object_id = models.PositiveIntegerField()
     commentable = GenericForeignKey('content_type', 'object_id')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'created_at']),
+        ]
+
     def __str__(self):
         return f"Comment by {self.user.email} on {self.content_type} {self.object_id}"
 
@@ -34,7 +34,7 @@ class UserSubject(models.Model):
         unique_together = ("user", "course_subject", "user_course")
 
     def __str__(self):
-        return f"{self.user.email} - {self.subject.name}"
+        return f"{self.user.email} - {self.course_subject.subject.name}"
 
     def save(self, *args, **kwargs):
         if self.status == self.Status.IN_PROGRESS and self.started_at is None:
@@ -0,0 +1,61 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from users.models.comment import Comment
+
+
+@lru_cache(maxsize=None)
+def _models_by_name():
+    names = defaultdict(list)
+    for model in apps.get_models():
+        names[model._meta.model_name].append(model)
+    # Tên model trùng giữa nhiều app thì không xác định được, bỏ qua
+    return {name: models[0] for name, models in names.items() if len(models) == 1}
+
+
+def get_content_type_by_model_name(model_name):
+    """
+    Tra ContentType theo tên model (vd: "usersubject") mà không query DB
+    mỗi request: tên -> model lấy từ app registry, ContentType lấy qua
+    cache của ContentTypeManager. Trả về None nếu tên không hợp lệ.
+    """
+    model = _models_by_name().get((model_name or '').lower())
+    if model is None:
+        return None
+    return ContentType.objects.get_for_model(model)
+
+
+def prefetch_comments(instances, attr='prefetched_comments'):
+    """
+    Load comment của cả danh sách đối tượng (có thể khác model) bằng 1 query
+    và gắn vào `instance.<attr>`, mới nhất trước.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+
+    content_types = ContentType.objects.get_for_models(*{type(obj) for obj in instances})
+    ids_by_type = defaultdict(set)
+    for obj in instances:
+        ids_by_type[content_types[type(obj)].id].add(obj.pk)
+
+    condition = Q()
+    for content_type_id, object_ids in ids_by_type.items():
+        condition |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+
+    comments_map = defaultdict(list)
+    comments = (
+        Comment.objects.filter(condition)
+        .select_related('user')
+        .order_by('-created_at', '-id')
+    )
+    for comment in comments:
+        comments_map[(comment.content_type_id, comment.object_id)].append(comment)
+
+    for obj in instances:
+        setattr(obj, attr, comments_map.get((content_types[type(obj)].id, obj.pk), []))
+    return instances
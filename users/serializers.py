@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db import models, transaction
 from django.utils.crypto import get_random_string
 from subjects.models.task import Task
 from users.models.user_task import UserTask
@@ -6,10 +7,14 @@ from courses.models.course_subject import CourseSubject
 from users.models.user_course import UserCourse
 from users.models.user_subject import UserSubject
 from authen.models import CustomUser
-from authen.services import send_new_account_email
+from authen.hashers import make_passwords
+from authen.services import send_new_account_email, send_new_account_emails
+from core.cache import bump_on_commit
+from courses.cache import DASHBOARD_USERS_SCOPE
 from rest_framework import serializers
 from django.contrib.contenttypes.models import ContentType
 from users.models.comment import Comment
+from users.selectors import get_content_type_by_model_name, prefetch_comments
 from authen.models import CustomUser
 
 class AdminUserListSerializer(serializers.ModelSerializer):
@@ -27,19 +32,17 @@ class AdminUserCreateSerializer(serializers.ModelSerializer):
 
         random_password = get_random_string(length=10)
 
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            full_name=validated_data.get('full_name', ''),
-            role=validated_data['role'],
-            password=random_password
-        )
-        user.is_active = is_active
-        user.save()
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                email=validated_data['email'],
+                full_name=validated_data.get('full_name', ''),
+                role=validated_data['role'],
+                password=random_password
+            )
+            user.is_active = is_active
+            user.save()
 
-        try:
             send_new_account_email(user, random_password)
-        except Exception as e:
-            print(f"Lỗi gửi email cấp tài khoản: {e}")
 
         return user
 
@@ -58,27 +61,30 @@ class AdminUserBulkCreateSerializer(serializers.Serializer):
     role = serializers.ChoiceField(choices=CustomUser.Role.choices, default="TRAINEE")
 
     def create(self, validated_data):
-        created_users = []
-
-        for email in validated_data["emails"]:
-            random_name = email.split("@")[0]
-            random_password = get_random_string(10)
-
-            user = CustomUser.objects.create_user(
-                email=email,
-                full_name=random_name,
-                role=validated_data["role"],
-                password=random_password
+        emails = [
+            CustomUser.objects.normalize_email(email)
+            for email in dict.fromkeys(validated_data["emails"])
+        ]
+        raw_passwords = [get_random_string(10) for _ in emails]
+        hashed_passwords = make_passwords(raw_passwords)
+
+        with transaction.atomic():
+            created_users = CustomUser.objects.bulk_create(
+                [
+                    CustomUser(
+                        email=email,
+                        full_name=email.split("@")[0],
+                        role=validated_data["role"],
+                        is_active=True,
+                        password=hashed_password,
+                    )
+                    for email, hashed_password in zip(emails, hashed_passwords)
+                ]
             )
-            user.is_active = True
-            user.save()
+            # bulk_create không gửi post_save nên tự bump cache dashboard
+            bump_on_commit(DASHBOARD_USERS_SCOPE)
+            send_new_account_emails(zip(created_users, raw_passwords))
 
-            try:
-                send_new_account_email(user, random_password)
-            except Exception as e:
-                print(f"Failed to send email to {email}: {e}")
-
-            created_users.append(user)
         return created_users
 
 
@@ -142,9 +148,8 @@ class CommentSerializer(serializers.ModelSerializer):
         model_name = data.get('model_name')
         object_id = data.get('object_id')
 
-        try:
-            content_type = ContentType.objects.get(model=model_name.lower())
-        except ContentType.DoesNotExist:
+        content_type = get_content_type_by_model_name(model_name)
+        if content_type is None:
             raise serializers.ValidationError({"model_name": f"Model '{model_name}' không hợp lệ."})
 
         model_class = content_type.model_class()
@@ -190,6 +195,12 @@ class TraineeTaskDetailSerializer(serializers.ModelSerializer):
         model = UserTask
         fields = ['id', 'name', 'status', 'spent_time', 'submission_file']
 
+class TraineeEnrolledSubjectListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return super().to_representation(prefetch_comments(iterable))
+
+
 class TraineeEnrolledSubjectSerializer(serializers.ModelSerializer):
     subject_name = serializers.CharField(source='course_subject.subject.name', read_only=True)
     max_score = serializers.IntegerField(source='course_subject.subject.max_score', read_only=True)
@@ -223,6 +234,7 @@ class TraineeEnrolledSubjectSerializer(serializers.ModelSerializer):
             'actual_start_day', 'actual_end_day',
             'tasks', 'comments', 'student', 'course'
         ]
+        list_serializer_class = TraineeEnrolledSubjectListSerializer
 
     def get_formatted_score(self, obj):
         current_score = obj.score if obj.score is not None else "--"
@@ -234,8 +246,14 @@ class TraineeEnrolledSubjectSerializer(serializers.ModelSerializer):
         return f"(Time: {days} day)"
 
     def get_comments(self, obj):
-        content_type = ContentType.objects.get_for_model(UserSubject)
-        comments = Comment.objects.filter(content_type=content_type, object_id=obj.id).order_by('-created_at')
+        # prefetched_comments được gắn sẵn bởi prefetch_comments khi serialize danh sách
+        if hasattr(obj, 'prefetched_comments'):
+            comments = obj.prefetched_comments
+        else:
+            content_type = ContentType.objects.get_for_model(UserSubject)
+            comments = Comment.objects.filter(
+                content_type=content_type, object_id=obj.id
+            ).select_related('user').order_by('-created_at', '-id')
         return CommentSerializer(comments, many=True).data
 
     def get_student(self, obj):
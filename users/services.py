@@ -0,0 +1,159 @@
+import codecs
+import csv
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils.crypto import get_random_string
+
+from authen.hashers import make_passwords
+from authen.models import CustomUser
+from authen.services import send_new_account_emails
+from core.cache import bump_on_commit
+from courses.cache import DASHBOARD_USERS_SCOPE
+
+CSV_IMPORT_BATCH_SIZE = 500
+
+
+def import_users_from_csv(csv_file, default_role=CustomUser.Role.TRAINEE):
+    """
+    Import user từ file CSV (cột: email, full_name, role).
+    File được đọc dạng stream theo từng batch; mỗi batch chỉ tốn 1 query
+    kiểm tra email đã tồn tại và 1 bulk_create.
+    Trả về báo cáo cho từng dòng.
+    File không phải UTF-8 bị từ chối (ValueError) trước khi ghi bất kỳ dòng nào.
+    """
+    _ensure_utf8(csv_file)
+
+    reader = csv.DictReader(codecs.iterdecode(csv_file, "utf-8-sig"))
+    report = {"created": 0, "skipped": 0, "errors": 0, "rows": []}
+    seen_emails = set()
+    batch = []
+
+    for line_no, row in enumerate(reader, start=2):
+        # DictReader gom các ô thừa (kể cả dấu phẩy cuối dòng) vào key None
+        extra = [value.strip() for value in row.pop(None, None) or []]
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        email = CustomUser.objects.normalize_email(row.get("email", ""))
+        full_name = row.get("full_name") or email.split("@")[0]
+        role = row.get("role") or default_role
+        result = {"row": line_no, "email": email, "status": "created", "message": ""}
+
+        if any(extra):
+            result.update(status="error", message="Dòng có nhiều cột hơn header.")
+            report["rows"].append(result)
+            report["errors"] += 1
+            continue
+
+        # Kiểm tra theo validator của model (định dạng, độ dài) để lỗi dữ liệu
+        # được báo theo từng dòng thay vì làm hỏng cả batch khi insert
+        try:
+            _clean_field("email", email)
+        except ValidationError:
+            result.update(status="error", message="Email không hợp lệ.")
+        else:
+            try:
+                _clean_field("full_name", full_name)
+            except ValidationError as e:
+                result.update(
+                    status="error", message=f"Họ tên không hợp lệ: {' '.join(e.messages)}"
+                )
+            else:
+                if role not in CustomUser.Role.values:
+                    result.update(status="error", message=f"Role '{role}' không hợp lệ.")
+                elif email.lower() in seen_emails:
+                    result.update(status="skipped", message="Email bị trùng trong file.")
+
+        seen_emails.add(email.lower())
+        report["rows"].append(result)
+
+        if result["status"] == "created":
+            batch.append((result, full_name, role))
+        else:
+            report["skipped" if result["status"] == "skipped" else "errors"] += 1
+
+        if len(batch) >= CSV_IMPORT_BATCH_SIZE:
+            _create_user_batch(batch, report)
+            batch = []
+
+    if batch:
+        _create_user_batch(batch, report)
+
+    return report
+
+
+def _ensure_utf8(csv_file):
+    """
+    Đọc thử toàn bộ file để kiểm tra mã hóa UTF-8, rồi quay lại đầu file.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in iter(lambda: csv_file.read(64 * 1024), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ValueError("File CSV phải được mã hóa UTF-8.")
+    finally:
+        csv_file.seek(0)
+
+
+def _clean_field(name, value):
+    CustomUser._meta.get_field(name).clean(value, None)
+
+
+def _create_user_batch(batch, report):
+    # So sánh không phân biệt hoa thường, giống kiểm tra trùng trong file
+    existing_emails = set(
+        CustomUser.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[result["email"].lower() for result, _, _ in batch])
+        .values_list("email_lower", flat=True)
+    )
+
+    pending = []
+    for result, full_name, role in batch:
+        if result["email"].lower() in existing_emails:
+            result.update(status="skipped", message="Email đã tồn tại.")
+            report["skipped"] += 1
+            continue
+        pending.append((result, full_name, role, get_random_string(10)))
+
+    if not pending:
+        return
+
+    hashed_passwords = make_passwords([password for _, _, _, password in pending])
+    users = [
+        CustomUser(
+            email=result["email"],
+            full_name=full_name,
+            role=role,
+            is_active=True,
+            password=hashed_password,
+        )
+        for (result, full_name, role, _), hashed_password in zip(
+            pending, hashed_passwords
+        )
+    ]
+
+    try:
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create(users)
+            # bulk_create không gửi post_save nên tự bump cache dashboard
+            bump_on_commit(DASHBOARD_USERS_SCOPE)
+            send_new_account_emails(
+                (user, password) for user, (_, _, _, password) in zip(users, pending)
+            )
+    except DatabaseError as e:
+        message = (
+            "Không thể tạo user (email bị trùng)."
+            if isinstance(e, IntegrityError)
+            else "Không thể tạo user (dữ liệu không hợp lệ)."
+        )
+        for result, _, _, _ in pending:
+            result.update(status="error", message=message)
+        report["errors"] += len(pending)
+        return
+
+    report["created"] += len(users)
+
+    for user, (result, _, _, _) in zip(users, pending):
+        result["id"] = user.id
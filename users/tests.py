@@ -1 +1,346 @@
+import io
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authen.models import CustomUser
+from core.models import EmailOutbox
+from courses.models.course_model import Course
+from courses.models.course_subject import CourseSubject
+from subjects.models.subject import Subject
+from subjects.models.task import Task
+from users.models.comment import Comment
+from users.models.user_course import UserCourse
+from users.models.user_subject import UserSubject
+from users.models.user_task import UserTask
+from users.services import import_users_from_csv
+
+
+class ImportUsersFromCsvTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            email="admin@example.com", full_name="Admin", role="ADMIN", is_staff=True
+        )
+        CustomUser.objects.create(email="existing@example.com", full_name="Existing")
+
+    def import_rows(self, *lines):
+        content = "\n".join(["email,full_name,role", *lines]) + "\n"
+        return import_users_from_csv(io.BytesIO(content.encode("utf-8")))
+
+    def test_report_per_row(self):
+        report = self.import_rows(
+            "Existing@Example.com,Existing again,TRAINEE",
+            f"long@example.com,{'x' * 300},TRAINEE",
+            "new@example.com,,SUPERVISOR",
+            "NEW@example.com,Duplicate,TRAINEE",
+            "not-an-email,Bad,TRAINEE",
+            "role@example.com,Role,OWNER",
+        )
+
+        self.assertEqual(
+            {key: report[key] for key in ("created", "skipped", "errors")},
+            {"created": 1, "skipped": 2, "errors": 3},
+        )
+        self.assertEqual(
+            [(row["row"], row["status"]) for row in report["rows"]],
+            [
+                (2, "skipped"),
+                (3, "error"),
+                (4, "created"),
+                (5, "skipped"),
+                (6, "error"),
+                (7, "error"),
+            ],
+        )
+        user = CustomUser.objects.get(email="new@example.com")
+        self.assertEqual((user.full_name, user.role), ("new", "SUPERVISOR"))
+        self.assertEqual(report["rows"][2]["id"], user.id)
+        self.assertTrue(user.has_usable_password())
+        self.assertEqual(
+            list(EmailOutbox.objects.values_list("recipients", flat=True)),
+            [["new@example.com"]],
+        )
+
+    def test_duplicates_across_batches(self):
+        with mock.patch("users.services.CSV_IMPORT_BATCH_SIZE", 2):
+            report = self.import_rows(
+                "a@example.com,A,TRAINEE",
+                "b@example.com,B,TRAINEE",
+                "A@example.com,A again,TRAINEE",
+                "c@example.com,C,TRAINEE",
+            )
+
+        self.assertEqual((report["created"], report["skipped"]), (3, 1))
+        self.assertEqual(report["rows"][2]["status"], "skipped")
+        self.assertEqual(
+            CustomUser.objects.filter(email__iendswith="@example.com").count(), 5
+        )
+
+    def test_extra_columns(self):
+        report = self.import_rows(
+            "trailing@example.com,Trailing,TRAINEE,",
+            "extra@example.com,Extra,TRAINEE,unexpected",
+            "ok@example.com,Ok,TRAINEE",
+        )
+
+        self.assertEqual(
+            [(row["status"], row["email"]) for row in report["rows"]],
+            [
+                ("created", "trailing@example.com"),
+                ("error", "extra@example.com"),
+                ("created", "ok@example.com"),
+            ],
+        )
+        self.assertEqual((report["created"], report["errors"]), (2, 1))
+        self.assertFalse(CustomUser.objects.filter(email="extra@example.com").exists())
+
+    def test_non_utf8_file_is_rejected_before_writing(self):
+        content = "email,full_name\nfirst@example.com,First\nsecond@example.com,Lê\n"
+
+        with mock.patch("users.services.CSV_IMPORT_BATCH_SIZE", 1):
+            with self.assertRaises(ValueError):
+                import_users_from_csv(io.BytesIO(content.encode("latin-1")))
+
+        self.assertFalse(CustomUser.objects.filter(email="first@example.com").exists())
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_import_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile(
+            "users.csv", b"\xef\xbb\xbfemail,full_name\nfile@example.com,File User\n"
+        )
+
+        response = client.post(
+            "/api/users/import-csv/", {"file": upload, "role": "TRAINEE"}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            CustomUser.objects.filter(email="file@example.com", role="TRAINEE").exists()
+        )
+
+        response = client.post("/api/users/import-csv/", {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+        upload = SimpleUploadedFile("users.csv", "email\nlê@example.com\n".encode("cp1258"))
+        response = client.post("/api/users/import-csv/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+
+class TraineeMySubjectsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainee = CustomUser.objects.create(
+            email="trainee@example.com", full_name="Trainee", role="TRAINEE"
+        )
+        cls.other_trainee = CustomUser.objects.create(
+            email="other@example.com", full_name="Other", role="TRAINEE"
+        )
+        cls.course = Course.objects.create(
+            name="Course",
+            start_date=date.today(),
+            finish_date=date.today() + timedelta(days=30),
+            creator=cls.supervisor,
+        )
+        cls.user_courses = {
+            user.id: UserCourse.objects.create(user=user, course=cls.course)
+            for user in (cls.trainee, cls.other_trainee)
+        }
+        cls.add_subjects(2)
+
+    @classmethod
+    def add_subjects(cls, count):
+        for i in range(CourseSubject.objects.count(), count):
+            course_subject = CourseSubject.objects.create(
+                course=cls.course,
+                subject=Subject.objects.create(
+                    name=f"Subject {i}", max_score=10, estimated_time_days=5
+                ),
+                position=i,
+            )
+            tasks = Task.objects.bulk_create(
+                Task(
+                    name=f"Task {i}.{j}",
+                    taskable_type=Task.TaskType.COURSE_SUBJECT,
+                    taskable_id=course_subject.id,
+                )
+                for j in range(2)
+            )
+            for user in (cls.trainee, cls.other_trainee):
+                user_subject = UserSubject.objects.create(
+                    user=user,
+                    course_subject=course_subject,
+                    user_course=cls.user_courses[user.id],
+                )
+                UserTask.objects.bulk_create(
+                    UserTask(user=user, task=task, user_subject=user_subject)
+                    for task in tasks
+                )
+                Comment.objects.create(
+                    user=cls.supervisor,
+                    content=f"{user.full_name} {i}",
+                    content_type=ContentType.objects.get_for_model(UserSubject),
+                    object_id=user_subject.id,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.trainee)
+        # content type đã nằm trong cache của ContentTypeManager khi chạy thật
+        ContentType.objects.get_for_model(UserSubject)
+
+    def test_my_subjects_query_count_is_fixed(self):
+        # 1 query user subject + 1 query user task + 1 query comment
+        for size in (2, 6):
+            self.add_subjects(size)
+            with self.subTest(size=size), self.assertNumQueries(3):
+                response = self.client.get("/api/users/my-subjects/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]["data"]
+        self.assertEqual(len(data), 6)
+        for item in data:
+            self.assertEqual(len(item["tasks"]), 2)
+            self.assertEqual(len(item["comments"]), 1)
+            self.assertTrue(item["comments"][0]["content"].startswith("Trainee "))
+
+
+class CommentThreadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = CustomUser.objects.create(
+            email="supervisor@example.com", full_name="Supervisor", role="SUPERVISOR"
+        )
+        cls.trainee = CustomUser.objects.create(
+            email="trainee@example.com", full_name="Trainee", role="TRAINEE"
+        )
+        course = Course.objects.create(
+            name="Course",
+            start_date=date.today(),
+            finish_date=date.today() + timedelta(days=30),
+            creator=cls.supervisor,
+        )
+        course_subjects = [
+            CourseSubject.objects.create(
+                course=course,
+                subject=Subject.objects.create(
+                    name=f"Subject {i}", max_score=10, estimated_time_days=5
+                ),
+            )
+            for i in range(2)
+        ]
+        user_course = UserCourse.objects.create(user=cls.trainee, course=course)
+        cls.user_subjects = [
+            UserSubject.objects.create(
+                user=cls.trainee, course_subject=course_subject, user_course=user_course
+            )
+            for course_subject in course_subjects
+        ]
+        cls.user_subject = cls.user_subjects[0]
+        # Comment nhiễu: object khác và model khác cùng object_id
+        cls.add_comment(cls.user_subjects[1], "Other subject")
+        cls.add_comment(
+            Task.objects.create(
+                id=cls.user_subject.id,
+                name="Task",
+                taskable_type=Task.TaskType.COURSE_SUBJECT,
+                taskable_id=course_subjects[0].id,
+            ),
+            "Task comment",
+        )
+
+    @classmethod
+    def add_comment(cls, obj, content, user=None):
+        return Comment.objects.create(
+            user=user or cls.supervisor,
+            content=content,
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=obj.id,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.trainee)
+        self.url = f"/api/resources/comments/?model_name=usersubject&object_id={self.user_subject.id}"
+        # content type đã nằm trong cache của ContentTypeManager khi chạy thật
+        ContentType.objects.get_for_model(UserSubject)
+
+    def add_thread(self, count):
+        start = Comment.objects.filter(
+            content_type=ContentType.objects.get_for_model(UserSubject),
+            object_id=self.user_subject.id,
+        ).count()
+        for i in range(start, count):
+            self.add_comment(
+                self.user_subject, f"Comment {i}", user=(self.supervisor, self.trainee)[i % 2]
+            )
+
+    def test_thread_query_count_and_order(self):
+        # 1 query comment kèm user, không tăng theo số comment
+        for count in (3, 9):
+            self.add_thread(count)
+            with self.subTest(count=count), self.assertNumQueries(1):
+                response = self.client.get(self.url)
+
+        data = response.json()["data"]
+        self.assertEqual([item["content"] for item in data], [f"Comment {i}" for i in range(9)])
+        self.assertEqual(data[1]["user"]["id"], self.trainee.id)
+
+    def test_created_at_ties_are_ordered_by_id(self):
+        self.add_thread(4)
+        Comment.objects.update(created_at=datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+
+        data = self.client.get(self.url).json()["data"]
+
+        self.assertEqual([item["content"] for item in data], [f"Comment {i}" for i in range(4)])
+
+    def test_thread_pages_with_cursor(self):
+        self.add_thread(5)
+        url, contents = f"{self.url}&page_size=2", []
+        while url:
+            page = self.client.get(url).json()["data"]
+            contents += [item["content"] for item in page["results"]]
+            url = page["next"]
+
+        self.assertEqual(contents, [f"Comment {i}" for i in range(5)])
+
+    def test_unknown_model_name(self):
+        self.add_thread(2)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f"/api/resources/comments/?model_name=missing&object_id={self.user_subject.id}"
+            )
+
+        self.assertEqual(response.json()["data"], [])
+
+        response = self.client.post(
+            "/api/resources/comments/",
+            {"content": "Hi", "model_name": "missing", "object_id": self.user_subject.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_comment_by_model_name(self):
+        response = self.client.post(
+            "/api/resources/comments/",
+            {"content": "Hi", "model_name": "UserSubject", "object_id": self.user_subject.id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        comment = Comment.objects.get(content="Hi")
+        self.assertEqual(
+            (comment.content_type.model_class(), comment.object_id),
+            (UserSubject, self.user_subject.id),
+        )
+        self.assertEqual(comment.user, self.trainee)
@@ -1,4 +1,3 @@
-from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction
@@ -9,7 +8,7 @@ from users.models.comment import Comment
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from authen.models import CustomUser
 from authen.permissions import (
     IsAdminRole,
@@ -34,11 +33,14 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from users.models.user_task import UserTask
+from users.selectors import get_content_type_by_model_name
+from users.services import import_users_from_csv
 
 
 class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminOrSupervisor]
     serializer_class = AdminUserListSerializer
+    cursor_ordering = ("-date_joined", "-id")
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -242,6 +244,56 @@ class UserViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import-csv",
+        parser_classes=[MultiPartParser, FormParser],
+    )
+    def import_csv(self, request):
+        """
+        Import user từ file CSV (multipart, field "file").
+        Cột: email (bắt buộc), full_name, role (mặc định lấy từ field "role").
+        """
+        if request.user.role == "SUPERVISOR":
+            return Response(
+                {"status": "error", "message": "Supervisor không có quyền Import User"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        csv_file = request.FILES.get("file")
+        if not csv_file:
+            return Response(
+                {"status": "error", "message": "Vui lòng upload file CSV"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        default_role = request.data.get("role") or CustomUser.Role.TRAINEE
+        if default_role not in CustomUser.Role.values:
+            return Response(
+                {"status": "error", "message": f"Role '{default_role}' không hợp lệ"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            report = import_users_from_csv(csv_file, default_role=default_role)
+        except ValueError as e:
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "status": "success",
+                "message": (
+                    f"Đã tạo {report['created']} users, bỏ qua {report['skipped']}, "
+                    f"lỗi {report['errors']}"
+                ),
+                "data": report,
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class CommentViewSet(viewsets.ModelViewSet):
     """
@@ -251,7 +303,8 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     serializer_class = CommentSerializer
     permission_classes = [IsCommentOwnerOrAdmin]
-    queryset = Comment.objects.all().order_by("created_at")
+    queryset = Comment.objects.select_related("user").order_by("created_at", "id")
+    cursor_ordering = ("created_at", "id")
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -259,11 +312,11 @@ class CommentViewSet(viewsets.ModelViewSet):
         object_id = self.request.query_params.get("object_id")
 
         if model_name and object_id:
-            try:
-                ct = ContentType.objects.get(model=model_name.lower())
-                queryset = queryset.filter(content_type=ct, object_id=object_id)
-            except ContentType.DoesNotExist:
+            ct = get_content_type_by_model_name(model_name)
+            if ct is None:
                 return queryset.none()
+            # Khớp index (content_type, object_id, created_at), phân trang bằng ?cursor= / ?page_size=
+            queryset = queryset.filter(content_type=ct, object_id=object_id)
 
         return queryset
 
@@ -310,7 +363,18 @@ class TraineeMySubjectsView(APIView):
 
         my_subjects = (
             UserSubject.objects.filter(user=user)
-            .select_related("course_subject", "course_subject__subject")
+            .select_related(
+                "user",
+                "course_subject",
+                "course_subject__subject",
+                "user_course__course",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "user_tasks",
+                    queryset=UserTask.objects.select_related("task"),
+                )
+            )
             .order_by("-created_at")
         )
 